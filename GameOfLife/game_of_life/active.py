@@ -0,0 +1,130 @@
+from .engines import NumpyEngine
+from .rules import Rules, CONWAY
+from .boundary import DEAD
+import numpy as np
+
+
+# Incremental engine: the board is cut into square blocks and a block is only
+# recomputed when it, or one of its 8 neighbour blocks, changed last generation.
+# Everything else is stable (same inputs as last time) and is carried over as is.
+# Two padded boards swap roles every generation (double buffering). A block skipped this
+# generation did not change over the last two, so the back board already holds it: only
+# the recomputed blocks are written, and the ghost border is refreshed when one of them
+# lies on an edge.
+class ActiveRegionEngine(NumpyEngine):
+    name = "active"
+
+    def __init__(self, rows, cols, rule=CONWAY, boundary=DEAD, block_size=16):
+        self.rows = rows
+        self.cols = cols
+        self.rule = rule
+        self.boundary = boundary
+        self.block_size = block_size
+        self.block_rows = -(-rows // block_size)
+        self.block_cols = -(-cols // block_size)
+        self._arrays = [np.zeros((rows + 2, cols + 2), dtype=np.uint8) for _ in range(2)]
+        self._views = [array[1:-1, 1:-1] for array in self._arrays]
+        self._front = 0
+        # Cells set since the last generation may sit next to a wrapped edge
+        self._ghosts_stale = True
+        self._changed = self._all_blocks()
+        self.last_stats = None
+        self.totals = {'generations': 0, 'cells_evaluated': 0, 'blocks_evaluated': 0, 'blocks_skipped': 0}
+
+    def _all_blocks(self):
+        return np.ones((self.block_rows, self.block_cols), dtype=bool)
+
+    def _mark(self, row, col):
+        self._changed[row // self.block_size, col // self.block_size] = True
+
+    # A new state in the front board: its history is unknown, so everything is active
+    def _reset(self, cells):
+        view = self._views[self._front]
+        view[:] = cells
+        self._changed = self._all_blocks()
+        self._ghosts_stale = True
+        return view
+
+    # Arrays handed out are views of the front board; they are overwritten two generations later
+    def empty(self):
+        return self._reset(0)
+
+    # Cells born and died are appended to born and died when given; they are only looked
+    # for in blocks that changed
+    def _evolve(self, grid, born=None, died=None):
+        if grid is not self._views[self._front]:
+            self._reset(grid)
+        padded, target = self._arrays[self._front], self._arrays[1 - self._front]
+        if self._ghosts_stale:
+            self.boundary.fill_ghosts(padded)
+            self._ghosts_stale = False
+
+        # Blocks next to a change need recomputing as well, including across a wrapped edge
+        padded_changed = self.boundary.pad(self._changed)
+        if self.boundary.mirrored:
+            # Mirrored columns don't line up with blocks, so any change next to the
+            # top or bottom edge wakes the whole opposite edge
+            padded_changed[0] = padded_changed[-2].any()
+            padded_changed[-1] = padded_changed[1].any()
+        active = np.zeros_like(self._changed)
+        for dr in range(3):
+            for dc in range(3):
+                active |= padded_changed[dr:dr + self.block_rows, dc:dc + self.block_cols]
+
+        changed = np.zeros_like(self._changed)
+        size = self.block_size
+        cells_evaluated = births = deaths = 0
+        for block_row, block_col in zip(*np.nonzero(active)):
+            top, left = block_row * size, block_col * size
+            bottom, right = min(top + size, self.rows), min(left + size, self.cols)
+            block = Rules.evolve_padded(padded[top:bottom + 2, left:right + 2], self.rule)
+            cells_evaluated += block.size
+            target[top + 1:bottom + 1, left + 1:right + 1] = block
+            old_block = padded[top + 1:bottom + 1, left + 1:right + 1]
+            if not np.array_equal(block, old_block):
+                changed[block_row, block_col] = True
+                births += int(np.count_nonzero(block > old_block))
+                deaths += int(np.count_nonzero(old_block > block))
+                if born is not None:
+                    born.extend(map(tuple, (np.argwhere(block > old_block) + (top, left)).tolist()))
+                    died.extend(map(tuple, (np.argwhere(old_block > block) + (top, left)).tolist()))
+        if (active[0].any() or active[-1].any() or active[:, 0].any() or active[:, -1].any()):
+            self.boundary.fill_ghosts(target)
+
+        blocks_evaluated = int(active.sum())
+        self.last_stats = {
+            'cells_evaluated': cells_evaluated,
+            'blocks_evaluated': blocks_evaluated,
+            'blocks_skipped': active.size - blocks_evaluated,
+            'blocks_changed': int(changed.sum()),
+            'births': births,
+            'deaths': deaths,
+        }
+        self.totals['generations'] += 1
+        for key in ('cells_evaluated', 'blocks_evaluated', 'blocks_skipped'):
+            self.totals[key] += self.last_stats[key]
+
+        self._changed = changed
+        self._front = 1 - self._front
+        return self._views[self._front]
+
+    def evolve(self, grid):
+        return self._evolve(grid)
+
+    # Births and deaths are only counted in blocks that changed
+    def evolve_stats(self, grid):
+        new_grid = self.evolve(grid)
+        return new_grid, self.last_stats['births'], self.last_stats['deaths']
+
+    def evolve_changes(self, grid):
+        born, died = [], []
+        new_grid = self._evolve(grid, born, died)
+        return new_grid, born, died
+
+    def set_cell(self, grid, row, col, value):
+        grid[row, col] = value
+        self._mark(row, col)
+        self._ghosts_stale = True
+
+    def from_list(self, cells):
+        return self._reset(np.array(cells, dtype=np.uint8))
@@ -0,0 +1,101 @@
+from .grid import Grid, GridSizeError, PatternSizeError
+from .rules import Rules, get_rule
+from .boundary import get_boundary
+from .utils import timed, pack_row, unpack_row
+import logging
+import sys
+
+
+# Compact grid: each row packed into one Python int (1 bit per cell instead of an
+# 8 byte list pointer), so 10^8 cell boards fit in ~13 MB
+class BitGrid:
+    def __init__(self, rows, cols, rule="B3/S23", boundary="dead"):
+        if rows <= 0 or cols <= 0:
+            logging.error("Invalid grid size - must be positive integers")
+            raise GridSizeError("Grid size must be positive integers.")
+        self.rows = rows
+        self.cols = cols
+        self.rule = get_rule(rule)
+        self.boundary = get_boundary(boundary)
+        self.bit_rows = [0] * rows
+
+    @classmethod
+    def from_list(cls, cells, rule="B3/S23", boundary="dead"):
+        if not cells or not cells[0]:
+            raise GridSizeError("Grid size must be positive integers.")
+        bit_grid = cls(len(cells), len(cells[0]), rule=rule, boundary=boundary)
+        bit_grid.bit_rows = [pack_row(row) for row in cells]
+        return bit_grid
+
+    @classmethod
+    def from_grid(cls, grid):
+        return cls.from_list(grid.to_list(), rule=grid.rule, boundary=grid.boundary)
+
+    def to_list(self):
+        return [unpack_row(bits, self.cols) for bits in self.bit_rows]
+
+    def to_grid(self, engine="python"):
+        grid = Grid(self.rows, self.cols, engine=engine, rule=self.rule, boundary=self.boundary)
+        grid.grid = grid.engine.from_list(self.to_list())
+        return grid
+
+    @timed
+    def load_pattern(self, pattern, offset_row=0, offset_col=0):
+        if not pattern or not pattern[0]:
+            raise PatternSizeError("Pattern cannot be empty.")
+
+        pattern_rows = len(pattern)
+        pattern_cols = len(pattern[0])
+
+        if (offset_row + pattern_rows > self.rows) or (offset_col + pattern_cols > self.cols):
+            logging.error(f"Pattern size: {pattern_rows}x{pattern_cols}, Grid: {self.rows}x{self.cols}, Offset: ({offset_row},{offset_col})")
+            raise PatternSizeError(f"Pattern ({pattern_rows}x{pattern_cols}) does not fit in grid ({self.rows}x{self.cols}) at offset ({offset_row},{offset_col}).")
+
+        # Whole pattern rows are OR-ed in at once
+        clear_mask = ~(((1 << pattern_cols) - 1) << offset_col)
+        for r, row in enumerate(pattern):
+            bits = self.bit_rows[offset_row + r] & clear_mask
+            self.bit_rows[offset_row + r] = bits | (pack_row(row) << offset_col)
+
+    def get_cell(self, row, col):
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return (self.bit_rows[row] >> col) & 1
+        return 0
+
+    def set_cell(self, row, col, value):
+        if value:
+            self.bit_rows[row] |= 1 << col
+        else:
+            self.bit_rows[row] &= ~(1 << col)
+
+    def evolve(self):
+        self.bit_rows = Rules.evolve_bit_rows(self.bit_rows, self.cols, self.rule, self.boundary)
+
+    def is_grid_alive(self):
+        return any(self.bit_rows)
+
+    def population(self):
+        return sum(bin(bits).count("1") for bits in self.bit_rows)
+
+    def display(self):
+        for row in self.to_list():
+            print(" ".join([' O ' if cell else ' . ' for cell in row]))
+        print()
+
+    def clear(self):
+        self.bit_rows = [0] * self.rows
+
+    # Bytes held by the packed rows, next to an estimate for the same board as Grid.grid
+    def memory_footprint(self):
+        packed_bytes = sys.getsizeof(self.bit_rows) + sum(sys.getsizeof(bits) for bits in self.bit_rows)
+        # List of lists: one 8 byte pointer per cell (0 and 1 are shared ints) plus list headers
+        list_bytes = sys.getsizeof([]) + 8 * self.rows + self.rows * (sys.getsizeof([]) + 8 * self.cols)
+        cells = self.rows * self.cols
+        return {
+            'cells': cells,
+            'packed_bytes': packed_bytes,
+            'packed_bytes_per_cell': packed_bytes / cells,
+            'list_bytes': list_bytes,
+            'list_bytes_per_cell': list_bytes / cells,
+            'ratio': list_bytes / packed_bytes,
+        }
@@ -0,0 +1,109 @@
+import numpy as np
+
+BOUNDARY_NAMES = ("dead", "torus", "klein")
+
+
+class BoundaryError(Exception):
+    pass
+
+
+def reverse_bits(bits, cols):
+    return int(format(bits, f"0{cols}b")[::-1], 2)
+
+
+# What lies beyond the edge of the grid. The kernels never bounds-check a neighbour:
+# the grid gets a one cell ghost border (or wrapped index tables) filled in from here.
+#   dead:  the border is always dead
+#   torus: left/right and top/bottom edges are glued together
+#   klein: left/right glued as on a torus, top/bottom glued with the columns mirrored
+class Boundary:
+    def __init__(self, name="dead"):
+        if name not in BOUNDARY_NAMES:
+            raise BoundaryError(f"Unknown boundary '{name}'. Available boundaries: {', '.join(BOUNDARY_NAMES)}")
+        self.name = name
+        self.wraps = name != "dead"
+        self.mirrored = name == "klein"
+
+    def __eq__(self, other):
+        return isinstance(other, Boundary) and self.name == other.name
+
+    def __hash__(self):
+        return hash(self.name)
+
+    def __repr__(self):
+        return f"Boundary('{self.name}')"
+
+    # Cell that (row, col) refers to, or None when it lies beyond a dead edge
+    def locate(self, row, col, rows, cols):
+        if not self.wraps:
+            return (row, col) if 0 <= row < rows and 0 <= col < cols else None
+        crossings, row = divmod(row, rows)
+        col %= cols
+        if self.mirrored and crossings % 2:
+            col = cols - 1 - col
+        return row, col
+
+    # Fill the ghost border of a padded array in place from grid rows start..stop.
+    # Row ghosts are only written by the stripe that owns the row they copy, so stripes
+    # evolved in different processes can each refresh their own part.
+    def fill_ghosts(self, padded, start=0, stop=None):
+        if not self.wraps:
+            return
+        rows = padded.shape[0] - 2
+        stop = rows if stop is None else stop
+        padded[start + 1:stop + 1, 0] = padded[start + 1:stop + 1, -2]
+        padded[start + 1:stop + 1, -1] = padded[start + 1:stop + 1, 1]
+        step = -1 if self.mirrored else 1
+        if stop == rows:
+            padded[0] = padded[-2, ::step]
+        if start == 0:
+            padded[-1] = padded[1, ::step]
+
+    # NumPy grid with its ghost border
+    def pad(self, array):
+        padded = np.pad(array, 1)
+        self.fill_ghosts(padded)
+        return padded
+
+    # List of lists grid with its ghost border
+    def pad_list(self, grid):
+        cols = len(grid[0])
+        if not self.wraps:
+            border = [0] * (cols + 2)
+            return [border] + [[0] + row + [0] for row in grid] + [border]
+        padded = [[row[-1]] + row + [row[0]] for row in grid]
+        step = -1 if self.mirrored else 1
+        return [padded[-1][::step]] + padded + [padded[0][::step]]
+
+    # Ghost rows above and below a bit-packed grid (bit c is column c)
+    def ghost_bit_rows(self, bit_rows, cols):
+        if not self.wraps:
+            return 0, 0
+        if self.mirrored:
+            return reverse_bits(bit_rows[-1], cols), reverse_bits(bit_rows[0], cols)
+        return bit_rows[-1], bit_rows[0]
+
+    # Index tables for live-cell kernels. For a neighbour at (row + dr, col + dc):
+    #   row_map[row + dr + 1]                          - wrapped row
+    #   col_maps[flips[row + dr + 1]][col + dc + 1]    - wrapped (and maybe mirrored) column
+    def neighbor_tables(self, rows, cols):
+        row_map = [rows - 1] + list(range(rows)) + [0]
+        col_map = [cols - 1] + list(range(cols)) + [0]
+        flips = [0] * (rows + 2)
+        if self.mirrored:
+            flips[0] = flips[-1] = 1
+        return row_map, (col_map, [cols - 1 - col for col in col_map]), flips
+
+
+_boundaries = {}
+
+
+def get_boundary(boundary="dead"):
+    if isinstance(boundary, Boundary):
+        return boundary
+    if boundary not in _boundaries:
+        _boundaries[boundary] = Boundary(boundary)
+    return _boundaries[boundary]
+
+
+DEAD = get_boundary("dead")
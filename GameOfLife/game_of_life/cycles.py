@@ -0,0 +1,54 @@
+from collections import deque
+import logging
+
+MASK_64 = (1 << 64) - 1
+
+
+# Zobrist key of a cell: a fixed pseudo-random 64 bit number (splitmix64 of the
+# coordinates), so no key table has to be stored even for huge or unbounded grids
+def cell_key(row, col, seed=0):
+    z = (seed + (row & MASK_64) * 0x9E3779B97F4A7C15 + (col & MASK_64) * 0xC2B2AE3D27D4EB4F) & MASK_64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK_64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK_64
+    return z ^ (z >> 31)
+
+
+# Detects still lifes (period 1) and oscillators. The state hash is the XOR of the keys
+# of all live cells, so a generation only costs one XOR per cell that changed.
+# Only the last `window` generations are remembered, which bounds memory and the
+# longest period that can be detected.
+class CycleDetector:
+    def __init__(self, window=100, seed=0):
+        if window <= 0:
+            raise ValueError("History window must be a positive integer.")
+        self.window = window
+        self.seed = seed
+        self.reset()
+
+    def reset(self, live_cells=()):
+        self.generation = 0
+        self.hash = 0
+        for row, col in live_cells:
+            self.hash ^= cell_key(row, col, self.seed)
+        self.history = deque([(0, self.hash)])
+        self.seen = {self.hash: 0}
+        self.cycle = None
+
+    # Record the next generation from the cells that flipped; returns the cycle once found
+    def update(self, changed_cells):
+        for row, col in changed_cells:
+            self.hash ^= cell_key(row, col, self.seed)
+        self.generation += 1
+
+        if self.cycle is None and self.hash in self.seen:
+            start = self.seen[self.hash]
+            self.cycle = {'start': start, 'period': self.generation - start}
+            logging.info(f"Cycle detected: period {self.cycle['period']} starting at generation {start}")
+
+        self.history.append((self.generation, self.hash))
+        self.seen[self.hash] = self.generation
+        if len(self.history) > self.window:
+            old_generation, old_hash = self.history.popleft()
+            if self.seen.get(old_hash) == old_generation:
+                del self.seen[old_hash]
+        return self.cycle
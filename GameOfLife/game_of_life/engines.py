@@ -0,0 +1,302 @@
+from .rules import Rules, CONWAY, get_rule
+from .boundary import DEAD, get_boundary
+from .utils import pack_row, unpack_row
+from importlib import import_module
+import numpy as np
+
+
+class EngineError(Exception):
+    pass
+
+
+# Reference engine: list of lists evolved cell by cell through Rules.evolve_grid
+class PythonEngine:
+    name = "python"
+
+    def __init__(self, rows, cols, rule=CONWAY, boundary=DEAD):
+        self.rows = rows
+        self.cols = cols
+        self.rule = rule
+        self.boundary = boundary
+
+    def empty(self):
+        return [[0 for _ in range(self.cols)] for _ in range(self.rows)]
+
+    def evolve(self, grid):
+        return Rules.evolve_grid(grid, self.rule, self.boundary)
+
+    # (new_grid, births, deaths), counted while evolving
+    def evolve_stats(self, grid):
+        return Rules.evolve_grid_counted(grid, self.rule, self.boundary)
+
+    # (new_grid, born, died): the cells themselves rather than their counts
+    def evolve_changes(self, grid):
+        new_grid = self.evolve(grid)
+        born, died = [], []
+        for r, (old_row, new_row) in enumerate(zip(grid, new_grid)):
+            if old_row != new_row:
+                for c, (old_cell, new_cell) in enumerate(zip(old_row, new_row)):
+                    if old_cell != new_cell:
+                        (born if new_cell else died).append((r, c))
+        return new_grid, born, died
+
+    def is_alive(self, grid):
+        return any(cell == 1 for row in grid for cell in row)
+
+    def population(self, grid):
+        return sum(map(sum, grid))
+
+    # (min_row, min_col, max_row, max_col) of the live cells, None when empty
+    def bounding_box(self, grid):
+        live_rows = [r for r, row in enumerate(grid) if any(row)]
+        if not live_rows:
+            return None
+        cols = [c for r in live_rows for c in (grid[r].index(1), len(grid[r]) - 1 - grid[r][::-1].index(1))]
+        return live_rows[0], min(cols), live_rows[-1], max(cols)
+
+    def live_cells(self, grid):
+        return [(r, c) for r, row in enumerate(grid) if any(row) for c, cell in enumerate(row) if cell]
+
+    def get_cell(self, grid, row, col):
+        return grid[row][col]
+
+    def set_cell(self, grid, row, col, value):
+        grid[row][col] = value
+
+    def to_list(self, grid):
+        return [list(row) for row in grid]
+
+    def to_array(self, grid):
+        return np.array(grid, dtype=np.uint8)
+
+    def from_list(self, cells):
+        return [list(row) for row in cells]
+
+
+# Vectorized engine: grid kept as a uint8 array, neighbours summed with shifted slices
+class NumpyEngine:
+    name = "numpy"
+
+    def __init__(self, rows, cols, rule=CONWAY, boundary=DEAD):
+        self.rows = rows
+        self.cols = cols
+        self.rule = rule
+        self.boundary = boundary
+
+    def empty(self):
+        return np.zeros((self.rows, self.cols), dtype=np.uint8)
+
+    def evolve(self, grid):
+        # The ghost border holds the boundary, dead (zeros) or wrapped
+        return Rules.evolve_padded(self.boundary.pad(grid), self.rule)
+
+    def evolve_stats(self, grid):
+        new_grid = self.evolve(grid)
+        return new_grid, int(np.count_nonzero(new_grid > grid)), int(np.count_nonzero(grid > new_grid))
+
+    def evolve_changes(self, grid):
+        new_grid = self.evolve(grid)
+        return (new_grid, list(map(tuple, np.argwhere(new_grid > grid).tolist())),
+                list(map(tuple, np.argwhere(grid > new_grid).tolist())))
+
+    def is_alive(self, grid):
+        return bool(grid.any())
+
+    def population(self, grid):
+        return int(np.count_nonzero(grid))
+
+    def bounding_box(self, grid):
+        live_rows = np.flatnonzero(grid.any(axis=1))
+        if not live_rows.size:
+            return None
+        live_cols = np.flatnonzero(grid.any(axis=0))
+        return int(live_rows[0]), int(live_cols[0]), int(live_rows[-1]), int(live_cols[-1])
+
+    def live_cells(self, grid):
+        return list(map(tuple, np.argwhere(grid).tolist()))
+
+    def get_cell(self, grid, row, col):
+        return int(grid[row, col])
+
+    def set_cell(self, grid, row, col, value):
+        grid[row, col] = value
+
+    def to_list(self, grid):
+        return grid.tolist()
+
+    # May share memory with the grid
+    def to_array(self, grid):
+        return grid
+
+    def from_list(self, cells):
+        return np.array(cells, dtype=np.uint8)
+
+
+# Sparse engine: only the (row, col) coordinates of live cells are stored
+class SparseEngine:
+    name = "sparse"
+
+    def __init__(self, rows, cols, rule=CONWAY, boundary=DEAD):
+        self.rows = rows
+        self.cols = cols
+        self.rule = rule
+        self.boundary = boundary
+
+    def empty(self):
+        return set()
+
+    def evolve(self, grid):
+        return Rules.evolve_live_cells(grid, self.rows, self.cols, self.rule, self.boundary)
+
+    # Births and deaths from set sizes: O(live cells), never O(area)
+    def evolve_stats(self, grid):
+        new_grid = self.evolve(grid)
+        births = len(new_grid - grid)
+        return new_grid, births, len(grid) - (len(new_grid) - births)
+
+    def evolve_changes(self, grid):
+        new_grid = self.evolve(grid)
+        return new_grid, list(new_grid - grid), list(grid - new_grid)
+
+    def is_alive(self, grid):
+        return bool(grid)
+
+    def population(self, grid):
+        return len(grid)
+
+    def bounding_box(self, grid):
+        if not grid:
+            return None
+        rows = [row for row, _ in grid]
+        cols = [col for _, col in grid]
+        return min(rows), min(cols), max(rows), max(cols)
+
+    def live_cells(self, grid):
+        return list(grid)
+
+    def get_cell(self, grid, row, col):
+        return 1 if (row, col) in grid else 0
+
+    def set_cell(self, grid, row, col, value):
+        if value:
+            grid.add((row, col))
+        else:
+            grid.discard((row, col))
+
+    def to_list(self, grid):
+        cells = [[0 for _ in range(self.cols)] for _ in range(self.rows)]
+        for row, col in grid:
+            cells[row][col] = 1
+        return cells
+
+    def to_array(self, grid):
+        cells = np.zeros((self.rows, self.cols), dtype=np.uint8)
+        if grid:
+            cells[tuple(np.array(list(grid)).T)] = 1
+        return cells
+
+    def from_list(self, cells):
+        return {(r, c) for r, row in enumerate(cells) for c, cell in enumerate(row) if cell}
+
+
+def _popcount(bits):
+    return bin(bits).count("1")
+
+
+def _set_bits(bits):
+    col = 0
+    while bits:
+        if bits & 1:
+            yield col
+        bits >>= 1
+        col += 1
+
+
+# Bit-packed engine: one int per row, evolved with word-parallel full-adder logic
+class BitPackedEngine:
+    name = "bitpacked"
+
+    def __init__(self, rows, cols, rule=CONWAY, boundary=DEAD):
+        self.rows = rows
+        self.cols = cols
+        self.rule = rule
+        self.boundary = boundary
+
+    def empty(self):
+        return [0] * self.rows
+
+    def evolve(self, grid):
+        return Rules.evolve_bit_rows(grid, self.cols, self.rule, self.boundary)
+
+    # Births and deaths by popcount, one int operation per row
+    def evolve_stats(self, grid):
+        new_grid = self.evolve(grid)
+        births = sum(_popcount(new_bits & ~old_bits) for old_bits, new_bits in zip(grid, new_grid))
+        deaths = sum(_popcount(old_bits & ~new_bits) for old_bits, new_bits in zip(grid, new_grid))
+        return new_grid, births, deaths
+
+    def evolve_changes(self, grid):
+        new_grid = self.evolve(grid)
+        born = [(r, c) for r, (old_bits, new_bits) in enumerate(zip(grid, new_grid)) if old_bits != new_bits
+                for c in _set_bits(new_bits & ~old_bits)]
+        died = [(r, c) for r, (old_bits, new_bits) in enumerate(zip(grid, new_grid)) if old_bits != new_bits
+                for c in _set_bits(old_bits & ~new_bits)]
+        return new_grid, born, died
+
+    def is_alive(self, grid):
+        return any(grid)
+
+    def population(self, grid):
+        return sum(map(_popcount, grid))
+
+    def bounding_box(self, grid):
+        live_rows = [r for r, bits in enumerate(grid) if bits]
+        if not live_rows:
+            return None
+        columns = 0
+        for bits in grid:
+            columns |= bits
+        return live_rows[0], (columns & -columns).bit_length() - 1, live_rows[-1], columns.bit_length() - 1
+
+    def live_cells(self, grid):
+        return [(r, c) for r, bits in enumerate(grid) for c in _set_bits(bits)]
+
+    def get_cell(self, grid, row, col):
+        return (grid[row] >> col) & 1
+
+    def set_cell(self, grid, row, col, value):
+        if value:
+            grid[row] |= 1 << col
+        else:
+            grid[row] &= ~(1 << col)
+
+    def to_list(self, grid):
+        return [unpack_row(bits, self.cols) for bits in grid]
+
+    def to_array(self, grid):
+        row_bytes = (self.cols + 7) // 8
+        packed = np.frombuffer(b"".join(bits.to_bytes(row_bytes, "little") for bits in grid), dtype=np.uint8)
+        return np.unpackbits(packed.reshape(self.rows, row_bytes), axis=1, count=self.cols, bitorder="little")
+
+    def from_list(self, cells):
+        return [pack_row(row) for row in cells]
+
+
+# Engine name -> (module, class). Imported on first use so unused engines cost nothing.
+ENGINES = {
+    "python": ("engines", "PythonEngine"),
+    "numpy": ("engines", "NumpyEngine"),
+    "sparse": ("engines", "SparseEngine"),
+    "bitpacked": ("engines", "BitPackedEngine"),
+    "parallel": ("parallel", "ParallelEngine"),
+    "active": ("active", "ActiveRegionEngine"),
+}
+
+
+def get_engine(name, rows, cols, rule="B3/S23", boundary="dead", **options):
+    try:
+        module_name, class_name = ENGINES[name]
+    except KeyError:
+        raise EngineError(f"Unknown engine '{name}'. Available engines: {', '.join(ENGINES)}")
+    engine_class = getattr(import_module(f".{module_name}", __package__), class_name)
+    return engine_class(rows, cols, rule=get_rule(rule), boundary=get_boundary(boundary), **options)
@@ -0,0 +1,188 @@
+from .grid import Grid
+from .engines import ENGINES, EngineError
+from .boundary import BOUNDARY_NAMES
+from .cycles import CycleDetector
+from .logging_setup import configure_logging, detach_logging
+from functools import partial
+from multiprocessing import Pool
+import numpy as np
+import argparse
+import csv
+import json
+import logging
+import os
+import sys
+import time
+
+# The parallel engine starts worker processes of its own, which pool workers (daemons)
+# are not allowed to do; the ensemble already uses every core across soups
+ENSEMBLE_ENGINES = [name for name in ENGINES if name != "parallel"]
+RESULT_FIELDS = ['run', 'seed', 'generations', 'period', 'final_population', 'initial_population', 'stabilized']
+
+
+# Seed of one run, derived from the ensemble seed and the run number only, so results
+# don't depend on the number of workers or the order runs finish in
+def run_seed(seed, run):
+    return int(np.random.SeedSequence([seed, run]).generate_state(1)[0])
+
+
+def random_soup(rows, cols, density=0.35, seed=0):
+    rng = np.random.default_rng(seed)
+    return (rng.random((rows, cols)) < density).astype(np.uint8)
+
+
+# One soup evolved until it dies out, settles into a still life or oscillator, or
+# max_generations is reached. generations is when the final cycle starts.
+def run_soup(run, rows=64, cols=64, density=0.35, seed=0, max_generations=1000, engine="numpy",
+             rule="B3/S23", boundary="dead", window=100):
+    soup_seed = run_seed(seed, run)
+    grid = Grid(rows, cols, engine=engine, rule=rule, boundary=boundary)
+    grid.grid = grid.engine.from_list(random_soup(rows, cols, density, soup_seed).tolist())
+    detector = CycleDetector(window=window)
+    detector.reset(grid.live_cells())
+    initial_population = len(grid.live_cells())
+
+    cycle = None
+    for _ in range(max_generations):
+        cycle = detector.update(grid.step(changes=True).changed)
+        if cycle:
+            break
+    close = getattr(grid.engine, "close", None)
+    if close:
+        close()
+
+    return {
+        'run': run,
+        'seed': soup_seed,
+        'generations': cycle['start'] if cycle else None,
+        'period': cycle['period'] if cycle else None,
+        'final_population': len(grid.live_cells()),
+        'initial_population': initial_population,
+        'stabilized': cycle is not None,
+    }
+
+
+def _run_chunk(runs, **options):
+    return [run_soup(run, **options) for run in runs]
+
+
+# Results one run at a time, in the order they finish. Runs are handed to the pool in
+# chunks so the per-task overhead is paid once per chunk rather than once per run.
+def iter_ensemble(runs, workers=None, chunksize=None, **options):
+    runs = list(range(runs)) if isinstance(runs, int) else list(runs)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(runs) or 1))
+    if workers > 1 and options.get('engine') not in (None, *ENSEMBLE_ENGINES):
+        raise EngineError(f"The {options['engine']} engine can't run inside ensemble workers; "
+                          f"use workers=1 or one of: {', '.join(ENSEMBLE_ENGINES)}")
+    if workers == 1:
+        for run in runs:
+            yield run_soup(run, **options)
+        return
+
+    chunksize = chunksize or max(1, min(64, len(runs) // (workers * 4)))
+    chunks = [runs[i:i + chunksize] for i in range(0, len(runs), chunksize)]
+    with Pool(workers, initializer=detach_logging) as pool:
+        for results in pool.imap_unordered(partial(_run_chunk, **options), chunks):
+            yield from results
+
+
+# Writes each result as soon as it arrives: CSV, or JSON Lines for .jsonl/.json paths
+class ResultSink:
+    def __init__(self, path):
+        self.path = path
+        self.jsonl = path.endswith((".jsonl", ".json"))
+        self._file = open(path, "w", newline="")
+        self._writer = None if self.jsonl else csv.DictWriter(self._file, fieldnames=RESULT_FIELDS)
+        if self._writer:
+            self._writer.writeheader()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write(self, result):
+        if self.jsonl:
+            self._file.write(json.dumps(result) + "\n")
+        else:
+            self._writer.writerow(result)
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+# Run an ensemble, streaming results to output, and return summary statistics
+def run_ensemble(runs, output=None, workers=None, chunksize=None, **options):
+    sink = ResultSink(output) if output else None
+    count = stabilized = 0
+    lifespans = []
+    populations = []
+    periods = {}
+    start_time = time.perf_counter()
+    try:
+        for result in iter_ensemble(runs, workers=workers, chunksize=chunksize, **options):
+            if sink:
+                sink.write(result)
+            count += 1
+            populations.append(result['final_population'])
+            if result['stabilized']:
+                stabilized += 1
+                lifespans.append(result['generations'])
+                periods[result['period']] = periods.get(result['period'], 0) + 1
+    finally:
+        if sink:
+            sink.close()
+    elapsed = time.perf_counter() - start_time
+
+    summary = {
+        'runs': count,
+        'workers': workers or os.cpu_count(),
+        'elapsed_s': elapsed,
+        'runs_per_sec': count / elapsed if elapsed else None,
+        'stabilized': stabilized,
+        'mean_generations': sum(lifespans) / len(lifespans) if lifespans else None,
+        'max_generations_seen': max(lifespans) if lifespans else None,
+        'mean_final_population': sum(populations) / count if count else None,
+        'periods': {str(period): n for period, n in sorted(periods.items())},
+        'output': output,
+    }
+    logging.info(f"Ensemble: {count} runs in {elapsed:.2f} seconds, {stabilized} stabilized")
+    return summary
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Run many random soups and stream per-run results to CSV or JSON Lines.")
+    parser.add_argument("runs", type=int, help="Number of soups")
+    parser.add_argument("--rows", type=int, default=64)
+    parser.add_argument("--cols", type=int, default=64)
+    parser.add_argument("--density", type=float, default=0.35, help="Fraction of cells alive at the start")
+    parser.add_argument("--seed", type=int, default=0, help="Ensemble seed; run n always gets the same soup")
+    parser.add_argument("--max-generations", type=int, default=1000)
+    parser.add_argument("--engine", choices=ENSEMBLE_ENGINES, default="numpy")
+    parser.add_argument("--rule", default="B3/S23")
+    parser.add_argument("--boundary", choices=BOUNDARY_NAMES, default="dead")
+    parser.add_argument("--window", type=int, default=100, help="Longest period detected")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--chunksize", type=int, default=None, help="Runs handed to a worker at a time")
+    parser.add_argument("--output", default=None, help="Per-run results (.csv, or .jsonl for JSON Lines)")
+    parser.add_argument("--log-file", default=None, help="Log to this file (rotated at 5 MB)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.log_file:
+        configure_logging(args.log_file)
+    summary = run_ensemble(args.runs, output=args.output, workers=args.workers, chunksize=args.chunksize,
+                           rows=args.rows, cols=args.cols, density=args.density, seed=args.seed,
+                           max_generations=args.max_generations, engine=args.engine, rule=args.rule,
+                           boundary=args.boundary, window=args.window)
+    json.dump(summary, sys.stdout, indent=2)
+    print()
+    return summary
+
+
+if __name__ == "__main__":
+    main()
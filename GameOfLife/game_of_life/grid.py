@@ -1,9 +1,8 @@
 from .utils import timed
-from .rules import Rules
+from .engines import get_engine
+from itertools import count
 import logging
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', filename='logs/simulation.log', filemode='a')
-
 class GridSizeError(Exception):
     pass
 
@@ -11,17 +10,53 @@ class PatternSizeError(Exception):
     pass
 
 
+# One generation of Grid.run. Population, births and deaths come out of the evolution
+# step itself; the bounding box is only computed when it is read. changed lists the cells
+# that flipped when the step was asked for them.
+class GenerationRecord:
+    __slots__ = ('generation', 'population', 'births', 'deaths', 'changed', '_engine', '_grid', '_bounding_box')
+
+    def __init__(self, generation, population, births, deaths, engine, grid, changed=None):
+        self.generation = generation
+        self.population = population
+        self.births = births
+        self.deaths = deaths
+        self.changed = changed
+        self._engine = engine
+        self._grid = grid
+        self._bounding_box = False
+
+    # (min_row, min_col, max_row, max_col) of the live cells, None when empty. The parallel
+    # engine reuses its buffers, so read it before asking for the record after next.
+    @property
+    def bounding_box(self):
+        if self._bounding_box is False:
+            self._bounding_box = self._engine.bounding_box(self._grid)
+            self._grid = None
+        return self._bounding_box
+
+    def __repr__(self):
+        return (f"GenerationRecord(generation={self.generation}, population={self.population}, "
+                f"births={self.births}, deaths={self.deaths})")
+
+
 class Grid:
-    def __init__(self, rows, cols):
+    def __init__(self, rows, cols, engine="python", rule="B3/S23", boundary="dead", **engine_options):
         if rows <= 0 or cols <= 0:
             logging.error("Invalid grid size - must be positive integers")
             raise GridSizeError("Grid size must be positive integers.")
         self.rows = rows
         self.cols = cols
+        self.engine = get_engine(engine, rows, cols, rule=rule, boundary=boundary, **engine_options)
+        self.rule = self.engine.rule
+        self.boundary = self.engine.boundary
         self.grid = self.create_empty_grid()
+        self.generation = 0
+        # Population of the grid object it was counted for, kept up to date by step()
+        self._counted = (None, 0)
 
     def create_empty_grid(self):
-        return [[0 for _ in range(self.cols)] for _ in range(self.rows)]
+        return self.engine.empty()
     
     @timed
     # Load pattern from file
@@ -40,23 +75,81 @@ class Grid:
         
         for r in range(pattern_rows):
             for c in range(pattern_cols):
-                self.grid[offset_row + r][offset_col + c] = pattern[r][c]
+                self.engine.set_cell(self.grid, offset_row + r, offset_col + c, pattern[r][c])
+        self._counted = (None, 0)
                 
     def display(self):
-        for row in self.grid:
+        for row in self.to_list():
             print(" ".join([' O ' if cell else ' . ' for cell in row]))
         print()
         
+    def set_cell(self, row, col, value):
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            raise PatternSizeError(f"Cell ({row},{col}) is outside the grid ({self.rows}x{self.cols}).")
+        self.engine.set_cell(self.grid, row, col, value)
+        self._counted = (None, 0)
+        
     def get_cell(self, row, col):
-        if 0 <= row < self.rows and 0 <= col < self.cols:
-            return self.grid[row][col]
-        return 0  # Treat out-of-bounds as dead cells
+        # Out-of-bounds cells are dead, or wrap around for torus and Klein bottle grids
+        cell = self.boundary.locate(row, col, self.rows, self.cols)
+        if cell is None:
+            return 0
+        return self.engine.get_cell(self.grid, *cell)
             
     def evolve(self):
-        self.grid = Rules.evolve_grid(self.grid)
+        self.grid = self.engine.evolve(self.grid)
+        self.generation += 1
+        self._counted = (None, 0)
+    
+    # Evolve one generation and return its GenerationRecord. With changes=True the engine
+    # also reports which cells were born and died while evolving, in record.changed.
+    def step(self, changes=False):
+        population = self.population()
+        changed = None
+        if changes:
+            self.grid, born, died = self.engine.evolve_changes(self.grid)
+            births, deaths = len(born), len(died)
+            changed = born + died
+        else:
+            self.grid, births, deaths = self.engine.evolve_stats(self.grid)
+        self.generation += 1
+        population += births - deaths
+        self._counted = (self.grid, population)
+        return GenerationRecord(self.generation, population, births, deaths, self.engine, self.grid, changed)
+    
+    # Lazily evolve up to max_generations (forever when None), yielding a GenerationRecord
+    # per generation. Stop early by breaking out, or with itertools.takewhile.
+    def run(self, max_generations=None):
+        for _ in (count() if max_generations is None else range(max_generations)):
+            yield self.step()
+    
+    def population(self):
+        grid, population = self._counted
+        if grid is not self.grid:
+            population = self.engine.population(self.grid)
+            self._counted = (self.grid, population)
+        return population
+    
+    def bounding_box(self):
+        return self.engine.bounding_box(self.grid)
         
     def is_grid_alive(self):
-        return any(cell == 1 for row in self.grid for cell in row)
+        # Free while the population is being tracked by step()
+        if self._counted[0] is self.grid:
+            return self._counted[1] > 0
+        return self.engine.is_alive(self.grid)
+    
+    def live_cells(self):
+        return self.engine.live_cells(self.grid)
+    
+    # Plain list of lists copy, regardless of engine (used to cross-check engines)
+    def to_list(self):
+        return self.engine.to_list(self.grid)
+            
+    # uint8 NumPy array of the cells, regardless of engine
+    def to_array(self):
+        return self.engine.to_array(self.grid)
             
     def clear(self):
-        self.grid = self.create_empty_grid()
\ No newline at end of file
+        self.grid = self.create_empty_grid()
+        self._counted = (None, 0)
\ No newline at end of file
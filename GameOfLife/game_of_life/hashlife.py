@@ -0,0 +1,291 @@
+from .grid import Grid, PatternSizeError
+from .rules import Rules, get_rule
+from .boundary import BoundaryError
+from .utils import timed
+import logging
+
+
+# Raised by _join when the node table is full in the middle of a jump
+class _NodeLimitReached(Exception):
+    pass
+
+
+# Quadtree node. Level k covers a 2^k x 2^k square; level 0 nodes are single cells.
+# Nodes are canonical (one instance per distinct content), so identity means equality.
+class Node:
+    __slots__ = ('level', 'nw', 'ne', 'sw', 'se', 'population')
+
+    def __init__(self, level, nw, ne, sw, se, population):
+        self.level = level
+        self.nw = nw
+        self.ne = ne
+        self.sw = sw
+        self.se = se
+        self.population = population
+
+
+# HashLife universe (unbounded). Identical sub-squares share one node, and the future
+# of every node is memoized, so advance(n) costs roughly O(log n) for regular patterns.
+# Matches stepping Rules.evolve_grid n times as long as the pattern stays clear of the
+# grid edge (the dead boundary of a finite grid cannot be skipped ahead).
+class HashLife:
+    def __init__(self, max_nodes=1_000_000, rule="B3/S23"):
+        self.max_nodes = max_nodes
+        self._node_limit = float('inf')   # max_nodes while advance() runs
+        self.rule = get_rule(rule)
+        self.off = Node(0, None, None, None, None, 0)
+        self.on = Node(0, None, None, None, None, 1)
+        self._nodes = {}        # (nw, ne, sw, se) -> canonical node
+        self._results = {}      # (node, j) -> centre of node advanced 2^j generations
+        self._empty = [self.off]
+        self.generation = 0
+        self.rows = None
+        self.cols = None
+        self.root = self._empty_node(3)
+        self.origin_row = 0     # Cell coordinates of the root's top-left corner
+        self.origin_col = 0
+
+    @classmethod
+    def from_pattern(cls, pattern, offset_row=0, offset_col=0, max_nodes=1_000_000, rule="B3/S23"):
+        if not pattern or not pattern[0]:
+            raise PatternSizeError("Pattern cannot be empty.")
+        universe = cls(max_nodes=max_nodes, rule=rule)
+        universe.set_cells((offset_row + r, offset_col + c)
+                           for r, row in enumerate(pattern) for c, cell in enumerate(row) if cell)
+        return universe
+
+    @classmethod
+    def from_grid(cls, grid, max_nodes=1_000_000):
+        if grid.boundary.wraps:
+            raise BoundaryError(f"HashLife universes are unbounded and cannot wrap a {grid.boundary.name} grid.")
+        universe = cls(max_nodes=max_nodes, rule=grid.rule)
+        universe.set_cells((r, c) for r, row in enumerate(grid.to_list()) for c, cell in enumerate(row) if cell)
+        universe.rows = grid.rows
+        universe.cols = grid.cols
+        return universe
+
+    # Canonical node lookup: equal children always give back the same node
+    def _join(self, nw, ne, sw, se):
+        key = (nw, ne, sw, se)
+        node = self._nodes.get(key)
+        if node is None:
+            if len(self._nodes) >= self._node_limit:
+                raise _NodeLimitReached()
+            node = Node(nw.level + 1, nw, ne, sw, se,
+                        nw.population + ne.population + sw.population + se.population)
+            self._nodes[key] = node
+        return node
+
+    def _empty_node(self, level):
+        while len(self._empty) <= level:
+            empty = self._empty[-1]
+            self._empty.append(self._join(empty, empty, empty, empty))
+        return self._empty[level]
+
+    # Wrap node in an empty border: level k+1 with node in the middle
+    def _centre(self, node):
+        empty = self._empty_node(node.level - 1)
+        return self._join(
+            self._join(empty, empty, empty, node.nw),
+            self._join(empty, empty, node.ne, empty),
+            self._join(empty, node.sw, empty, empty),
+            self._join(node.se, empty, empty, empty))
+
+    # Level 2 base case: one generation of the 4x4 square gives its 2x2 centre
+    def _life_4x4(self, node):
+        cells = [
+            [node.nw.nw, node.nw.ne, node.ne.nw, node.ne.ne],
+            [node.nw.sw, node.nw.se, node.ne.sw, node.ne.se],
+            [node.sw.nw, node.sw.ne, node.se.nw, node.se.ne],
+            [node.sw.sw, node.sw.se, node.se.sw, node.se.se],
+        ]
+        cells = [[cell.population for cell in row] for row in cells]
+        centre = []
+        for row in (1, 2):
+            for col in (1, 2):
+                neighbors = sum(cells[row + dr][col + dc]
+                                for dr in (-1, 0, 1) for dc in (-1, 0, 1)) - cells[row][col]
+                centre.append(self.on if Rules.next_state(cells[row][col], neighbors, self.rule) else self.off)
+        return self._join(*centre)
+
+    # Centre (level k-1) of a level k node, advanced 2^j generations (j <= k-2)
+    def _successor(self, node, j):
+        if node.population == 0:
+            return node.nw
+        key = (node, j)
+        result = self._results.get(key)
+        if result is not None:
+            return result
+
+        if node.level == 2:
+            result = self._life_4x4(node)
+        else:
+            join, successor = self._join, self._successor
+            nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+            # Nine overlapping level k-1 sub-squares, each advanced to its centre
+            c1 = successor(nw, j)
+            c2 = successor(join(nw.ne, ne.nw, nw.se, ne.sw), j)
+            c3 = successor(ne, j)
+            c4 = successor(join(nw.sw, nw.se, sw.nw, sw.ne), j)
+            c5 = successor(join(nw.se, ne.sw, sw.ne, se.nw), j)
+            c6 = successor(join(ne.sw, ne.se, se.nw, se.ne), j)
+            c7 = successor(sw, j)
+            c8 = successor(join(sw.ne, se.nw, sw.se, se.sw), j)
+            c9 = successor(se, j)
+            if j < node.level - 2:
+                # Already advanced far enough, just stitch the centre together
+                result = join(
+                    join(c1.se, c2.sw, c4.ne, c5.nw),
+                    join(c2.se, c3.sw, c5.ne, c6.nw),
+                    join(c4.se, c5.sw, c7.ne, c8.nw),
+                    join(c5.se, c6.sw, c8.ne, c9.nw))
+            else:
+                # Second half of the 2^(k-2) generations
+                result = join(
+                    successor(join(c1, c2, c4, c5), j),
+                    successor(join(c2, c3, c5, c6), j),
+                    successor(join(c4, c5, c7, c8), j),
+                    successor(join(c5, c6, c8, c9), j))
+
+        self._results[key] = result
+        return result
+
+    # True when all live cells sit in the middle half of the node
+    def _is_padded(self, node):
+        return (node.nw.se.population + node.ne.sw.population +
+                node.sw.ne.population + node.se.nw.population) == node.population
+
+    def set_cells(self, live_cells):
+        live_cells = list(live_cells)
+        self.generation = 0
+        if not live_cells:
+            self.root = self._empty_node(3)
+            self.origin_row = self.origin_col = 0
+            return
+
+        self.origin_row = min(row for row, _ in live_cells)
+        self.origin_col = min(col for _, col in live_cells)
+        extent = max(max(row for row, _ in live_cells) - self.origin_row,
+                     max(col for _, col in live_cells) - self.origin_col) + 1
+
+        # Build bottom-up, only creating nodes for squares that contain live cells
+        nodes = {(row - self.origin_row, col - self.origin_col): self.on for row, col in live_cells}
+        level = 0
+        while level < 3 or (1 << level) < extent:
+            empty = self._empty_node(level)
+            parents = {}
+            for (row, col) in nodes:
+                parents.setdefault((row >> 1, col >> 1), None)
+            nodes = {
+                (row, col): self._join(
+                    nodes.get((2 * row, 2 * col), empty),
+                    nodes.get((2 * row, 2 * col + 1), empty),
+                    nodes.get((2 * row + 1, 2 * col), empty),
+                    nodes.get((2 * row + 1, 2 * col + 1), empty))
+                for (row, col) in parents
+            }
+            level += 1
+        self.root = nodes[(0, 0)]
+
+    # Advance 2^j generations: grow the root until the pattern sits in its middle half,
+    # once more so the result covers it, and take the successor. The root and origin only
+    # change once the jump is complete.
+    def _jump(self, j):
+        root = self.root
+        shift = 0
+        while root.level < j + 2 or not self._is_padded(root):
+            shift += 1 << (root.level - 1)
+            root = self._centre(root)
+        shift += 1 << (root.level - 1)
+        root = self._centre(root)
+        shift -= 1 << (root.level - 2)
+        self.root = self._successor(root, j)
+        self.origin_row -= shift
+        self.origin_col -= shift
+
+    @timed
+    def advance(self, n):
+        if n < 0:
+            raise ValueError("Cannot advance a negative number of generations.")
+        self.generation += n
+
+        # One jump per set bit of n, largest first. The node table is bounded during the
+        # recursion too: when it fills up mid-jump, the jump is dropped, garbage collected
+        # and retried, as two half jumps if the table fills up again straight after a
+        # collection. A single generation is always finished, whatever it takes.
+        jumps = [j for j in reversed(range(n.bit_length())) if (n >> j) & 1]
+        collected = False
+        while jumps:
+            j = jumps[0]
+            self._node_limit = float('inf') if collected and j == 0 else self.max_nodes
+            try:
+                self._jump(j)
+            except _NodeLimitReached:
+                if collected:
+                    jumps[0:1] = [j - 1, j - 1]
+                self.collect_garbage()
+                collected = True
+            else:
+                jumps.pop(0)
+                collected = False
+            finally:
+                self._node_limit = float('inf')
+        return self
+
+    # Drop memoized results and every node no longer reachable from the root
+    def collect_garbage(self):
+        before = len(self._nodes)
+        self._results = {}
+        self._nodes = {}
+        self._empty = [self.off]
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node.level == 0:
+                continue
+            key = (node.nw, node.ne, node.sw, node.se)
+            if key not in self._nodes:
+                self._nodes[key] = node
+                stack.extend(key)
+        logging.info(f"HashLife garbage collection: {before} -> {len(self._nodes)} nodes")
+
+    def node_count(self):
+        return len(self._nodes)
+
+    @property
+    def population(self):
+        return self.root.population
+
+    def is_grid_alive(self):
+        return self.root.population > 0
+
+    def live_cells(self):
+        cells = set()
+        stack = [(self.root, self.origin_row, self.origin_col)]
+        while stack:
+            node, row, col = stack.pop()
+            if node.population == 0:
+                continue
+            if node.level == 0:
+                cells.add((row, col))
+                continue
+            half = 1 << (node.level - 1)
+            stack.append((node.nw, row, col))
+            stack.append((node.ne, row, col + half))
+            stack.append((node.sw, row + half, col))
+            stack.append((node.se, row + half, col + half))
+        return cells
+
+    # Copy the state into a Grid the same size as the one it was loaded from
+    def to_grid(self, rows=None, cols=None, engine="python"):
+        rows = rows if rows is not None else self.rows
+        cols = cols if cols is not None else self.cols
+        if rows is None or cols is None:
+            raise PatternSizeError("Grid size unknown, pass rows and cols.")
+        grid = Grid(rows, cols, engine=engine, rule=self.rule)
+        for row, col in self.live_cells():
+            if not (0 <= row < rows and 0 <= col < cols):
+                logging.error(f"Live cell ({row},{col}) outside grid ({rows}x{cols}) at generation {self.generation}")
+                raise PatternSizeError(f"Pattern has left the grid ({rows}x{cols}) at generation {self.generation}.")
+            grid.engine.set_cell(grid.grid, row, col, 1)
+        return grid
@@ -0,0 +1,133 @@
+# The same file is in GameOfLife/game_of_life and SmartCourier/smart_courier: the two packages are
+# installed separately and neither depends on the other. tests/logging_setup_test.py in each
+# checks that the copies match, so change both.
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+import atexit
+import logging
+import os
+import queue
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+
+# Only merges the message with its arguments in the calling thread; timestamps and
+# the rest of the formatting are left to the listener thread
+class FastQueueHandler(QueueHandler):
+    def prepare(self, record):
+        if record.exc_info:
+            return super().prepare(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+# RotatingFileHandler seeks to the end of the file to check its size and StreamHandler
+# flushes, both for every record. Here the size is tracked in memory and the listener
+# flushes once per batch.
+class BatchedRotatingFileHandler(RotatingFileHandler):
+    def __init__(self, filename, maxBytes=0, backupCount=0):
+        super().__init__(filename, maxBytes=maxBytes, backupCount=backupCount)
+        self._size = os.path.getsize(self.baseFilename)
+
+    def emit(self, record):
+        try:
+            text = self.format(record) + self.terminator
+            if self.maxBytes and self._size and self._size + len(text) > self.maxBytes:
+                self.doRollover()
+                self._size = 0
+            self.stream.write(text)
+            self._size += len(text)
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        pass
+
+    def flush_batch(self):
+        self.acquire()
+        try:
+            if self.stream and not self.stream.closed:
+                self.stream.flush()
+        finally:
+            self.release()
+
+
+# Background thread that drains the queue in batches: everything already queued is
+# written before the file is flushed once
+class BatchingQueueListener(QueueListener):
+    def __init__(self, log_queue, *handlers, batch_size=512):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.batch_size = batch_size
+
+    def _monitor(self):
+        has_task_done = hasattr(self.queue, 'task_done')
+        while True:
+            batch = [self.dequeue(True)]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.dequeue(False))
+                except queue.Empty:
+                    break
+            stop = False
+            for record in batch:
+                if record is self._sentinel:
+                    stop = True
+                else:
+                    self.handle(record)
+                if has_task_done:
+                    self.queue.task_done()
+            for handler in self.handlers:
+                getattr(handler, 'flush_batch', handler.flush)()
+            if stop:
+                return
+
+
+_listener = None
+_queue_handler = None
+
+
+# Route the root logger through a queue to a rotating log file written on a background
+# thread. Called by entry points, never at import time; the log directory is created.
+def configure_logging(log_file, level=logging.INFO, max_bytes=5 * 1024 * 1024, backup_count=3, batch_size=512):
+    global _listener, _queue_handler
+    shutdown_logging()
+
+    directory = os.path.dirname(log_file)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    file_handler = BatchedRotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count)
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    log_queue = queue.SimpleQueue()
+    _queue_handler = FastQueueHandler(log_queue)
+    root = logging.getLogger()
+    root.addHandler(_queue_handler)
+    root.setLevel(level)
+
+    _listener = BatchingQueueListener(log_queue, file_handler, batch_size=batch_size)
+    _listener.start()
+    return _listener
+
+
+# Write out everything still queued and close the log file
+def shutdown_logging():
+    global _listener, _queue_handler
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+# Child processes inherit the queue handler but not the listener thread
+def detach_logging():
+    global _listener, _queue_handler
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+    _listener = _queue_handler = None
+
+
+atexit.register(shutdown_logging)
@@ -1,65 +1,92 @@
 from .grid import Grid
-from .utils import timed, load_pattern_from_txt, clear_screen
+from .cycles import CycleDetector
+from .utils import timed
+from .render import TerminalRenderer
+from .patterns import load_cached_pattern
+from .logging_setup import configure_logging
 import time
 import logging
 
-# Logging configuration
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', filename='GameOfLife/logs/simulation.log', filemode='a')
+LOG_FILE = 'GameOfLife/logs/simulation.log'
 stats = {'start_time': None, 'end_time': None}
+GENERATION_DELAY_S = 0.2   # Default pause between generations, so the animation can be followed
 
 @timed
 def main():
     import time as timemodule
+    configure_logging(LOG_FILE)
     
     # Example usage
     rows, cols = 20, 20
+    history_window = 100   # Generations remembered for still life / oscillator detection
     grid = Grid(rows, cols)
     
-    # Pass blinker.txt pattern to load_pattern function in grid class
-    glider_pattern = load_pattern_from_txt("GameOfLife/patterns/glider.txt")
-    blinker_pattern = load_pattern_from_txt("GameOfLife/patterns/blinker.txt")
-    other_pattern = load_pattern_from_txt("GameOfLife/patterns/other.txt")
+    pattern_files = {
+        "glider": "GameOfLife/patterns/glider.txt",
+        "blinker": "GameOfLife/patterns/blinker.txt",
+        "other": "GameOfLife/patterns/other.txt",
+    }
     
     pattern = input("Choose pattern (glider/blinker/other): ").strip().lower()
-    if pattern == "glider":
-        pattern = glider_pattern
-    elif pattern == "blinker":
-        pattern = blinker_pattern
-    elif pattern == "other":
-        pattern = other_pattern
-    else:
+    if pattern not in pattern_files:
         print("Invalid pattern choice. Defaulting to glider.")
-        pattern = glider_pattern
+        pattern = "glider"
+    # Only the chosen pattern is parsed, and only when the file changed since last run
+    pattern = load_cached_pattern(pattern_files[pattern]).to_list()
         
     offset_row = input("Enter offset row (default centered, use 0 if other was chosen): ").strip()
     offset_col = input("Enter offset column (default centered, use 0 if other was chosen): ").strip()
     offset_row = int(offset_row) if offset_row.isdigit() else int(rows / 2) - len(pattern) + 1
     offset_col = int(offset_col) if offset_col.isdigit() else int(cols / 2) - len(pattern[0]) + 1
     
+    delay = input(f"Enter seconds between generations (default {GENERATION_DELAY_S}, 0 for no pause): ").strip()
+    try:
+        delay = max(0.0, float(delay)) if delay else GENERATION_DELAY_S
+    except ValueError:
+        print(f"Invalid delay. Defaulting to {GENERATION_DELAY_S} seconds.")
+        delay = GENERATION_DELAY_S
+    
     grid.load_pattern(pattern, offset_row=offset_row, offset_col=offset_col)
     
     print("Initial Grid:") 
     grid.display()
     
     generation = 0
+    cycle = None
+    detector = CycleDetector(window=history_window)
+    detector.reset(grid.live_cells())
+    
+    # Frames are drawn on the renderer's own thread, redrawing only changed cells
+    renderer = TerminalRenderer(max_fps=30)
     
     stats['start_time'] = timemodule.time()
     try: 
+        renderer.start()
         while grid.is_grid_alive():
-            clear_screen()
-            print(f"Generation {generation}")
-            print("=" * 80)
-            grid.display()
-            print("=" * 80)
-            print("Press Ctrl+C to stop the simulation.")
-            time.sleep(0.2)
-            grid.evolve()
+            renderer.submit(grid.to_list(), title=f"Generation {generation} - press Ctrl+C to stop the simulation.")
+            if delay:
+                time.sleep(delay)
+            # step() keeps the population up to date, so the is_grid_alive check is free
+            record = grid.step(changes=True)
             generation += 1
+            
+            # Stop once the grid repeats itself (still life or oscillator)
+            cycle = detector.update(record.changed)
+            if cycle:
+                break
     
-        print("Simulation ended because all cells are dead.")
-        logging.info(f"All cells are dead at generation {generation}.")
+        renderer.stop()
+        if cycle:
+            kind = "still life" if cycle['period'] == 1 else f"oscillator with period {cycle['period']}"
+            print(f"Simulation ended at generation {generation}: {kind} since generation {cycle['start']}.")
+            logging.info(f"Cycle of period {cycle['period']} from generation {cycle['start']} detected at generation {generation}.")
+            grid.display()
+        else:
+            print("Simulation ended because all cells are dead.")
+            logging.info(f"All cells are dead at generation {generation}.")
     
     except KeyboardInterrupt:
+        renderer.stop()
         logging.info(f"Simulation stopped by user at generation {generation}.")
         print(f"Simulation stopped by user at {generation} generation(s).")
         print("Final Grid State:")
@@ -0,0 +1,141 @@
+from .engines import NumpyEngine
+from .rules import Rules, CONWAY, get_rule
+from .boundary import DEAD, get_boundary
+from multiprocessing import Array, Barrier, Process
+from multiprocessing.shared_memory import SharedMemory
+import numpy as np
+import logging
+import os
+import weakref
+
+
+# Worker loop: evolves rows start..stop of the grid in place between the two shared
+# buffers. The halo (one row above and below the stripe) is read straight out of the
+# neighbouring stripes in shared memory, so nothing else crosses process boundaries.
+def _worker(buffer_names, shape, start, stop, rulestring, boundary_name, command,
+            start_barrier, step_barrier, done_barrier):
+    rule = get_rule(rulestring)
+    boundary = get_boundary(boundary_name)
+    buffers = [SharedMemory(name=name) for name in buffer_names]
+    arrays = [np.ndarray(shape, dtype=np.uint8, buffer=buffer.buf) for buffer in buffers]
+    try:
+        while True:
+            start_barrier.wait()
+            generations, front = command[0], command[1]
+            if generations < 0:
+                break
+            for generation in range(generations):
+                source, target = arrays[front], arrays[1 - front]
+                # Grid rows start..stop are padded rows start+1..stop, plus the halo rows
+                target[start + 1:stop + 1, 1:-1] = Rules.evolve_padded(source[start:stop + 2], rule)
+                # Wrapped boundaries: refresh the ghost cells copied from this stripe
+                boundary.fill_ghosts(target, start, stop)
+                if generation < generations - 1:
+                    step_barrier.wait()
+                front = 1 - front
+            done_barrier.wait()
+    finally:
+        del arrays
+        for buffer in buffers:
+            buffer.close()
+
+
+def _shutdown(buffers, processes, command, start_barrier):
+    if processes:
+        command[0] = -1
+        start_barrier.wait()
+        for process in processes:
+            process.join()
+    for buffer in buffers:
+        buffer.close()
+        buffer.unlink()
+
+
+# Multi-core engine: the board is split into row stripes, one per worker process.
+# Two padded boards live in shared memory and swap roles every generation
+# (double buffering), so no generation is ever copied.
+class ParallelEngine(NumpyEngine):
+    name = "parallel"
+
+    def __init__(self, rows, cols, rule=CONWAY, boundary=DEAD, workers=None):
+        self.rows = rows
+        self.cols = cols
+        self.rule = rule
+        self.boundary = boundary
+        self.workers = max(1, min(workers or os.cpu_count() or 1, rows))
+        self._shape = (rows + 2, cols + 2)
+        # The border of each buffer holds the ghost cells: left at zero for a dead
+        # boundary, refreshed by the workers every generation for wrapped ones
+        self._buffers = [SharedMemory(create=True, size=self._shape[0] * self._shape[1]) for _ in range(2)]
+        self._arrays = [np.ndarray(self._shape, dtype=np.uint8, buffer=buffer.buf) for buffer in self._buffers]
+        self._views = [array[1:-1, 1:-1] for array in self._arrays]
+        for array in self._arrays:
+            array.fill(0)
+        self._front = 0
+        self._command = Array('q', 2, lock=False)
+        self._start_barrier = Barrier(self.workers + 1)
+        self._step_barrier = Barrier(self.workers)
+        self._done_barrier = Barrier(self.workers + 1)
+        self._processes = []
+        self._finalizer = weakref.finalize(self, _shutdown, self._buffers, self._processes,
+                                           self._command, self._start_barrier)
+
+    # Stripe bounds: rows split as evenly as possible
+    def stripes(self):
+        size, extra = divmod(self.rows, self.workers)
+        bounds = []
+        start = 0
+        for worker in range(self.workers):
+            stop = start + size + (1 if worker < extra else 0)
+            bounds.append((start, stop))
+            start = stop
+        return bounds
+
+    def _start_workers(self):
+        names = [buffer.name for buffer in self._buffers]
+        for start, stop in self.stripes():
+            process = Process(target=_worker, daemon=True,
+                              args=(names, self._shape, start, stop, self.rule.rulestring, self.boundary.name,
+                                    self._command, self._start_barrier, self._step_barrier, self._done_barrier))
+            process.start()
+            self._processes.append(process)
+        logging.info(f"Started {self.workers} parallel workers for a {self.rows}x{self.cols} grid")
+
+    def _view(self):
+        return self._views[self._front]
+
+    # Evolve the front buffer in the workers, one round trip for all generations
+    def run(self, generations):
+        if generations <= 0:
+            return self._view()
+        if not self._processes:
+            self._start_workers()
+        # Cells may have been set since the last run
+        self.boundary.fill_ghosts(self._arrays[self._front])
+        self._command[0] = generations
+        self._command[1] = self._front
+        self._start_barrier.wait()
+        self._done_barrier.wait()
+        self._front = (self._front + generations) % 2
+        return self._view()
+
+    # Arrays handed out are views of the front buffer; they are overwritten two generations later
+    def empty(self):
+        view = self._view()
+        view.fill(0)
+        return view
+
+    def evolve(self, grid):
+        view = self._view()
+        if grid is not view:
+            view[:] = grid
+        return self.run(1)
+
+    def from_list(self, cells):
+        view = self._view()
+        view[:] = np.array(cells, dtype=np.uint8)
+        return view
+
+    # Stop the workers and release the shared memory
+    def close(self):
+        self._finalizer()
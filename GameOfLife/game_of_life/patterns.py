@@ -0,0 +1,224 @@
+from .grid import PatternSizeError
+from .utils import PatternLoadError, timed
+from collections import OrderedDict
+import logging
+import os
+import re
+
+RLE_HEADER_PATTERN = re.compile(r'^x\s*=\s*(\d+)\s*,\s*y\s*=\s*(\d+)')
+RLE_TOKEN_PATTERN = re.compile(r'(\d*)([a-zA-Z$!])')
+LIFE_106_CELL_PATTERN = re.compile(r'^(-?\d+)\s+(-?\d+)$')
+PLAINTEXT_LINE_PATTERN = re.compile(r'^[O.]+$')
+
+CACHE_SIZE = 32
+_pattern_cache = OrderedDict()    # absolute path -> (mtime_ns, Pattern)
+_cache_stats = {'hits': 0, 'misses': 0}
+
+
+# Parsed pattern kept as live cell coordinates relative to its top-left corner
+class Pattern:
+    def __init__(self, rows, cols, cells):
+        self.rows = rows
+        self.cols = cols
+        self.cells = cells
+
+    @property
+    def population(self):
+        return len(self.cells)
+
+    # Same layout as load_pattern_from_txt, for Grid.load_pattern
+    def to_list(self):
+        grid = [[0 for _ in range(self.cols)] for _ in range(self.rows)]
+        for row, col in self.cells:
+            grid[row][col] = 1
+        return grid
+
+
+def detect_format(filepath):
+    extension = os.path.splitext(filepath)[1].lower()
+    if extension == ".rle":
+        return "rle"
+    if extension in (".lif", ".life"):
+        return "life106"
+    with open(filepath, 'r') as f:
+        first_line = f.readline().strip()
+    if first_line.startswith("#Life 1.06"):
+        return "life106"
+    return "plaintext"
+
+
+# Parsers yield live cells and fill in `size` with the declared (rows, cols) if known
+def _iter_plaintext(lines, size):
+    row = 0
+    for line in lines:
+        line = line.strip()
+        # Skip empty lines and Golly style "!Name" comments
+        if not line or line.startswith("!"):
+            continue
+        if not PLAINTEXT_LINE_PATTERN.match(line):
+            raise PatternLoadError(f"Invalid pattern line: {line}")
+        for col, cell in enumerate(line):
+            if cell == "O":
+                yield row, col
+        row += 1
+        size['rows'] = row
+        size['cols'] = max(size.get('cols', 0), len(line))
+
+
+def _iter_rle(lines, size):
+    row = col = 0
+    count = ""
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        header = RLE_HEADER_PATTERN.match(line)
+        if header:
+            size['cols'], size['rows'] = int(header.group(1)), int(header.group(2))
+            continue
+        position = 0
+        for match in RLE_TOKEN_PATTERN.finditer(line):
+            if line[position:match.start()].strip():
+                raise PatternLoadError(f"Invalid RLE data: {line}")
+            position = match.end()
+            # A run count may be split from its tag by a line break
+            count += match.group(1)
+            run = int(count) if count else 1
+            count = ""
+            tag = match.group(2)
+            if tag == "!":
+                return
+            if tag == "$":
+                row += run
+                col = 0
+            elif tag == "b":
+                col += run
+            else:
+                # Any other letter is a live state in two-state RLE
+                for offset in range(run):
+                    yield row, col + offset
+                col += run
+        trailing = line[position:].strip()
+        if trailing.isdigit():
+            count += trailing
+        elif trailing:
+            raise PatternLoadError(f"Invalid RLE data: {line}")
+
+
+def _iter_life106(lines, size):
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        match = LIFE_106_CELL_PATTERN.match(line)
+        if not match:
+            raise PatternLoadError(f"Invalid Life 1.06 line: {line}")
+        # Life 1.06 lists "x y", i.e. column first
+        yield int(match.group(2)), int(match.group(1))
+
+
+PARSERS = {
+    "plaintext": _iter_plaintext,
+    "rle": _iter_rle,
+    "life106": _iter_life106,
+}
+
+
+# Stream (row, col) of every live cell, reading the file one line at a time
+def iter_live_cells(filepath, pattern_format=None, size=None):
+    try:
+        pattern_format = pattern_format or detect_format(filepath)
+        f = open(filepath, 'r')
+    except FileNotFoundError:
+        logging.error("Error loading pattern from file: %s", filepath)
+        raise PatternLoadError(f"Pattern file not found: {filepath}")
+
+    with f:
+        if pattern_format not in PARSERS:
+            raise PatternLoadError(f"Unknown pattern format: {pattern_format}")
+        yield from PARSERS[pattern_format](f, size if size is not None else {})
+
+
+def read_pattern(filepath, pattern_format=None):
+    size = {}
+    cells = list(iter_live_cells(filepath, pattern_format, size))
+    if not cells and not size:
+        logging.error("Error loading pattern from file: No valid pattern found in %s", filepath)
+        raise PatternLoadError("No valid pattern found in file")
+
+    if not size:
+        # Life 1.06 has no size and its coordinates can be negative, move the pattern to (0, 0)
+        min_row = min(row for row, _ in cells)
+        min_col = min(col for _, col in cells)
+        cells = [(row - min_row, col - min_col) for row, col in cells]
+    rows = max([size.get('rows', 0)] + [row + 1 for row, _ in cells])
+    cols = max([size.get('cols', 0)] + [col + 1 for _, col in cells])
+    return Pattern(rows, cols, tuple(cells))
+
+
+# Parsed pattern from the cache, reparsed only when the file's mtime changes
+def load_cached_pattern(filepath, pattern_format=None):
+    path = os.path.abspath(filepath)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        logging.error("Error loading pattern from file: %s", filepath)
+        raise PatternLoadError(f"Pattern file not found: {filepath}")
+
+    cached = _pattern_cache.get(path)
+    if cached is not None and cached[0] == mtime:
+        _cache_stats['hits'] += 1
+        _pattern_cache.move_to_end(path)
+        return cached[1]
+
+    _cache_stats['misses'] += 1
+    pattern = read_pattern(path, pattern_format)
+    _pattern_cache[path] = (mtime, pattern)
+    _pattern_cache.move_to_end(path)
+    if len(_pattern_cache) > CACHE_SIZE:
+        _pattern_cache.popitem(last=False)
+    return pattern
+
+
+def pattern_cache_info():
+    return {'size': len(_pattern_cache), 'max_size': CACHE_SIZE, **_cache_stats}
+
+
+def clear_pattern_cache():
+    _pattern_cache.clear()
+    _cache_stats['hits'] = _cache_stats['misses'] = 0
+
+
+# Write the live cells of a pattern file straight into a Grid, SparseGrid or BitGrid,
+# without building a list of lists. Only live cells are written.
+@timed
+def load_into(target, filepath, offset_row=0, offset_col=0, pattern_format=None):
+    rows = getattr(target, "rows", None)
+    cols = getattr(target, "cols", None)
+    if pattern_format is None and os.path.exists(filepath):
+        pattern_format = detect_format(filepath)
+    # A first streaming pass finds the extent of the live cells, so nothing is written
+    # unless all of them fit. Life 1.06 has no size and its coordinates can be negative:
+    # as in read_pattern, the pattern is moved to (0, 0).
+    min_row = min_col = max_row = max_col = None
+    for row, col in iter_live_cells(filepath, pattern_format):
+        if min_row is None:
+            min_row = max_row = row
+            min_col = max_col = col
+        else:
+            min_row, max_row = min(min_row, row), max(max_row, row)
+            min_col, max_col = min(min_col, col), max(max_col, col)
+    if min_row is None:
+        return 0
+    shift_row, shift_col = (min_row, min_col) if pattern_format == "life106" else (0, 0)
+    top, left = offset_row + min_row - shift_row, offset_col + min_col - shift_col
+    bottom, right = offset_row + max_row - shift_row, offset_col + max_col - shift_col
+    if (rows is not None and not 0 <= top <= bottom < rows) or (cols is not None and not 0 <= left <= right < cols):
+        logging.error(f"Pattern cells ({top},{left})-({bottom},{right}) outside grid ({rows}x{cols})")
+        raise PatternSizeError(f"Pattern does not fit in grid ({rows}x{cols}) at offset ({offset_row},{offset_col}).")
+
+    count = 0
+    for row, col in iter_live_cells(filepath, pattern_format):
+        target.set_cell(row + offset_row - shift_row, col + offset_col - shift_col, 1)
+        count += 1
+    return count
@@ -0,0 +1,197 @@
+from .grid import Grid
+from .rules import get_rule
+from .boundary import get_boundary
+from .utils import timed
+import numpy as np
+import logging
+import mmap
+import os
+import struct
+import zlib
+
+# Data file: header, then one record per generation.
+#   header: magic, rows, cols, keyframe interval, rulestring, boundary
+#   record: kind, generation, payload length, zlib payload
+#     keyframe payload: the full board, one bit per cell (np.packbits)
+#     delta payload:    sorted flat indices of the cells that flipped, delta encoded
+# Index file (<path>.idx): one fixed-size entry per generation with the record's offset
+# and the generation of the keyframe its delta chain starts from, so any generation is
+# found without scanning and rebuilt from at most one keyframe plus its deltas.
+MAGIC = b"GOLREC1\0"
+HEADER = struct.Struct("<8sIII24s8s")
+RECORD = struct.Struct("<BQI")
+INDEX_ENTRY = struct.Struct("<QQ")
+KEYFRAME = 1
+DELTA = 2
+
+
+class RecordingError(Exception):
+    pass
+
+
+def _index_dtype(rows, cols):
+    return np.uint32 if rows * cols < 2 ** 32 else np.uint64
+
+
+# Appends generations to a recording. Deltas cost O(changed cells), keyframes O(board)
+# and are written every keyframe_interval generations.
+class Recorder:
+    def __init__(self, path, rows, cols, keyframe_interval=256, compression_level=1, rule="B3/S23",
+                 boundary="dead"):
+        if keyframe_interval <= 0:
+            raise RecordingError("Keyframe interval must be a positive integer.")
+        self.path = path
+        self.rows = rows
+        self.cols = cols
+        self.keyframe_interval = keyframe_interval
+        self.rule = get_rule(rule)
+        self.boundary = get_boundary(boundary)
+        self.compression_level = compression_level
+        self.generation = 0
+        self._keyframe_generation = 0
+        self._dtype = _index_dtype(rows, cols)
+        self._offset = HEADER.size
+        self._data = open(path, "wb", buffering=1 << 20)
+        self._index = open(path + ".idx", "wb", buffering=1 << 16)
+        self._data.write(HEADER.pack(MAGIC, rows, cols, keyframe_interval,
+                                     self.rule.rulestring.encode("ascii"), self.boundary.name.encode("ascii")))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _write(self, kind, payload):
+        self._data.write(RECORD.pack(kind, self.generation, len(payload)))
+        self._data.write(payload)
+        self._index.write(INDEX_ENTRY.pack(self._offset, self._keyframe_generation))
+        self._offset += RECORD.size + len(payload)
+        self.generation += 1
+
+    def append_keyframe(self, cells):
+        cells = np.asarray(cells, dtype=np.uint8)
+        if cells.shape != (self.rows, self.cols):
+            raise RecordingError(f"Expected a {self.rows}x{self.cols} board, got {cells.shape}.")
+        self._keyframe_generation = self.generation
+        self._write(KEYFRAME, zlib.compress(np.packbits(cells).tobytes(), self.compression_level))
+
+    def append_delta(self, changed_cells):
+        if changed_cells:
+            indices = np.fromiter((row * self.cols + col for row, col in changed_cells),
+                                  dtype=self._dtype, count=len(changed_cells))
+            indices.sort()
+            encoded = np.diff(indices, prepend=self._dtype(0)).astype(self._dtype)
+            payload = zlib.compress(encoded.tobytes(), self.compression_level)
+        else:
+            payload = b""
+        self._write(DELTA, payload)
+
+    # Record the grid's current generation. Pass the cells that changed since the last
+    # append to write a delta; without them (or when a keyframe is due) the board is stored.
+    def append(self, grid, changed_cells=None):
+        if changed_cells is None or self.generation % self.keyframe_interval == 0:
+            self.append_keyframe(grid.to_array())
+        else:
+            self.append_delta(list(changed_cells))
+
+    def flush(self):
+        self._data.flush()
+        self._index.flush()
+
+    @timed
+    def close(self):
+        if not self._data.closed:
+            self._data.close()
+            self._index.close()
+            logging.info(f"Recorded {self.generation} generations to {self.path}")
+
+
+# Memory-mapped reader. state(g) starts from the keyframe of g's chain, or from the last
+# decoded state when that lies on the same chain, so playing forward costs one delta a step.
+class Replay:
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.rows, self.cols, self.keyframe_interval, rulestring, boundary = HEADER.unpack_from(self._data, 0)
+        if magic != MAGIC:
+            self._data.close()
+            raise RecordingError(f"{path} is not a Game of Life recording.")
+        self.rule = get_rule(rulestring.rstrip(b"\0").decode("ascii"))
+        self.boundary = get_boundary(boundary.rstrip(b"\0").decode("ascii"))
+        self._dtype = _index_dtype(self.rows, self.cols)
+
+        index_size = os.path.getsize(path + ".idx")
+        if index_size:
+            with open(path + ".idx", "rb") as f:
+                self._index = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self._index = b""
+        self.generations = index_size // INDEX_ENTRY.size
+        self._cached_generation = None
+        self._cached_state = None
+
+    def __len__(self):
+        return self.generations
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._data.close()
+        if isinstance(self._index, mmap.mmap):
+            self._index.close()
+
+    def _record(self, generation):
+        offset, keyframe_generation = INDEX_ENTRY.unpack_from(self._index, generation * INDEX_ENTRY.size)
+        kind, stored_generation, length = RECORD.unpack_from(self._data, offset)
+        if stored_generation != generation:
+            raise RecordingError(f"Index and data disagree at generation {generation}.")
+        start = offset + RECORD.size
+        return kind, keyframe_generation, self._data[start:start + length]
+
+    def _apply_delta(self, state, payload):
+        if payload:
+            indices = np.cumsum(np.frombuffer(zlib.decompress(payload), dtype=self._dtype), dtype=np.int64)
+            state.reshape(-1)[indices] ^= 1
+
+    # Board at the given generation as a uint8 array (a fresh copy)
+    def state(self, generation):
+        if not 0 <= generation < self.generations:
+            raise RecordingError(f"Generation {generation} not recorded (0-{self.generations - 1}).")
+        kind, keyframe_generation, payload = self._record(generation)
+
+        cached = self._cached_generation
+        if cached is not None and keyframe_generation <= cached <= generation:
+            state = self._cached_state.copy()
+            start = cached + 1
+        else:
+            _, _, keyframe = self._record(keyframe_generation)
+            bits = np.frombuffer(zlib.decompress(keyframe), dtype=np.uint8)
+            state = np.unpackbits(bits, count=self.rows * self.cols).reshape(self.rows, self.cols)
+            start = keyframe_generation + 1
+
+        for delta_generation in range(start, generation + 1):
+            self._apply_delta(state, self._record(delta_generation)[2])
+
+        self._cached_generation = generation
+        self._cached_state = state
+        return state.copy()
+
+    # Resume a Grid from any recorded generation
+    def to_grid(self, generation=None, engine="python", **engine_options):
+        generation = self.generations - 1 if generation is None else generation
+        grid = Grid(self.rows, self.cols, engine=engine, rule=self.rule, boundary=self.boundary, **engine_options)
+        grid.grid = grid.engine.from_list(self.state(generation).tolist())
+        grid.generation = generation
+        return grid
+
+
+def resume_grid(path, generation=None, engine="python", **engine_options):
+    with Replay(path) as replay:
+        generation = len(replay) - 1 if generation is None else generation
+        return replay.to_grid(generation, engine=engine, **engine_options), generation
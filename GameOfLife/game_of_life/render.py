@@ -0,0 +1,164 @@
+from queue import Queue, Empty, Full
+import numpy as np
+import sys
+import threading
+import time
+
+# ANSI escape sequences
+CLEAR = "\x1b[2J\x1b[H"
+HIDE_CURSOR = "\x1b[?25l"
+SHOW_CURSOR = "\x1b[?25h"
+
+# Braille dot bit for each (row, col) inside a 4x2 cell block
+BRAILLE_DOTS = ((0, 0, 0x01), (1, 0, 0x02), (2, 0, 0x04), (0, 1, 0x08),
+                (1, 1, 0x10), (2, 1, 0x20), (3, 0, 0x40), (3, 1, 0x80))
+HALF_BLOCKS = (" ", "▀", "▄", "█")   # none, top, bottom, both
+
+_STOP = object()
+
+
+def move_to(row, col):
+    return f"\x1b[{row + 1};{col + 1}H"
+
+
+def _pad(cells, row_multiple, col_multiple):
+    rows, cols = cells.shape
+    return np.pad(cells, ((0, -rows % row_multiple), (0, -cols % col_multiple)))
+
+
+# Turn a frame (list of lists or array of 0/1) into text lines
+def frame_to_lines(frame, mode="cells"):
+    cells = np.asarray(frame, dtype=np.uint8)
+    if mode == "cells":
+        # Same look as Grid.display
+        return [" ".join(' O ' if cell else ' . ' for cell in row) for row in cells.tolist()]
+    if mode == "halfblock":
+        # One character per 2x1 block of cells
+        cells = _pad(cells, 2, 1)
+        codes = cells[0::2] + 2 * cells[1::2]
+        return ["".join(HALF_BLOCKS[code] for code in row) for row in codes.tolist()]
+    if mode == "braille":
+        # One character per 4x2 block of cells
+        cells = _pad(cells, 4, 2).astype(np.uint16)
+        codes = np.full((cells.shape[0] // 4, cells.shape[1] // 2), 0x2800, dtype=np.uint16)
+        for dr, dc, bit in BRAILLE_DOTS:
+            codes += cells[dr::4, dc::2] * bit
+        return ["".join(map(chr, row)) for row in codes.tolist()]
+    raise ValueError(f"Unknown render mode '{mode}'. Use cells, halfblock or braille.")
+
+
+# ANSI output that turns the previous lines into the new ones, touching only changed runs
+def diff_lines(previous, lines, merge_gap=4):
+    output = []
+    for row, line in enumerate(lines):
+        old = previous[row] if row < len(previous) else ""
+        if line == old:
+            continue
+        width = max(len(line), len(old))
+        line = line.ljust(width)
+        old = old.ljust(width)
+        col = 0
+        while col < width:
+            if line[col] == old[col]:
+                col += 1
+                continue
+            # Extend the run over short unchanged gaps, one cursor move is dearer than a few chars
+            end = col + 1
+            gap = 0
+            while end < width and gap < merge_gap:
+                gap = 0 if line[end] != old[end] else gap + 1
+                end += 1
+            end -= gap
+            output.append(move_to(row, col) + line[col:end])
+            col = end
+    # Blank out lines left over from a taller previous frame
+    for row in range(len(lines), len(previous)):
+        output.append(move_to(row, 0) + "\x1b[2K")
+    return "".join(output)
+
+
+# Draws frames on its own thread. The simulation hands frames over through a bounded
+# queue and never waits: when the queue is full the oldest frame is dropped, and the
+# renderer only ever draws the newest frame, at most max_fps times a second.
+class TerminalRenderer:
+    def __init__(self, mode="cells", max_fps=30, queue_size=2, stream=None):
+        frame_to_lines([[0]], mode)  # Fail early on an unknown mode
+        self.mode = mode
+        self.max_fps = max_fps
+        self.stream = stream or sys.stdout
+        self.frames_rendered = 0
+        # Frames dropped by submit() and skipped by the drawing thread, each counter only
+        # ever written by its own thread
+        self._frames_replaced = 0
+        self._frames_skipped = 0
+        self._queue = Queue(maxsize=queue_size)
+        self._lines = []
+        self._thread = None
+
+    @property
+    def frames_dropped(self):
+        return self._frames_replaced + self._frames_skipped
+
+    def start(self):
+        self.stream.write(CLEAR + HIDE_CURSOR)
+        self.stream.flush()
+        self._thread = threading.Thread(target=self._run, name="terminal-renderer", daemon=True)
+        self._thread.start()
+        return self
+
+    def submit(self, frame, title=None):
+        item = (frame, title)
+        while True:
+            try:
+                self._queue.put_nowait(item)
+                return
+            except Full:
+                try:
+                    self._queue.get_nowait()
+                    self._frames_replaced += 1
+                except Empty:
+                    pass
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._thread = None
+        # Leave the cursor below the last frame
+        self.stream.write(move_to(len(self._lines), 0) + SHOW_CURSOR)
+        self.stream.flush()
+
+    def _run(self):
+        interval = 1.0 / self.max_fps if self.max_fps else 0
+        while True:
+            item = self._queue.get()
+            stopping = item is _STOP
+            # Skip to the newest frame waiting in the queue
+            while not stopping:
+                try:
+                    newer = self._queue.get_nowait()
+                except Empty:
+                    break
+                if newer is _STOP:
+                    stopping = True
+                else:
+                    item = newer
+                    self._frames_skipped += 1
+            if item is not _STOP:
+                started = time.perf_counter()
+                self.draw(*item)
+                elapsed = time.perf_counter() - started
+                if not stopping and interval > elapsed:
+                    time.sleep(interval - elapsed)
+            if stopping:
+                return
+
+    def draw(self, frame, title=None):
+        lines = frame_to_lines(frame, self.mode)
+        if title is not None:
+            lines = [title] + lines
+        self.stream.write(diff_lines(self._lines, lines))
+        self.stream.flush()
+        self._lines = lines
+        self.frames_rendered += 1
@@ -1,18 +1,104 @@
+from .boundary import DEAD
+from collections import Counter
+import numpy as np
+import re
+
+# 8 directions
+DIRECTIONS = (
+    (-1, -1), (-1, 0), (-1, 1),  # Top row
+    (0, -1),           (0, 1),    # Middle row (left, right)
+    (1, -1),  (1, 0),  (1, 1)     # Bottom row
+)
+
+BS_PATTERN = re.compile(r'^B([0-8]*)/S([0-8]*)$', re.IGNORECASE)
+SB_PATTERN = re.compile(r'^S([0-8]*)/B([0-8]*)$', re.IGNORECASE)
+CLASSIC_PATTERN = re.compile(r'^([0-8]*)/([0-8]*)$')   # survive/birth, e.g. 23/3
+
+NAMED_RULES = {
+    'life': 'B3/S23',
+    'conway': 'B3/S23',
+    'highlife': 'B36/S23',
+    'seeds': 'B2/S',
+    'daynight': 'B3678/S34678',
+    'lifewithoutdeath': 'B3/S012345678',
+    'maze': 'B3/S12345',
+    '2x2': 'B36/S125',
+}
+
+
+class RuleStringError(Exception):
+    pass
+
+
+# Outer-totalistic rule compiled once into lookup tables, one per kind of engine:
+#   table[state][neighbors]   - lists of lists (python engine, HashLife)
+#   lookup[state, neighbors]  - NumPy array (numpy, parallel and active engines)
+#   bit_terms                 - neighbour counts that turn a cell on (bit-packed engine)
+class Rule:
+    def __init__(self, rulestring="B3/S23"):
+        text = NAMED_RULES.get(re.sub(r'[\s&_-]', '', rulestring).lower(), rulestring).strip()
+        for pattern, birth_group, survive_group in ((BS_PATTERN, 1, 2), (SB_PATTERN, 2, 1), (CLASSIC_PATTERN, 2, 1)):
+            match = pattern.match(text)
+            if match:
+                break
+        else:
+            raise RuleStringError(f"Invalid rulestring: {rulestring}")
+
+        self.birth = frozenset(int(n) for n in match.group(birth_group))
+        self.survive = frozenset(int(n) for n in match.group(survive_group))
+        # B0 would turn the infinite empty background on, which sparse and unbounded engines cannot hold
+        if 0 in self.birth:
+            raise RuleStringError(f"B0 rules are not supported: {rulestring}")
+        self.rulestring = f"B{''.join(map(str, sorted(self.birth)))}/S{''.join(map(str, sorted(self.survive)))}"
+
+        self.table = (
+            tuple(1 if n in self.birth else 0 for n in range(9)),
+            tuple(1 if n in self.survive else 0 for n in range(9)),
+        )
+        self.lookup = np.array(self.table, dtype=np.uint8)
+        self.survive_alone = 0 in self.survive
+        # (count, needs_alive): None for counts that turn any cell on
+        self.bit_terms = tuple(
+            (n, None if n in self.birth and n in self.survive else n in self.survive)
+            for n in range(9) if n in self.birth or n in self.survive
+        )
+
+    def __eq__(self, other):
+        return isinstance(other, Rule) and self.rulestring == other.rulestring
+
+    def __hash__(self):
+        return hash(self.rulestring)
+
+    def __repr__(self):
+        return f"Rule('{self.rulestring}')"
+
+
+_compiled_rules = {}
+
+
+# Rule from a rulestring (or Rule), compiled only the first time it is seen
+def get_rule(rule="B3/S23"):
+    if isinstance(rule, Rule):
+        return rule
+    compiled = _compiled_rules.get(rule)
+    if compiled is None:
+        # Different spellings of one rule share the same tables
+        compiled = Rule(rule)
+        compiled = _compiled_rules[rule] = _compiled_rules.setdefault(compiled.rulestring, compiled)
+    return compiled
+
+
+CONWAY = get_rule("B3/S23")
+
+
 class Rules:
     @staticmethod
     def count_neighbors(grid, row, col):
         rows = len(grid)
         cols = len(grid[0])
         
-        # 8 directions
-        directions = [
-            (-1, -1), (-1, 0), (-1, 1),  # Top row
-            (0, -1),           (0, 1),    # Middle row (left, right)
-            (1, -1),  (1, 0),  (1, 1)     # Bottom row
-        ]
-        
         count = 0
-        for dr, dc in directions:
+        for dr, dc in DIRECTIONS:
             new_row, new_col = row + dr, col + dc
             # Check bounds and if cell is alive
             if 0 <= new_row < rows and 0 <= new_col < cols:
@@ -21,28 +107,141 @@ class Rules:
         return count
     
     @staticmethod
-    def will_live(is_alive: bool, live_neighbors: int) -> bool:
-        if is_alive:
-            return live_neighbors in (2, 3)  # Survival: 2-3 neighbors
-        else:
-            return live_neighbors == 3        # Birth: exactly 3 neighbors
-        
+    def will_live(is_alive: bool, live_neighbors: int, rule: Rule = CONWAY) -> bool:
+        # Conway: survival on 2-3 neighbors, birth on exactly 3
+        return rule.table[1 if is_alive else 0][live_neighbors] == 1
+    
     @staticmethod
-    def next_state(current_state: int, live_neighbors: int) -> int:
-        is_alive = current_state == 1
-        return 1 if Rules.will_live(is_alive, live_neighbors) else 0
+    def next_state(current_state: int, live_neighbors: int, rule: Rule = CONWAY) -> int:
+        return rule.table[current_state][live_neighbors]
     
     @staticmethod
-    def evolve_grid(grid):
+    def evolve_grid(grid, rule=CONWAY, boundary=DEAD):
+        return Rules.evolve_grid_counted(grid, rule, boundary)[0]
+    
+    @staticmethod
+    def evolve_grid_counted(grid, rule=CONWAY, boundary=DEAD):
+        # Returns (new_grid, births, deaths); the counts come out of the same pass
         rows = len(grid)
         cols = len(grid[0])
+        table = rule.table
+        # Ghost border from the boundary, so no neighbour needs a bounds check
+        padded = boundary.pad_list(grid)
         
         # Create new grid
         new_grid = [[0 for _ in range(cols)] for _ in range(rows)]
+        births = deaths = 0
         
         for row in range(rows):
+            above, here, below = padded[row], padded[row + 1], padded[row + 2]
+            states, new_row = grid[row], new_grid[row]
             for col in range(cols):
-                neighbors = Rules.count_neighbors(grid, row, col)
-                new_grid[row][col] = Rules.next_state(grid[row][col], neighbors)
+                neighbors = (above[col] + above[col + 1] + above[col + 2] +
+                             here[col] + here[col + 2] +
+                             below[col] + below[col + 1] + below[col + 2])
+                state = states[col]
+                new_state = new_row[col] = table[state][neighbors]
+                if new_state != state:
+                    if new_state:
+                        births += 1
+                    else:
+                        deaths += 1
+        
+        return new_grid, births, deaths
+    
+    @staticmethod
+    def evolve_live_cells(live_cells, rows=None, cols=None, rule=CONWAY, boundary=DEAD):
+        # Only live cells and their neighbours are visited: every live cell adds
+        # one to each of its 8 neighbours, cells that were never touched stay dead
+        if boundary.wraps:
+            # Neighbours are looked up through wrapped index tables, so they never leave the grid
+            row_map, col_maps, flips = boundary.neighbor_tables(rows, cols)
+            neighbor_counts = Counter(
+                (row_map[row + dr + 1], col_maps[flips[row + dr + 1]][col + dc + 1])
+                for row, col in live_cells for dr, dc in DIRECTIONS
+            )
+            rows = cols = None
+        else:
+            neighbor_counts = Counter(
+                (row + dr, col + dc) for row, col in live_cells for dr, dc in DIRECTIONS
+            )
+        born, survives = rule.table
         
-        return new_grid
\ No newline at end of file
+        new_live_cells = set()
+        for (row, col), neighbors in neighbor_counts.items():
+            if (survives if (row, col) in live_cells else born)[neighbors]:
+                # Bounded universes keep the dead boundary of evolve_grid
+                if rows is not None and not 0 <= row < rows:
+                    continue
+                if cols is not None and not 0 <= col < cols:
+                    continue
+                new_live_cells.add((row, col))
+        
+        # Live cells without neighbours never show up in the counts
+        if rule.survive_alone:
+            new_live_cells.update(cell for cell in live_cells if cell not in neighbor_counts)
+        
+        return new_live_cells
+    
+    @staticmethod
+    def evolve_bit_rows(bit_rows, cols, rule=CONWAY, boundary=DEAD):
+        # Each row is an int with bit c set when column c is alive. Neighbour counts
+        # are added with full adders on whole rows, one bit plane per count bit.
+        mask = (1 << cols) - 1
+        
+        # Ghost rows above and below; wrapped boundaries also rotate instead of shift
+        top, bottom = boundary.ghost_bit_rows(bit_rows, cols)
+        padded = [top] + list(bit_rows) + [bottom]
+        if boundary.wraps:
+            shifted = [(((bits << 1) | (bits >> (cols - 1))) & mask, (bits >> 1) | ((bits & 1) << (cols - 1)))
+                       for bits in padded]
+        else:
+            shifted = [(bits << 1, bits >> 1) for bits in padded]
+        
+        # Per row: left + centre + right as (ones, twos) bit planes
+        triples = []
+        for bits, (left, right) in zip(padded, shifted):
+            triples.append((left ^ bits ^ right, (left & bits) | (right & (left ^ bits))))
+        
+        new_rows = []
+        for row, bits in enumerate(bit_rows):
+            up_ones, up_twos = triples[row]
+            down_ones, down_twos = triples[row + 2]
+            left, right = shifted[row + 1]
+            mid_ones, mid_twos = left ^ right, left & right
+            
+            # Ones column of the count, carry goes into the twos
+            ones = up_ones ^ mid_ones ^ down_ones
+            carry = (up_ones & mid_ones) | (down_ones & (up_ones ^ mid_ones))
+            # Twos column: four inputs, carries go into the fours and eights
+            twos_sum = up_twos ^ mid_twos ^ down_twos
+            twos_carry = (up_twos & mid_twos) | (down_twos & (up_twos ^ mid_twos))
+            twos = twos_sum ^ carry
+            fours = twos_carry ^ (twos_sum & carry)
+            eights = twos_carry & twos_sum & carry
+            
+            # OR together the counts the rule turns on, for dead, live or any cells
+            new_bits = 0
+            for count, needs_alive in rule.bit_terms:
+                term = ((ones if count & 1 else ~ones) & (twos if count & 2 else ~twos) &
+                        (fours if count & 4 else ~fours) & (eights if count & 8 else ~eights))
+                if needs_alive is True:
+                    term &= bits
+                elif needs_alive is False:
+                    term &= ~bits
+                new_bits |= term
+            new_rows.append(new_bits & mask)
+        
+        return new_rows
+    
+    @staticmethod
+    def evolve_padded(padded, rule=CONWAY):
+        # padded is a uint8 array with a one cell border around the cells to evolve,
+        # neighbour counts are whole-array shifted adds
+        neighbors = (
+            padded[:-2, :-2] + padded[:-2, 1:-1] + padded[:-2, 2:] +
+            padded[1:-1, :-2] +                    padded[1:-1, 2:] +
+            padded[2:, :-2] + padded[2:, 1:-1] + padded[2:, 2:]
+        )
+        # One table lookup per cell: lookup[state, neighbors]
+        return rule.lookup[padded[1:-1, 1:-1], neighbors]
@@ -0,0 +1,142 @@
+from .grid import Grid
+from .engines import ENGINES
+from .boundary import BOUNDARY_NAMES
+from .hashlife import HashLife
+from .render import TerminalRenderer
+from .patterns import load_cached_pattern
+from .logging_setup import configure_logging
+import argparse
+import json
+import logging
+import sys
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+# Grid engines plus HashLife, which jumps all generations at once
+RUNNER_ENGINES = list(ENGINES) + ["hashlife"]
+
+
+def peak_rss_kb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+# Run a simulation without rendering or sleeping and report its throughput
+def run_headless(pattern_file, rows=20, cols=20, offset_row=None, offset_col=None,
+                 generations=100, engine="python", rule="B3/S23", boundary="dead", trace_memory=False,
+                 render=None, max_fps=30, **engine_options):
+    pattern = load_cached_pattern(pattern_file).to_list()
+    # Default to the pattern centered on the grid
+    if offset_row is None:
+        offset_row = max(0, (rows - len(pattern)) // 2)
+    if offset_col is None:
+        offset_col = max(0, (cols - len(pattern[0])) // 2)
+
+    if trace_memory:
+        tracemalloc.start()
+
+    grid = Grid(rows, cols, engine="python" if engine == "hashlife" else engine, rule=rule, boundary=boundary,
+                **engine_options)
+    grid.load_pattern(pattern, offset_row=offset_row, offset_col=offset_col)
+
+    # Optional live view; frames that arrive faster than max_fps are dropped
+    renderer = TerminalRenderer(mode=render, max_fps=max_fps).start() if render and engine != "hashlife" else None
+
+    try:
+        start_time = time.perf_counter()
+        if engine == "hashlife":
+            universe = HashLife.from_grid(grid).advance(generations)
+            population = universe.population
+        else:
+            for generation in range(generations):
+                grid.evolve()
+                if renderer:
+                    renderer.submit(grid.to_list(), title=f"Generation {generation + 1}")
+            population = len(grid.live_cells())
+        elapsed = time.perf_counter() - start_time
+    finally:
+        if renderer:
+            renderer.stop()
+        close = getattr(grid.engine, "close", None)
+        if close:
+            close()
+
+    report = {
+        'pattern': pattern_file,
+        'engine': engine,
+        'rule': grid.rule.rulestring,
+        'boundary': grid.boundary.name,
+        'rows': rows,
+        'cols': cols,
+        'offset_row': offset_row,
+        'offset_col': offset_col,
+        'generations': generations,
+        'elapsed_s': elapsed,
+        'generations_per_sec': generations / elapsed if elapsed else None,
+        'cell_updates_per_sec': generations * rows * cols / elapsed if elapsed else None,
+        'final_population': population,
+        'peak_rss_kb': peak_rss_kb(),
+    }
+    if renderer:
+        report['frames_rendered'] = renderer.frames_rendered
+        report['frames_dropped'] = renderer.frames_dropped
+    if trace_memory:
+        report['peak_traced_kb'] = tracemalloc.get_traced_memory()[1] // 1024
+        tracemalloc.stop()
+
+    logging.info(f"Headless run: {engine} {rows}x{cols}, {generations} generations in {elapsed:.4f} seconds")
+    return report
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Run a Game of Life simulation headless and report throughput as JSON.")
+    parser.add_argument("pattern", help="Pattern file (plaintext, RLE or Life 1.06)")
+    parser.add_argument("--rows", type=int, default=20)
+    parser.add_argument("--cols", type=int, default=20)
+    parser.add_argument("--offset-row", type=int, default=None, help="Default: pattern centered")
+    parser.add_argument("--offset-col", type=int, default=None, help="Default: pattern centered")
+    parser.add_argument("--generations", type=int, default=100)
+    parser.add_argument("--engine", choices=RUNNER_ENGINES, default="python")
+    parser.add_argument("--rule", default="B3/S23", help="B/S rulestring or rule name, e.g. B36/S23 or highlife")
+    parser.add_argument("--boundary", choices=BOUNDARY_NAMES, default="dead",
+                        help="What lies past the edge: dead cells, a torus or a Klein bottle")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes for the parallel engine")
+    parser.add_argument("--trace-memory", action="store_true", help="Also report peak traced Python allocations (slower)")
+    parser.add_argument("--render", choices=["cells", "halfblock", "braille"], default=None,
+                        help="Show the board while running, drawn on a separate thread")
+    parser.add_argument("--fps", type=int, default=30, help="Frame rate cap for --render")
+    parser.add_argument("--output", default=None, help="Write the JSON report to this file instead of stdout")
+    parser.add_argument("--log-file", default=None, help="Log to this file (rotated at 5 MB)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.log_file:
+        configure_logging(args.log_file)
+    engine_options = {'workers': args.workers} if args.engine == "parallel" else {}
+    report = run_headless(args.pattern, rows=args.rows, cols=args.cols,
+                          offset_row=args.offset_row, offset_col=args.offset_col,
+                          generations=args.generations, engine=args.engine, rule=args.rule,
+                          boundary=args.boundary,
+                          trace_memory=args.trace_memory, render=args.render, max_fps=args.fps,
+                          **engine_options)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+from .grid import GridSizeError, PatternSizeError
+from .rules import Rules, get_rule
+from .boundary import BoundaryError, get_boundary
+from .utils import timed
+import logging
+
+
+# Live-cell universe: memory and time per generation grow with the number of
+# live cells, not with the area. Leaving rows/cols as None makes that axis unbounded.
+class SparseGrid:
+    def __init__(self, rows=None, cols=None, rule="B3/S23", boundary="dead"):
+        if (rows is not None and rows <= 0) or (cols is not None and cols <= 0):
+            logging.error("Invalid grid size - must be positive integers")
+            raise GridSizeError("Grid size must be positive integers.")
+        self.rows = rows
+        self.cols = cols
+        self.rule = get_rule(rule)
+        self.boundary = get_boundary(boundary)
+        if self.boundary.wraps and (rows is None or cols is None):
+            raise BoundaryError(f"A {self.boundary.name} boundary needs both rows and cols.")
+        self.live_cells = set()
+
+    @property
+    def bounded(self):
+        return self.rows is not None and self.cols is not None
+
+    def in_bounds(self, row, col):
+        return ((self.rows is None or 0 <= row < self.rows) and
+                (self.cols is None or 0 <= col < self.cols))
+
+    @timed
+    def load_pattern(self, pattern, offset_row=0, offset_col=0):
+        if not pattern or not pattern[0]:
+            raise PatternSizeError("Pattern cannot be empty.")
+
+        pattern_rows = len(pattern)
+        pattern_cols = len(pattern[0])
+
+        # Same fit check as Grid, but only along the bounded axes
+        if (not self.in_bounds(offset_row, offset_col) or
+                not self.in_bounds(offset_row + pattern_rows - 1, offset_col + pattern_cols - 1)):
+            logging.error(f"Pattern size: {pattern_rows}x{pattern_cols}, Grid: {self.rows}x{self.cols}, Offset: ({offset_row},{offset_col})")
+            raise PatternSizeError(f"Pattern ({pattern_rows}x{pattern_cols}) does not fit in grid ({self.rows}x{self.cols}) at offset ({offset_row},{offset_col}).")
+
+        for r in range(pattern_rows):
+            for c in range(pattern_cols):
+                self.set_cell(offset_row + r, offset_col + c, pattern[r][c])
+
+    def get_cell(self, row, col):
+        return 1 if (row, col) in self.live_cells else 0
+
+    def set_cell(self, row, col, value):
+        if value:
+            self.live_cells.add((row, col))
+        else:
+            self.live_cells.discard((row, col))
+
+    def evolve(self):
+        self.live_cells = Rules.evolve_live_cells(self.live_cells, self.rows, self.cols, self.rule, self.boundary)
+
+    def is_grid_alive(self):
+        return bool(self.live_cells)
+
+    def population(self):
+        return len(self.live_cells)
+
+    # (min_row, min_col, max_row, max_col) of the live cells, None when empty
+    def bounding_box(self):
+        if not self.live_cells:
+            return None
+        rows = [row for row, _ in self.live_cells]
+        cols = [col for _, col in self.live_cells]
+        return min(rows), min(cols), max(rows), max(cols)
+
+    # Dense copy of the grid, or of the live bounding box when unbounded
+    def to_list(self):
+        if self.bounded:
+            top, left, height, width = 0, 0, self.rows, self.cols
+        else:
+            box = self.bounding_box()
+            if box is None:
+                return []
+            top, left = box[0], box[1]
+            height, width = box[2] - top + 1, box[3] - left + 1
+
+        cells = [[0 for _ in range(width)] for _ in range(height)]
+        for row, col in self.live_cells:
+            cells[row - top][col - left] = 1
+        return cells
+
+    def display(self):
+        for row in self.to_list():
+            print(" ".join([' O ' if cell else ' . ' for cell in row]))
+        print()
+
+    def clear(self):
+        self.live_cells = set()
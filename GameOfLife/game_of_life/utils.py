@@ -1,20 +1,7 @@
-import time
 import logging
-from functools import wraps
 import re
 import os
-
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', filename='GameOfLife/logs/simulation.log', filemode='a')
-
-def timed(func):
-    @wraps(func)
-    def wrapper(*args, **kwargs):
-        start_time = time.time()
-        result = func(*args, **kwargs)
-        end_time = time.time()
-        logging.info(f"Function {func.__name__} took {end_time - start_time:.4f} seconds")
-        return result
-    return wrapper
+from .metrics import timed   # Re-exported: modules decorate with utils.timed
 
 class PatternLoadError(Exception):
     pass
@@ -55,5 +42,12 @@ def load_pattern_from_txt(filepath):
         logging.error("Error loading pattern: %s", e)
         raise PatternLoadError(f"Error loading pattern: {e}")
     
+# Bit-packed rows: bit c of the int is column c
+def pack_row(row):
+    return int("".join("1" if cell else "0" for cell in reversed(row)) or "0", 2)
+
+def unpack_row(bits, cols):
+    return [int(cell) for cell in reversed(format(bits, f"0{cols}b"))]
+    
 def clear_screen():
     os.system('cls' if os.name == 'nt' else 'clear')    
\ No newline at end of file
@@ -14,4 +14,10 @@ setup(
     packages=find_packages(),
     install_requires=read_requirements(),
     python_requires=">=3.7",
+    entry_points={
+        'console_scripts': [
+            'game-of-life-run=game_of_life.runner:main',
+            'game-of-life-ensemble=game_of_life.ensemble:main',
+        ],
+    },
 )
\ No newline at end of file
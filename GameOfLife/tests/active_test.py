@@ -0,0 +1,79 @@
+import os
+import random
+import pytest
+from game_of_life.grid import Grid
+from game_of_life.utils import load_pattern_from_txt
+
+PATTERNS_DIR = os.path.join(os.path.dirname(__file__), "..", "patterns")
+
+def test_active_matches_python():
+    rng = random.Random(8)
+    cells = [[1 if rng.random() < 0.3 else 0 for _ in range(45)] for _ in range(37)]
+    python_grid = Grid(37, 45)
+    active_grid = Grid(37, 45, engine="active", block_size=8)
+    python_grid.load_pattern(cells)
+    active_grid.load_pattern(cells)
+    
+    for _ in range(60):
+        python_grid.evolve()
+        active_grid.evolve()
+        assert active_grid.to_list() == python_grid.to_list()
+
+def test_stable_regions_are_skipped():
+    blinker = load_pattern_from_txt(os.path.join(PATTERNS_DIR, "blinker.txt"))
+    grid = Grid(64, 64, engine="active", block_size=8)
+    grid.load_pattern(blinker, offset_row=10, offset_col=10)
+    
+    grid.evolve()
+    grid.evolve()
+    stats = grid.engine.last_stats
+    
+    # The blinker touches a single block, only it and its neighbours are evaluated
+    assert stats['blocks_evaluated'] == 9
+    assert stats['blocks_skipped'] == 64 - 9
+    assert stats['cells_evaluated'] == 9 * 8 * 8
+    assert grid.engine.totals['generations'] == 2
+
+def test_load_pattern_after_evolve_is_picked_up():
+    grid = Grid(32, 32, engine="active", block_size=8)
+    grid.evolve()
+    assert grid.engine.last_stats['blocks_evaluated'] == 16
+    grid.evolve()
+    assert grid.engine.last_stats['blocks_evaluated'] == 0
+    
+    grid.load_pattern([[1, 1, 1]], offset_row=20, offset_col=20)
+    grid.evolve()
+    assert grid.get_cell(19, 21) == 1 and grid.get_cell(21, 21) == 1
+
+@pytest.mark.parametrize("boundary", ["torus", "klein"])
+def test_wrapped_edges_with_cells_set_between_generations(boundary):
+    rng = random.Random(9)
+    cells = [[1 if rng.random() < 0.3 else 0 for _ in range(30)] for _ in range(26)]
+    numpy_grid = Grid(26, 30, engine="numpy", boundary=boundary)
+    active_grid = Grid(26, 30, engine="active", boundary=boundary, block_size=8)
+    numpy_grid.load_pattern(cells)
+    active_grid.load_pattern(cells)
+    
+    for generation in range(60):
+        if generation % 7 == 3:
+            # A glider's worth of cells on an edge, where the ghost border copies them
+            for row, col in [(0, 5), (25, 6), (12, 0), (13, 29)]:
+                numpy_grid.set_cell(row, col, 1)
+                active_grid.set_cell(row, col, 1)
+        numpy_grid.evolve()
+        active_grid.evolve()
+        assert active_grid.to_list() == numpy_grid.to_list()
+
+def test_boards_swap_instead_of_copying():
+    grid = Grid(32, 32, engine="active", block_size=8)
+    grid.load_pattern([[1, 1, 1]], offset_row=4, offset_col=4)
+    first = grid.grid
+    grid.evolve()
+    second = grid.grid
+    grid.evolve()
+    
+    assert grid.grid is first and second is not first
+    assert grid.get_cell(4, 5) == 1 and grid.get_cell(3, 5) == 0
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,59 @@
+import random
+import pytest
+from game_of_life.grid import Grid, PatternSizeError
+from game_of_life.bitgrid import BitGrid
+
+def random_cells(rows, cols, seed):
+    rng = random.Random(seed)
+    return [[1 if rng.random() < 0.35 else 0 for _ in range(cols)] for _ in range(rows)]
+
+def test_list_round_trip():
+    cells = random_cells(7, 70, seed=1)
+    bit_grid = BitGrid.from_list(cells)
+    assert bit_grid.to_list() == cells
+    assert bit_grid.population() == sum(map(sum, cells))
+
+def test_evolve_matches_python():
+    # Wider than 64 columns so rows span several machine words
+    cells = random_cells(19, 131, seed=2)
+    grid = Grid(19, 131)
+    grid.load_pattern(cells)
+    bit_grid = BitGrid.from_grid(grid)
+    
+    for _ in range(30):
+        grid.evolve()
+        bit_grid.evolve()
+        assert bit_grid.to_list() == grid.to_list()
+
+def test_bitpacked_engine_matches_python():
+    cells = random_cells(11, 13, seed=3)
+    python_grid = Grid(11, 13)
+    packed_grid = Grid(11, 13, engine="bitpacked")
+    python_grid.load_pattern(cells)
+    packed_grid.load_pattern(cells)
+    
+    for _ in range(20):
+        python_grid.evolve()
+        packed_grid.evolve()
+        assert packed_grid.to_list() == python_grid.to_list()
+
+def test_load_pattern_and_to_grid():
+    pattern = [[1, 0, 0],
+               [0, 1, 1],
+               [1, 1, 0]]
+    bit_grid = BitGrid(5, 5)
+    bit_grid.load_pattern(pattern, offset_row=1, offset_col=1)
+    grid = Grid(5, 5)
+    grid.load_pattern(pattern, offset_row=1, offset_col=1)
+    
+    assert bit_grid.to_grid().grid == grid.grid
+    with pytest.raises(PatternSizeError):
+        bit_grid.load_pattern(pattern, offset_row=3, offset_col=3)
+
+def test_memory_footprint():
+    footprint = BitGrid(1000, 1000).memory_footprint()
+    assert footprint['cells'] == 10 ** 6
+    assert footprint['packed_bytes'] < footprint['list_bytes'] / 20
+
+if __name__ == "__main__":
+    pytest.main()
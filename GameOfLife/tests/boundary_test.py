@@ -0,0 +1,120 @@
+import random
+import pytest
+from game_of_life.grid import Grid
+from game_of_life.boundary import Boundary, BoundaryError, get_boundary, BOUNDARY_NAMES
+from game_of_life.rules import DIRECTIONS, get_rule
+from game_of_life.sparse import SparseGrid
+from game_of_life.bitgrid import BitGrid
+from game_of_life.hashlife import HashLife
+
+ENGINES = ["python", "numpy", "sparse", "bitpacked", "active", "parallel"]
+
+def random_grid(rows, cols, seed):
+    rng = random.Random(seed)
+    return [[1 if rng.random() < 0.35 else 0 for _ in range(cols)] for _ in range(rows)]
+
+# Slow reference: every neighbour looked up one at a time through Boundary.locate
+def reference_step(cells, boundary, rule="B3/S23"):
+    rows, cols = len(cells), len(cells[0])
+    table = get_rule(rule).table
+    new_cells = [[0] * cols for _ in range(rows)]
+    for row in range(rows):
+        for col in range(cols):
+            neighbors = 0
+            for dr, dc in DIRECTIONS:
+                cell = boundary.locate(row + dr, col + dc, rows, cols)
+                if cell is not None:
+                    neighbors += cells[cell[0]][cell[1]]
+            new_cells[row][col] = table[cells[row][col]][neighbors]
+    return new_cells
+
+def test_unknown_boundary():
+    with pytest.raises(BoundaryError):
+        Grid(5, 5, boundary="sphere")
+
+def test_locate():
+    dead, torus, klein = (get_boundary(name) for name in BOUNDARY_NAMES)
+    assert dead.locate(-1, 0, 4, 5) is None
+    assert torus.locate(-1, -1, 4, 5) == (3, 4)
+    assert torus.locate(4, 5, 4, 5) == (0, 0)
+    # Crossing the top or bottom edge of a Klein bottle mirrors the column
+    assert klein.locate(-1, 1, 4, 5) == (3, 3)
+    assert klein.locate(4, 0, 4, 5) == (0, 4)
+    assert klein.locate(2, -1, 4, 5) == (2, 4)
+    assert klein.locate(8, 1, 4, 5) == (0, 1)
+
+def test_get_cell_wraps():
+    grid = Grid(4, 5, boundary="klein")
+    grid.set_cell(3, 3, 1)
+    assert grid.get_cell(-1, 1) == 1
+    assert Grid(4, 5).get_cell(-1, 1) == 0
+
+@pytest.mark.parametrize("boundary", BOUNDARY_NAMES)
+def test_python_engine_matches_reference(boundary):
+    cells = random_grid(9, 11, seed=13)
+    grid = Grid(9, 11, boundary=boundary)
+    grid.load_pattern(cells)
+    for _ in range(10):
+        cells = reference_step(cells, get_boundary(boundary))
+        grid.evolve()
+        assert grid.to_list() == cells
+
+@pytest.mark.parametrize("boundary", BOUNDARY_NAMES)
+@pytest.mark.parametrize("engine", ENGINES[1:])
+def test_engines_match_python(boundary, engine):
+    # Odd sizes and blocks that don't divide them exercise the wrapped edges and corners
+    cells = random_grid(13, 21, seed=4420)
+    options = {'workers': 3} if engine == "parallel" else {'block_size': 4} if engine == "active" else {}
+    expected = Grid(13, 21, boundary=boundary)
+    grid = Grid(13, 21, engine=engine, boundary=boundary, **options)
+    expected.load_pattern(cells)
+    grid.load_pattern(cells)
+    try:
+        for _ in range(25):
+            expected.evolve()
+            grid.evolve()
+            assert grid.to_list() == expected.to_list()
+    finally:
+        if engine == "parallel":
+            grid.engine.close()
+
+@pytest.mark.parametrize("boundary", BOUNDARY_NAMES)
+def test_grid_classes_match_python(boundary):
+    cells = random_grid(10, 12, seed=5)
+    expected = Grid(10, 12, rule="highlife", boundary=boundary)
+    expected.load_pattern(cells)
+    sparse = SparseGrid(10, 12, rule="highlife", boundary=boundary)
+    sparse.load_pattern(cells)
+    bit_grid = BitGrid.from_grid(expected)
+    for _ in range(15):
+        expected.evolve()
+        sparse.evolve()
+        bit_grid.evolve()
+        assert sparse.to_list() == expected.to_list()
+        assert bit_grid.to_list() == expected.to_list()
+
+def test_glider_circles_the_torus():
+    glider = [[0, 1, 0],
+              [0, 0, 1],
+              [1, 1, 1]]
+    grid = Grid(8, 8, engine="numpy", boundary="torus")
+    grid.load_pattern(glider, offset_row=5, offset_col=5)
+    start = grid.to_list()
+    # A glider moves one cell diagonally every 4 generations
+    for _ in range(4 * 8):
+        grid.evolve()
+        assert len(grid.live_cells()) == 5
+    assert grid.to_list() == start
+
+def test_wrapped_boundaries_need_bounds():
+    with pytest.raises(BoundaryError):
+        SparseGrid(boundary="torus")
+    with pytest.raises(BoundaryError):
+        HashLife.from_grid(Grid(5, 5, boundary="torus"))
+
+def test_boundary_equality():
+    assert Boundary("torus") == get_boundary("torus")
+    assert get_boundary(get_boundary("klein")) is get_boundary("klein")
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,51 @@
+import os
+import pytest
+from game_of_life.grid import Grid
+from game_of_life.cycles import CycleDetector
+from game_of_life.utils import load_pattern_from_txt
+
+PATTERNS_DIR = os.path.join(os.path.dirname(__file__), "..", "patterns")
+
+def run_until_cycle(grid, detector, max_generations):
+    detector.reset(grid.live_cells())
+    for _ in range(max_generations):
+        cycle = detector.update(grid.step(changes=True).changed)
+        if cycle:
+            return cycle
+    return None
+
+@pytest.mark.parametrize("engine", ["python", "numpy", "sparse", "bitpacked"])
+def test_blinker_period_two(engine):
+    grid = Grid(5, 5, engine=engine)
+    grid.load_pattern(load_pattern_from_txt(os.path.join(PATTERNS_DIR, "blinker.txt")), 1, 1)
+    
+    cycle = run_until_cycle(grid, CycleDetector(window=10), 10)
+    
+    assert cycle == {'start': 0, 'period': 2}
+
+def test_still_life_after_transient():
+    # Three cells in an L become a block after one generation
+    grid = Grid(6, 6)
+    grid.load_pattern([[1, 1], [1, 0]], 2, 2)
+    
+    cycle = run_until_cycle(grid, CycleDetector(), 10)
+    
+    assert cycle == {'start': 1, 'period': 1}
+
+def test_glider_never_repeats():
+    grid = Grid(40, 40, engine="sparse")
+    grid.load_pattern(load_pattern_from_txt(os.path.join(PATTERNS_DIR, "glider.txt")))
+    assert run_until_cycle(grid, CycleDetector(), 60) is None
+
+def test_window_bounds_history():
+    grid = Grid(5, 5)
+    grid.load_pattern(load_pattern_from_txt(os.path.join(PATTERNS_DIR, "blinker.txt")), 1, 1)
+    detector = CycleDetector(window=1)
+    
+    # Period 2 is longer than the window, so it can never be seen
+    assert run_until_cycle(grid, detector, 10) is None
+    assert len(detector.history) == 1
+    assert len(detector.seen) == 1
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,44 @@
+import random
+import pytest
+from game_of_life.grid import Grid
+from game_of_life.engines import EngineError
+
+def random_grid(rows, cols, seed):
+    rng = random.Random(seed)
+    return [[1 if rng.random() < 0.35 else 0 for _ in range(cols)] for _ in range(rows)]
+
+def test_unknown_engine():
+    with pytest.raises(EngineError):
+        Grid(5, 5, engine="gpu")
+
+def test_numpy_matches_python_blinker():
+    pattern = [[0, 1, 0],
+               [0, 1, 0],
+               [0, 1, 0]]
+    python_grid = Grid(5, 5, engine="python")
+    numpy_grid = Grid(5, 5, engine="numpy")
+    python_grid.load_pattern(pattern, offset_row=1, offset_col=1)
+    numpy_grid.load_pattern(pattern, offset_row=1, offset_col=1)
+    
+    python_grid.evolve()
+    numpy_grid.evolve()
+    
+    assert numpy_grid.to_list() == python_grid.to_list()
+    assert numpy_grid.to_list()[2] == [0, 1, 1, 1, 0]
+
+def test_numpy_matches_python_random_soup():
+    # Cells on the edges exercise the dead boundary
+    cells = random_grid(17, 23, seed=4420)
+    python_grid = Grid(17, 23, engine="python")
+    numpy_grid = Grid(17, 23, engine="numpy")
+    python_grid.load_pattern(cells)
+    numpy_grid.load_pattern(cells)
+    
+    for _ in range(30):
+        python_grid.evolve()
+        numpy_grid.evolve()
+        assert numpy_grid.to_list() == python_grid.to_list()
+        assert numpy_grid.is_grid_alive() == python_grid.is_grid_alive()
+
+if __name__ == "__main__":
+    pytest.main()
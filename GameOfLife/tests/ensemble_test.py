@@ -0,0 +1,60 @@
+import csv
+import json
+import pytest
+from game_of_life.engines import EngineError
+from game_of_life.ensemble import run_soup, iter_ensemble, run_ensemble, run_seed, random_soup, main
+
+OPTIONS = dict(rows=16, cols=16, max_generations=300)
+
+def test_seeds_are_deterministic():
+    assert run_seed(1, 5) == run_seed(1, 5)
+    assert run_seed(1, 5) != run_seed(1, 6) != run_seed(2, 5)
+    assert (random_soup(8, 8, seed=42) == random_soup(8, 8, seed=42)).all()
+
+def test_results_do_not_depend_on_workers():
+    serial = sorted(iter_ensemble(12, workers=1, **OPTIONS), key=lambda result: result['run'])
+    pooled = sorted(iter_ensemble(12, workers=2, chunksize=2, **OPTIONS), key=lambda result: result['run'])
+    assert serial == pooled
+    assert [result['run'] for result in serial] == list(range(12))
+
+@pytest.mark.parametrize("engine", ["python", "sparse", "bitpacked"])
+def test_engines_agree(engine):
+    assert run_soup(3, engine=engine, **OPTIONS) == run_soup(3, engine="numpy", **OPTIONS)
+
+def test_stabilized_run():
+    result = run_soup(0, **OPTIONS)
+    assert result['stabilized']
+    assert result['period'] >= 1
+    assert 0 <= result['generations'] < 300
+
+def test_unstabilized_run():
+    result = run_soup(0, rows=32, cols=32, max_generations=1)
+    assert not result['stabilized']
+    assert result['generations'] is None and result['period'] is None
+
+def test_streams_csv_and_jsonl(tmp_path):
+    csv_path = str(tmp_path / "runs.csv")
+    jsonl_path = str(tmp_path / "runs.jsonl")
+    summary = run_ensemble(6, output=csv_path, workers=1, **OPTIONS)
+    run_ensemble(6, output=jsonl_path, workers=2, **OPTIONS)
+
+    with open(csv_path) as f:
+        rows = list(csv.DictReader(f))
+    with open(jsonl_path) as f:
+        records = sorted((json.loads(line) for line in f), key=lambda record: record['run'])
+    assert summary['runs'] == len(rows) == len(records) == 6
+    assert [int(row['final_population']) for row in rows] == [record['final_population'] for record in records]
+
+def test_cli(tmp_path, capsys):
+    main(["4", "--rows", "12", "--cols", "12", "--workers", "1", "--output", str(tmp_path / "runs.jsonl")])
+    summary = json.loads(capsys.readouterr().out)
+    assert summary['runs'] == 4
+
+def test_parallel_engine_is_refused_in_workers():
+    with pytest.raises(EngineError):
+        list(iter_ensemble(4, workers=2, engine="parallel", **OPTIONS))
+    with pytest.raises(SystemExit):
+        main(["4", "--engine", "parallel"])
+
+if __name__ == "__main__":
+    pytest.main()
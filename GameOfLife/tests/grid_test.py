@@ -1,3 +1,4 @@
+import random
 import pytest
 from game_of_life.grid import Grid
 
@@ -46,6 +47,73 @@ def test_clear_grid():
     
     grid.clear()
     assert all(cell == 0 for row in grid.grid for cell in row)
+
+def test_run_yields_generation_records():
+    grid = Grid(6, 6)
+    grid.load_pattern([[1, 1, 1]], offset_row=2, offset_col=1)
+    
+    records = list(grid.run(4))
+    assert [record.generation for record in records] == [1, 2, 3, 4]
+    assert all(record.population == 3 for record in records)
+    assert all(record.births == 2 and record.deaths == 2 for record in records)
+    assert records[0].bounding_box == (1, 2, 3, 2)
+    assert records[1].bounding_box == (2, 1, 2, 3)
+
+def test_run_stops_early():
+    grid = Grid(5, 5)
+    grid.set_cell(2, 2, 1)
+    for record in grid.run():
+        if record.population == 0:
+            break
+    assert record.generation == 1
+    assert record.deaths == 1
+    assert record.bounding_box is None
+    assert not grid.is_grid_alive()
+
+@pytest.mark.parametrize("engine", ["numpy", "sparse", "bitpacked", "active", "parallel"])
+def test_run_stats_match_python(engine):
+    rng = random.Random(15)
+    cells = [[1 if rng.random() < 0.4 else 0 for _ in range(18)] for _ in range(14)]
+    expected = Grid(14, 18, boundary="torus")
+    grid = Grid(14, 18, engine=engine, boundary="torus")
+    expected.load_pattern(cells)
+    grid.load_pattern(cells)
+    try:
+        for expected_record, record in zip(expected.run(20), grid.run(20)):
+            assert (record.population, record.births, record.deaths, record.bounding_box) == \
+                (expected_record.population, expected_record.births, expected_record.deaths, expected_record.bounding_box)
+            assert record.population == len(grid.live_cells())
+    finally:
+        if engine == "parallel":
+            grid.engine.close()
+
+@pytest.mark.parametrize("engine", ["python", "numpy", "sparse", "bitpacked", "active", "parallel"])
+def test_step_reports_changed_cells(engine):
+    rng = random.Random(16)
+    cells = [[1 if rng.random() < 0.4 else 0 for _ in range(40)] for _ in range(36)]
+    grid = Grid(36, 40, engine=engine, boundary="torus")
+    grid.load_pattern(cells)
+    try:
+        for _ in range(20):
+            before = {(r, c) for r, row in enumerate(grid.to_list()) for c, cell in enumerate(row) if cell}
+            record = grid.step(changes=True)
+            after = set(grid.live_cells())
+            assert sorted(record.changed) == sorted(before ^ after)
+            assert (record.births, record.deaths) == (len(after - before), len(before - after))
+            assert record.population == len(after)
+    finally:
+        if engine == "parallel":
+            grid.engine.close()
+
+def test_population_follows_set_cell():
+    grid = Grid(4, 4)
+    assert grid.population() == 0
+    grid.set_cell(1, 1, 1)
+    assert grid.population() == 1
+    next(grid.run())
+    assert grid.population() == 0
+    grid.set_cell(0, 0, 1)
+    assert grid.is_grid_alive()
     
 if __name__ == "__main__":
     pytest.main()
\ No newline at end of file
@@ -0,0 +1,91 @@
+import os
+import random
+import pytest
+from game_of_life.grid import Grid, PatternSizeError
+from game_of_life.hashlife import HashLife
+from game_of_life.sparse import SparseGrid
+from game_of_life.utils import load_pattern_from_txt
+
+PATTERNS_DIR = os.path.join(os.path.dirname(__file__), "..", "patterns")
+
+def test_advance_matches_evolve_grid():
+    pattern = load_pattern_from_txt(os.path.join(PATTERNS_DIR, "other.txt"))
+    grid = Grid(80, 80)
+    grid.load_pattern(pattern, offset_row=30, offset_col=30)
+    universe = HashLife.from_grid(grid)
+    
+    for _ in range(13):
+        grid.evolve()
+    universe.advance(13)
+    
+    assert universe.generation == 13
+    assert universe.to_grid().to_list() == grid.to_list()
+
+def test_advance_in_steps_matches_sparse():
+    rng = random.Random(3)
+    pattern = [[1 if rng.random() < 0.5 else 0 for _ in range(10)] for _ in range(10)]
+    sparse = SparseGrid()
+    sparse.load_pattern(pattern)
+    universe = HashLife.from_pattern(pattern)
+    
+    for steps in (1, 2, 5, 8, 31):
+        for _ in range(steps):
+            sparse.evolve()
+        universe.advance(steps)
+        assert universe.live_cells() == sparse.live_cells
+
+def test_glider_far_future():
+    pattern = load_pattern_from_txt(os.path.join(PATTERNS_DIR, "glider.txt"))
+    universe = HashLife.from_pattern(pattern)
+    start = universe.live_cells()
+    
+    universe.advance(10 ** 9)
+    
+    shift = 10 ** 9 // 4
+    assert universe.population == 5
+    assert universe.live_cells() == {(row + shift, col + shift) for row, col in start}
+
+def test_garbage_collection_keeps_state():
+    pattern = load_pattern_from_txt(os.path.join(PATTERNS_DIR, "other.txt"))
+    reference = HashLife.from_pattern(pattern)
+    bounded = HashLife.from_pattern(pattern, max_nodes=500)
+    
+    reference.advance(300)
+    for _ in range(3):
+        bounded.advance(100)
+    
+    assert bounded.node_count() <= reference.node_count()
+    assert bounded.live_cells() == reference.live_cells()
+
+# Records the largest node table seen while advancing
+class PeakHashLife(HashLife):
+    peak = 0
+    
+    def _join(self, *children):
+        node = super()._join(*children)
+        self.peak = max(self.peak, len(self._nodes))
+        return node
+
+def test_node_table_is_bounded_within_a_jump():
+    rng = random.Random(4)
+    pattern = [[1 if rng.random() < 0.4 else 0 for _ in range(24)] for _ in range(24)]
+    reference = HashLife.from_pattern(pattern).advance(512)
+    bounded = PeakHashLife.from_pattern(pattern, max_nodes=2000)
+    
+    bounded.advance(512)
+    
+    assert reference.node_count() > 2000
+    assert bounded.peak <= 2000
+    assert bounded.live_cells() == reference.live_cells()
+    assert bounded.generation == 512
+
+def test_to_grid_pattern_left_grid():
+    pattern = load_pattern_from_txt(os.path.join(PATTERNS_DIR, "glider.txt"))
+    grid = Grid(5, 5)
+    grid.load_pattern(pattern)
+    universe = HashLife.from_grid(grid).advance(40)
+    with pytest.raises(PatternSizeError):
+        universe.to_grid()
+
+if __name__ == "__main__":
+    pytest.main()
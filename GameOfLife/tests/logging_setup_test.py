@@ -0,0 +1,67 @@
+import logging
+import os
+import subprocess
+import sys
+import pytest
+from game_of_life.logging_setup import configure_logging, shutdown_logging
+
+PACKAGE_DIR = os.path.join(os.path.dirname(__file__), "..")
+
+@pytest.fixture
+def restore_root_logger():
+    root = logging.getLogger()
+    level, handlers = root.level, list(root.handlers)
+    yield
+    shutdown_logging()
+    root.setLevel(level)
+    root.handlers = handlers
+
+def test_records_reach_the_file(tmp_path, restore_root_logger):
+    log_file = tmp_path / "nested" / "logs" / "simulation.log"
+    configure_logging(str(log_file))
+    for i in range(1000):
+        logging.info("generation %d", i)
+    shutdown_logging()
+    
+    lines = log_file.read_text().splitlines()
+    assert len(lines) == 1000
+    assert lines[-1].endswith("INFO - generation 999")
+
+def test_files_are_rotated(tmp_path, restore_root_logger):
+    log_file = tmp_path / "run.log"
+    configure_logging(str(log_file), max_bytes=2000, backup_count=2)
+    for i in range(500):
+        logging.info("padding padding padding %d", i)
+    shutdown_logging()
+    
+    assert os.path.getsize(log_file) <= 2000
+    assert (tmp_path / "run.log.1").exists() and (tmp_path / "run.log.2").exists()
+    assert not (tmp_path / "run.log.3").exists()
+
+def test_reconfigure_replaces_handler(tmp_path, restore_root_logger):
+    configure_logging(str(tmp_path / "first.log"))
+    configure_logging(str(tmp_path / "second.log"))
+    logging.warning("only once")
+    shutdown_logging()
+    
+    assert (tmp_path / "first.log").read_text() == ""
+    assert (tmp_path / "second.log").read_text().count("only once") == 1
+
+def test_import_has_no_side_effects(tmp_path):
+    # Used to fail without a logs/ directory next to the working directory
+    env = dict(os.environ, PYTHONPATH=os.path.abspath(PACKAGE_DIR))
+    subprocess.run([sys.executable, "-c", "import game_of_life.grid, game_of_life.main, game_of_life.runner"],
+                   cwd=tmp_path, env=env, check=True)
+    assert os.listdir(tmp_path) == []
+
+# logging_setup.py is copied into both packages rather than shared, see the top of the file
+def test_copies_match():
+    here = os.path.join(os.path.dirname(__file__), "..", "game_of_life", "logging_setup.py")
+    other = os.path.join(os.path.dirname(__file__), "..", "..", "SmartCourier", "smart_courier", "logging_setup.py")
+    if not os.path.exists(other):
+        pytest.skip("the other package is not next to this one")
+    with open(here, "rb") as f, open(other, "rb") as g:
+        assert f.read() == g.read()
+
+if __name__ == "__main__":
+    pytest.main()
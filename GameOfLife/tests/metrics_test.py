@@ -0,0 +1,94 @@
+import json
+import logging
+import os
+import pytest
+from game_of_life.metrics import MetricsRegistry, Metric
+
+def test_counts_and_times_calls():
+    registry = MetricsRegistry(enabled=True)
+    
+    @registry.timed
+    def add(a, b):
+        return a + b
+    
+    assert [add(i, 1) for i in range(10)] == list(range(1, 11))
+    timer = registry.snapshot()['timers'][f"{__name__}.test_counts_and_times_calls.<locals>.add"]
+    assert timer['calls'] == timer['sampled'] == 10
+    assert timer['min_us'] <= timer['p50_us'] <= timer['p99_us'] <= timer['max_us']
+
+def test_sampling_counts_every_call():
+    registry = MetricsRegistry(enabled=True)
+    noop = registry.timed(lambda: None, name="noop", sample_every=8)
+    for _ in range(100):
+        noop()
+    timer = registry.snapshot()['timers']['noop']
+    assert timer['calls'] == 100
+    assert timer['sampled'] == 12
+
+def test_disabled_registry_records_nothing():
+    registry = MetricsRegistry(enabled=False)
+    double = registry.timed(lambda x: 2 * x, name="double")
+    registry.count("events")
+    assert double(4) == 8
+    assert registry.snapshot() == {'timers': {}, 'counters': {}}
+    
+    # Can be switched on at runtime
+    registry.enabled = True
+    double(1)
+    assert registry.snapshot()['timers']['double']['calls'] == 1
+
+def test_exceptions_are_still_timed():
+    registry = MetricsRegistry(enabled=True)
+    
+    @registry.timed(name="fails")
+    def fails():
+        raise ValueError("boom")
+    
+    with pytest.raises(ValueError):
+        fails()
+    assert registry.snapshot()['timers']['fails']['sampled'] == 1
+
+def test_histogram_percentiles():
+    metric = Metric("latency")
+    for elapsed_ns in [100] * 90 + [10_000] * 9 + [1_000_000]:
+        metric.calls += 1
+        metric.record(elapsed_ns)
+    assert metric.percentile_ns(0.5) == 128
+    assert metric.percentile_ns(0.95) == 16384
+    assert metric.percentile_ns(1.0) == 1_000_000
+
+def test_dump_and_log_summary(tmp_path, caplog):
+    registry = MetricsRegistry(enabled=True)
+    registry.timed(lambda: None, name="step")()
+    registry.count("generations", 5)
+    path = tmp_path / "metrics.json"
+    
+    registry.dump(str(path))
+    data = json.loads(path.read_text())
+    assert data['counters'] == {'generations': 5}
+    assert data['timers']['step']['calls'] == 1
+    
+    with caplog.at_level(logging.INFO):
+        registry.log_summary()
+    assert "Function step: 1 calls" in caplog.text
+    
+    # Counted but not yet sampled
+    registry.timed(lambda: None, name="rare", sample_every=100)()
+    with caplog.at_level(logging.INFO):
+        registry.log_summary()
+    assert "Function rare: 1 calls, none timed yet" in caplog.text
+    
+    registry.reset()
+    assert registry.snapshot() == {'timers': {}, 'counters': {}}
+
+# metrics.py is copied into both packages rather than shared, see the top of the file
+def test_copies_match():
+    here = os.path.join(os.path.dirname(__file__), "..", "game_of_life", "metrics.py")
+    other = os.path.join(os.path.dirname(__file__), "..", "..", "SmartCourier", "smart_courier", "metrics.py")
+    if not os.path.exists(other):
+        pytest.skip("the other package is not next to this one")
+    with open(here, "rb") as f, open(other, "rb") as g:
+        assert f.read() == g.read()
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,58 @@
+import random
+import pytest
+from game_of_life.grid import Grid
+from game_of_life.parallel import ParallelEngine
+
+def random_cells(rows, cols, seed):
+    rng = random.Random(seed)
+    return [[1 if rng.random() < 0.35 else 0 for _ in range(cols)] for _ in range(rows)]
+
+def test_stripes_cover_all_rows():
+    engine = ParallelEngine(10, 4, workers=3)
+    assert engine.stripes() == [(0, 4), (4, 7), (7, 10)]
+    engine.close()
+
+def test_parallel_matches_python():
+    cells = random_cells(23, 31, seed=5)
+    python_grid = Grid(23, 31)
+    parallel_grid = Grid(23, 31, engine="parallel", workers=3)
+    python_grid.load_pattern(cells)
+    parallel_grid.load_pattern(cells)
+    
+    try:
+        for _ in range(25):
+            python_grid.evolve()
+            parallel_grid.evolve()
+            assert parallel_grid.to_list() == python_grid.to_list()
+    finally:
+        parallel_grid.engine.close()
+
+def test_run_many_generations_in_one_round_trip():
+    cells = random_cells(40, 16, seed=6)
+    python_grid = Grid(40, 16)
+    python_grid.load_pattern(cells)
+    engine = ParallelEngine(40, 16, workers=4)
+    engine.from_list(cells)
+    
+    try:
+        for _ in range(17):
+            python_grid.evolve()
+        assert engine.to_list(engine.run(17)) == python_grid.to_list()
+    finally:
+        engine.close()
+
+def test_evolve_does_not_copy_its_own_grid():
+    engine = ParallelEngine(12, 12, workers=2)
+    grid = engine.from_list(random_cells(12, 12, seed=7))
+    
+    try:
+        # The grid evolve returns is the front buffer's own view, so the next
+        # evolve reads it in place instead of copying it onto itself
+        for _ in range(3):
+            assert engine._view() is grid
+            grid = engine.evolve(grid)
+    finally:
+        engine.close()
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,84 @@
+import os
+import pytest
+from game_of_life.grid import Grid, PatternSizeError
+from game_of_life.sparse import SparseGrid
+from game_of_life.bitgrid import BitGrid
+from game_of_life.utils import load_pattern_from_txt, PatternLoadError
+from game_of_life.patterns import (read_pattern, load_cached_pattern, load_into, iter_live_cells,
+                                   clear_pattern_cache, pattern_cache_info)
+
+PATTERNS_DIR = os.path.join(os.path.dirname(__file__), "..", "patterns")
+
+GLIDER_CELLS = {(0, 1), (1, 2), (2, 0), (2, 1), (2, 2)}
+
+@pytest.mark.parametrize("name", ["glider.txt", "blinker.txt", "other.txt"])
+def test_plaintext_matches_load_pattern_from_txt(name):
+    path = os.path.join(PATTERNS_DIR, name)
+    assert read_pattern(path).to_list() == load_pattern_from_txt(path)
+
+def test_rle(tmp_path):
+    path = tmp_path / "glider.rle"
+    path.write_text("#N Glider\nx = 3, y = 3, rule = B3/S23\nbo$2bo$3o!\n")
+    pattern = read_pattern(str(path))
+    assert set(pattern.cells) == GLIDER_CELLS
+    assert (pattern.rows, pattern.cols) == (3, 3)
+
+def test_rle_run_count_split_over_lines(tmp_path):
+    path = tmp_path / "line.rle"
+    path.write_text("x = 12, y = 1\n1\n2o!\n")
+    assert read_pattern(str(path)).cells == tuple((0, col) for col in range(12))
+
+def test_life_106(tmp_path):
+    path = tmp_path / "glider.lif"
+    path.write_text("#Life 1.06\n0 -1\n1 0\n-1 1\n0 1\n1 1\n")
+    pattern = read_pattern(str(path))
+    assert set(pattern.cells) == GLIDER_CELLS
+
+def test_invalid_rle(tmp_path):
+    path = tmp_path / "bad.rle"
+    path.write_text("x = 3, y = 3\nbo$%!\n")
+    with pytest.raises(PatternLoadError):
+        read_pattern(str(path))
+
+@pytest.mark.parametrize("target", [Grid(10, 10), Grid(10, 10, engine="sparse"), SparseGrid(), BitGrid(10, 10)])
+def test_load_into_backends(target):
+    count = load_into(target, os.path.join(PATTERNS_DIR, "glider.txt"), offset_row=2, offset_col=3)
+    assert count == 5
+    assert all(target.get_cell(row + 2, col + 3) == 1 for row, col in GLIDER_CELLS)
+
+def test_load_into_moves_life_106_to_the_offset(tmp_path):
+    path = tmp_path / "glider.lif"
+    path.write_text("#Life 1.06\n0 -1\n1 0\n-1 1\n0 1\n1 1\n")
+    grid = Grid(6, 6)
+    assert load_into(grid, str(path), offset_row=2, offset_col=3) == 5
+    assert {(row, col) for row in range(6) for col in range(6) if grid.get_cell(row, col)} == \
+        {(row + 2, col + 3) for row, col in GLIDER_CELLS}
+
+def test_load_into_out_of_bounds():
+    grid = Grid(3, 3)
+    with pytest.raises(PatternSizeError):
+        load_into(grid, os.path.join(PATTERNS_DIR, "glider.txt"), offset_row=1)
+    # Nothing is written when the pattern doesn't fit
+    assert grid.to_list() == [[0, 0, 0]] * 3
+
+def test_cache_reparses_on_mtime_change(tmp_path):
+    clear_pattern_cache()
+    path = tmp_path / "pattern.txt"
+    path.write_text(".O.\n.O.\n.O.\n")
+    first = load_cached_pattern(str(path))
+    assert load_cached_pattern(str(path)) is first
+    assert pattern_cache_info()['hits'] == 1
+    
+    path.write_text("OO\nOO\n")
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 10 ** 9))
+    second = load_cached_pattern(str(path))
+    assert second is not first
+    assert second.to_list() == [[1, 1], [1, 1]]
+    assert pattern_cache_info()['misses'] == 2
+
+def test_missing_file():
+    with pytest.raises(PatternLoadError):
+        list(iter_live_cells("does/not/exist.txt"))
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,83 @@
+import random
+import numpy as np
+import pytest
+from game_of_life.grid import Grid
+from game_of_life.recording import Recorder, Replay, RecordingError, resume_grid
+
+def soup_grid(engine="python"):
+    rng = random.Random(11)
+    grid = Grid(24, 30, engine=engine)
+    grid.load_pattern([[1 if rng.random() < 0.35 else 0 for _ in range(30)] for _ in range(24)])
+    return grid
+
+def record(path, grid, generations, keyframe_interval):
+    states = [grid.to_list()]
+    with Recorder(path, grid.rows, grid.cols, keyframe_interval=keyframe_interval,
+                  rule=grid.rule, boundary=grid.boundary) as recorder:
+        recorder.append(grid)
+        for _ in range(generations):
+            recorder.append(grid, grid.step(changes=True).changed)
+            states.append(grid.to_list())
+    return states
+
+@pytest.mark.parametrize("engine", ["python", "numpy", "sparse", "bitpacked"])
+def test_replay_every_generation(tmp_path, engine):
+    path = str(tmp_path / "run.golrec")
+    states = record(path, soup_grid(engine), 40, keyframe_interval=8)
+    
+    with Replay(path) as replay:
+        assert len(replay) == 41
+        for generation, expected in enumerate(states):
+            assert replay.state(generation).tolist() == expected
+
+def test_random_access_seek(tmp_path):
+    path = str(tmp_path / "run.golrec")
+    states = record(path, soup_grid(), 60, keyframe_interval=16)
+    
+    with Replay(path) as replay:
+        for generation in (59, 3, 33, 32, 31, 0, 47, 48):
+            assert replay.state(generation).tolist() == states[generation]
+        with pytest.raises(RecordingError):
+            replay.state(61)
+
+def test_resume_grid_and_continue(tmp_path):
+    path = str(tmp_path / "run.golrec")
+    grid = soup_grid()
+    states = record(path, grid, 30, keyframe_interval=10)
+    
+    resumed, generation = resume_grid(path, generation=17, engine="numpy")
+    assert generation == resumed.generation == 17
+    records = list(resumed.run(13))
+    assert [record.generation for record in records] == list(range(18, 31))
+    assert resumed.to_list() == states[30] == grid.to_list()
+
+def test_resume_keeps_rule_and_boundary(tmp_path):
+    path = str(tmp_path / "run.golrec")
+    grid = Grid(16, 16, rule="highlife", boundary="torus")
+    grid.load_pattern([[1, 1, 1]], offset_row=15, offset_col=7)
+    states = record(path, grid, 6, keyframe_interval=4)
+    
+    resumed, _ = resume_grid(path, generation=2)
+    assert resumed.rule.rulestring == "B36/S23"
+    assert resumed.boundary.name == "torus"
+    resumed.evolve()
+    assert resumed.to_list() == states[3]
+
+def test_deltas_are_small(tmp_path):
+    path = str(tmp_path / "blinker.golrec")
+    grid = Grid(200, 200, engine="numpy")
+    grid.load_pattern([[1, 1, 1]], offset_row=100, offset_col=100)
+    record(path, grid, 500, keyframe_interval=1000)
+    
+    # One keyframe of 40000 cells, then 500 deltas of 4 flipped cells each
+    assert (tmp_path / "blinker.golrec").stat().st_size < 20000
+
+def test_not_a_recording(tmp_path):
+    path = tmp_path / "noise.golrec"
+    path.write_bytes(b"x" * 64)
+    (tmp_path / "noise.golrec.idx").write_bytes(b"")
+    with pytest.raises(RecordingError):
+        Replay(str(path))
+
+if __name__ == "__main__":
+    pytest.main()
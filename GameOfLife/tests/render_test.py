@@ -0,0 +1,46 @@
+import io
+import time
+import pytest
+from game_of_life.render import TerminalRenderer, frame_to_lines, diff_lines, move_to
+
+def test_cells_mode_matches_display():
+    assert frame_to_lines([[0, 1], [1, 0]]) == [" .   O ", " O   . "]
+
+def test_halfblock_mode():
+    frame = [[1, 0, 1],
+             [1, 0, 0],
+             [0, 1, 0]]
+    assert frame_to_lines(frame, "halfblock") == ["█ ▀", " ▀ "]
+
+def test_braille_mode():
+    frame = [[1, 1, 1],
+             [0, 0, 0],
+             [0, 0, 0],
+             [1, 0, 0]]
+    # Top dots of the first 4x2 block plus bottom-left, top-left dot of the second
+    assert frame_to_lines(frame, "braille") == [chr(0x2800 + 0x01 + 0x08 + 0x40) + chr(0x2800 + 0x01)]
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        TerminalRenderer(mode="ascii-art")
+
+def test_diff_only_touches_changed_cells():
+    previous = ["..........", "....O....."]
+    lines = ["..........", "....O...O."]
+    assert diff_lines(previous, lines) == move_to(1, 8) + "O"
+    assert diff_lines(lines, lines) == ""
+
+def test_renderer_thread_drops_frames_and_draws_latest():
+    stream = io.StringIO()
+    renderer = TerminalRenderer(max_fps=5, queue_size=1, stream=stream).start()
+    for generation in range(50):
+        renderer.submit([[generation % 2]], title=f"Generation {generation}")
+    time.sleep(0.05)
+    renderer.stop()
+    
+    assert renderer.frames_dropped > 0
+    assert renderer.frames_rendered + renderer.frames_dropped == 50
+    assert renderer._lines[0] == "Generation 49"
+
+if __name__ == "__main__":
+    pytest.main()
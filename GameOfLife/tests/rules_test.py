@@ -0,0 +1,82 @@
+import random
+import pytest
+from game_of_life.grid import Grid
+from game_of_life.rules import Rules, Rule, RuleStringError, get_rule, CONWAY
+from game_of_life.sparse import SparseGrid
+from game_of_life.bitgrid import BitGrid
+from game_of_life.hashlife import HashLife
+
+def random_grid(rows, cols, seed):
+    rng = random.Random(seed)
+    return [[1 if rng.random() < 0.35 else 0 for _ in range(cols)] for _ in range(rows)]
+
+def test_rulestring_notations():
+    assert get_rule("B36/S23") == get_rule("23/36") == get_rule("S23/B36") == get_rule("HighLife")
+    assert get_rule("b3/s23") is CONWAY
+    assert get_rule("seeds").rulestring == "B2/S"
+    assert get_rule("B3/S23").table == ((0, 0, 0, 1, 0, 0, 0, 0, 0), (0, 0, 1, 1, 0, 0, 0, 0, 0))
+
+def test_invalid_rulestrings():
+    with pytest.raises(RuleStringError):
+        Rule("B9/S23")
+    with pytest.raises(RuleStringError):
+        Rule("not a rule")
+    # B0 would fill the infinite background
+    with pytest.raises(RuleStringError):
+        Grid(5, 5, rule="B03/S23")
+
+def test_will_live_defaults_to_conway():
+    assert Rules.will_live(True, 2)
+    assert Rules.will_live(False, 3)
+    assert not Rules.will_live(False, 6)
+    assert Rules.will_live(False, 6, get_rule("highlife"))
+
+@pytest.mark.parametrize("rule", ["B36/S23", "B2/S", "B3678/S34678", "B1/S012345678"])
+@pytest.mark.parametrize("engine", ["numpy", "sparse", "bitpacked", "active", "parallel"])
+def test_engines_match_python_for_rule(rule, engine):
+    cells = random_grid(14, 19, seed=12)
+    expected = Grid(14, 19, rule=rule)
+    grid = Grid(14, 19, engine=engine, rule=rule, **({'workers': 2} if engine == "parallel" else {}))
+    expected.load_pattern(cells)
+    grid.load_pattern(cells)
+    try:
+        for _ in range(12):
+            expected.evolve()
+            grid.evolve()
+            assert grid.to_list() == expected.to_list()
+    finally:
+        if engine == "parallel":
+            grid.engine.close()
+
+@pytest.mark.parametrize("rule", ["B36/S23", "B2/S", "B3/S012345678"])
+def test_grid_classes_follow_rule(rule):
+    cells = random_grid(16, 16, seed=7)
+    expected = Grid(16, 16, rule=rule)
+    expected.load_pattern(cells)
+    sparse = SparseGrid(16, 16, rule=rule)
+    sparse.load_pattern(cells)
+    bit_grid = BitGrid.from_list(cells, rule=rule)
+    for _ in range(8):
+        expected.evolve()
+        sparse.evolve()
+        bit_grid.evolve()
+    assert sparse.to_list() == expected.to_list()
+    assert bit_grid.to_list() == expected.to_list()
+
+def test_hashlife_highlife_replicator():
+    # HighLife replicator, isolated so the dead boundary never matters
+    replicator = [[0, 0, 1, 1, 1],
+                  [0, 1, 0, 0, 1],
+                  [1, 0, 0, 0, 1],
+                  [1, 0, 0, 1, 0],
+                  [1, 1, 1, 0, 0]]
+    grid = Grid(48, 48, rule="highlife")
+    grid.load_pattern(replicator, offset_row=21, offset_col=21)
+    universe = HashLife.from_grid(grid)
+    for _ in range(16):
+        grid.evolve()
+    assert universe.rule == get_rule("B36/S23")
+    assert universe.advance(16).to_grid().to_list() == grid.to_list()
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,31 @@
+import json
+import os
+import pytest
+from game_of_life.runner import run_headless, main
+
+PATTERNS_DIR = os.path.join(os.path.dirname(__file__), "..", "patterns")
+
+@pytest.mark.parametrize("engine", ["python", "numpy", "hashlife"])
+def test_run_headless_report(engine):
+    report = run_headless(os.path.join(PATTERNS_DIR, "blinker.txt"), rows=10, cols=10,
+                          generations=20, engine=engine)
+    
+    assert report['engine'] == engine
+    assert report['generations'] == 20
+    assert report['final_population'] == 3
+    assert report['offset_row'] == 3 and report['offset_col'] == 3
+    assert report['generations_per_sec'] > 0
+    assert report['cell_updates_per_sec'] == pytest.approx(report['generations_per_sec'] * 100)
+
+def test_cli_writes_json(tmp_path):
+    output = tmp_path / "report.json"
+    main([os.path.join(PATTERNS_DIR, "glider.txt"), "--rows", "30", "--cols", "30",
+          "--offset-row", "0", "--offset-col", "0", "--generations", "8",
+          "--engine", "sparse", "--trace-memory", "--output", str(output)])
+    
+    report = json.loads(output.read_text())
+    assert report['final_population'] == 5
+    assert report['peak_traced_kb'] >= 0
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,56 @@
+import os
+import random
+import pytest
+from game_of_life.grid import Grid, PatternSizeError
+from game_of_life.sparse import SparseGrid
+from game_of_life.utils import load_pattern_from_txt
+
+PATTERNS_DIR = os.path.join(os.path.dirname(__file__), "..", "patterns")
+
+def test_sparse_engine_matches_python():
+    rng = random.Random(7)
+    cells = [[1 if rng.random() < 0.4 else 0 for _ in range(12)] for _ in range(9)]
+    python_grid = Grid(9, 12, engine="python")
+    sparse_grid = Grid(9, 12, engine="sparse")
+    python_grid.load_pattern(cells)
+    sparse_grid.load_pattern(cells)
+    
+    for _ in range(25):
+        python_grid.evolve()
+        sparse_grid.evolve()
+        assert sparse_grid.to_list() == python_grid.to_list()
+
+def test_bounded_sparse_grid_matches_grid():
+    pattern = load_pattern_from_txt(os.path.join(PATTERNS_DIR, "glider.txt"))
+    grid = Grid(6, 6)
+    sparse = SparseGrid(6, 6)
+    grid.load_pattern(pattern)
+    sparse.load_pattern(pattern)
+    
+    # Glider runs into the corner and dies at the dead boundary
+    for _ in range(20):
+        grid.evolve()
+        sparse.evolve()
+        assert sparse.to_list() == grid.to_list()
+
+def test_bounded_sparse_grid_pattern_must_fit():
+    sparse = SparseGrid(5, 5)
+    with pytest.raises(PatternSizeError):
+        sparse.load_pattern([[1, 1], [1, 1]], offset_row=4, offset_col=4)
+
+def test_unbounded_glider_travels():
+    pattern = load_pattern_from_txt(os.path.join(PATTERNS_DIR, "glider.txt"))
+    sparse = SparseGrid()
+    sparse.load_pattern(pattern, offset_row=-1, offset_col=-1)
+    start = sparse.live_cells
+    
+    # Glider moves one cell down and right every 4 generations
+    for _ in range(4000):
+        sparse.evolve()
+    
+    assert sparse.population() == 5
+    assert sparse.live_cells == {(row + 1000, col + 1000) for row, col in start}
+    assert sparse.to_list() == pattern
+
+if __name__ == "__main__":
+    pytest.main()
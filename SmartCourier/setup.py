@@ -14,4 +14,9 @@ setup(
     packages=find_packages(),
     install_requires=read_requirements(),
     python_requires=">=3.7",
+    entry_points={
+        'console_scripts': [
+            'smart-courier-run=smart_courier.runner:main',
+        ],
+    },
 )
\ No newline at end of file
@@ -0,0 +1,53 @@
+from .utils import timed
+import numpy as np
+
+EARTH_RADIUS_KM = 6371   # Same radius as optimizer.haversine
+
+
+# Coordinates converted to radians once, with the cosine of every latitude that the
+# haversine formula needs, so batch distance calls do no per-point setup
+class RadianPoints:
+    def __init__(self, latitudes, longitudes):
+        self.lat = np.radians(np.asarray(latitudes, dtype=np.float64))
+        self.lon = np.radians(np.asarray(longitudes, dtype=np.float64))
+        self.cos_lat = np.cos(self.lat)
+
+    def __len__(self):
+        return len(self.lat)
+
+    # (lat, lon, cos_lat) of one point, as taken by distances_from
+    def point(self, index):
+        return self.lat[index], self.lon[index], self.cos_lat[index]
+
+
+# One-to-many: great-circle distances in km from one point (radians) to points, or to
+# only the points at indices. Same formula and operand order as the scalar haversine;
+# a is clipped at 1 so rounding near antipodal points can't give NaN.
+@timed(sample_every=64)
+def distances_from(lat, lon, cos_lat, points, indices=None):
+    if indices is None:
+        lat2, lon2, cos_lat2 = points.lat, points.lon, points.cos_lat
+    else:
+        lat2, lon2, cos_lat2 = points.lat[indices], points.lon[indices], points.cos_lat[indices]
+    a = np.sin((lat2 - lat) / 2) ** 2 + cos_lat * cos_lat2 * np.sin((lon2 - lon) / 2) ** 2
+    return 2 * np.arcsin(np.sqrt(np.minimum(a, 1.0))) * EARTH_RADIUS_KM
+
+
+# Many-to-many: matrix of distances in km from every point in origins to every point in
+# destinations (origins to themselves when omitted). Uses len(origins) * len(destinations)
+# floats of memory.
+@timed
+def distance_matrix(origins, destinations=None):
+    destinations = origins if destinations is None else destinations
+    lat1, lon1, cos_lat1 = origins.lat[:, None], origins.lon[:, None], origins.cos_lat[:, None]
+    a = (np.sin((destinations.lat - lat1) / 2) ** 2
+         + cos_lat1 * destinations.cos_lat * np.sin((destinations.lon - lon1) / 2) ** 2)
+    return 2 * np.arcsin(np.sqrt(np.minimum(a, 1.0))) * EARTH_RADIUS_KM
+
+
+# Elementwise: distance in km from (lat1[i], lon1[i]) to (lat2[i], lon2[i]), all in degrees
+@timed
+def pairwise_distances(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(values, dtype=np.float64)) for values in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * np.arcsin(np.sqrt(np.minimum(a, 1.0))) * EARTH_RADIUS_KM
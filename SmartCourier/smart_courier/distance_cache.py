@@ -0,0 +1,282 @@
+from .distance import RadianPoints, distance_matrix, pairwise_distances
+from collections import OrderedDict
+import atexit
+import hashlib
+import logging
+import numpy as np
+import os
+import sqlite3
+import time
+
+DEFAULT_PATH = 'SmartCourier/output/distances.sqlite'
+# Coordinates are rounded to 1e-6 degrees (about 11 cm) for the keys
+QUANTUM = 10 ** 6
+MEMORY_LIMIT = 64 * 2 ** 20    # Bytes of distances kept in memory
+DISK_LIMIT = 256 * 2 ** 20     # Bytes of distances kept in the SQLite file
+# Distances kept per point on disk. A row that would grow past it keeps only the points
+# of the lookup that grew it, so the stops that are still delivered to stay.
+ROW_LIMIT = 8192
+WAL_RETRIES = 50
+SQL_BATCH = 500                # Points per SELECT, below SQLite's limit on parameters
+
+# One row per point: the points it has distances to and the distances, as int64 and
+# float64 arrays. Each pair is in the row of the point with the smaller key. When a row
+# was last used is kept apart, so that marking it used doesn't rewrite its distances.
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS distance_points (point INTEGER PRIMARY KEY, bytes INTEGER, used INTEGER);
+CREATE INDEX IF NOT EXISTS distance_points_used ON distance_points (used);
+CREATE TABLE IF NOT EXISTS distance_rows (point INTEGER PRIMARY KEY, dests BLOB, km BLOB);
+'''
+
+
+# The legs of a route, or the matrix between all stops of a priority tier, are kept whole
+# in an in-memory LRU keyed by a digest of their coordinates, for lookups repeated within
+# a run. Matrices are also kept between runs per pair of quantized points, so that stops
+# delivered to before are known again whatever else is on the route and in whatever
+# order: a lookup reads the rows of its points from a SQLite file in a few SELECTs, finds
+# its pairs in them with numpy, computes only the pairs it didn't find and adds them to
+# the rows. Both are bounded in bytes and evict the least recently used entries or rows.
+# Distances are computed from the coordinates of the first lookup of their points, so
+# addresses that repeat exactly always get the exact distances back.
+class DistanceCache:
+    def __init__(self, path=DEFAULT_PATH, memory_limit=MEMORY_LIMIT, disk_limit=DISK_LIMIT, row_limit=ROW_LIMIT):
+        self.path = path
+        self.memory_limit = memory_limit
+        self.disk_limit = disk_limit
+        self.row_limit = row_limit
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._db = None
+        # Counted in distances
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0, 'disk_evictions': 0}
+
+    def _connection(self):
+        if self._db is None and self.path:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(self.path, timeout=30)
+            # New files only: big pages, as rows are blobs of up to a few hundred KB, and
+            # space freed by evictions goes back to the file system
+            self._db.execute('PRAGMA page_size=65536')
+            self._db.execute('PRAGMA auto_vacuum=INCREMENTAL')
+            # Losing the last writes in a power cut only costs recomputing them. Switching a
+            # new file to WAL takes an exclusive lock without waiting for it, so processes
+            # opening the file at the same time retry.
+            for attempt in range(WAL_RETRIES):
+                try:
+                    self._db.execute('PRAGMA journal_mode=WAL')
+                    break
+                except sqlite3.OperationalError:
+                    if attempt == WAL_RETRIES - 1:
+                        raise
+                    time.sleep(0.01 * (attempt + 1))
+            self._db.execute('PRAGMA synchronous=NORMAL')
+            self._db.executescript(SCHEMA)
+            # Tables written by earlier versions: per pair, then per whole set of points
+            for table in ('distances', 'distance_entries', 'distance_arrays'):
+                self._db.execute(f'DROP TABLE IF EXISTS {table}')
+            self._db.commit()
+        return self._db
+
+    # Creates the file and its tables now rather than on the first lookup that needs them
+    def open(self):
+        self._connection()
+        return self
+
+    # Coordinates in 1e-6 degrees; they fit in 32 bits, which halves what is hashed
+    @staticmethod
+    def quantized(values):
+        return np.rint(np.asarray(values, dtype=np.float64) * QUANTUM).astype(np.int32)
+
+    # One int64 per point: its quantized latitude and longitude side by side
+    @classmethod
+    def point_keys(cls, latitudes, longitudes):
+        return ((cls.quantized(latitudes).astype(np.int64) << 32)
+                | (cls.quantized(longitudes).astype(np.int64) & 0xFFFFFFFF))
+
+    # Digest of what is asked for: its kind and its coordinates, quantized and in order.
+    # SHA-256 is the fastest hashlib digest here (hardware accelerated on most CPUs).
+    @classmethod
+    def digest(cls, kind, *coordinates):
+        digest = hashlib.sha256(kind.encode())
+        for values in coordinates:
+            digest.update(cls.quantized(values).tobytes())
+        return digest.digest()
+
+    def _remember(self, digest, km):
+        if km.nbytes > self.memory_limit:
+            return
+        self._memory[digest] = km
+        self._memory_bytes += km.nbytes
+        while self._memory_bytes > self.memory_limit:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted.nbytes
+            self.stats['evictions'] += 1
+
+    # Distinct points among the given ones: their sorted keys, the coordinates of the
+    # first of each, and which of them every given point is
+    def _points(self, latitudes, longitudes):
+        keys, first, inverse = np.unique(self.point_keys(latitudes, longitudes), return_index=True,
+                                         return_inverse=True)
+        return keys, latitudes[first], longitudes[first], inverse.reshape(-1)
+
+    # Index of each value in the sorted keys, or -1
+    @staticmethod
+    def _locate(keys, values):
+        if not len(keys):
+            return np.full(len(values), -1)
+        position = np.minimum(np.searchsorted(keys, values), len(keys) - 1)
+        return np.where(keys[position] == values, position, -1)
+
+    # The rows of the given keys, flattened: which key each distance is from, which it is
+    # to (-1 if not among keys), the distances, and where the row of each point is
+    def _read_rows(self, db, keys):
+        found, dests, km = [], [], []
+        points = keys.tolist()
+        for start in range(0, len(points), SQL_BATCH):
+            batch = points[start:start + SQL_BATCH]
+            for point, row_dests, row_km in db.execute(
+                    f'SELECT point, dests, km FROM distance_rows WHERE point IN ({",".join("?" * len(batch))})', batch):
+                found.append(point)
+                dests.append(row_dests)
+                km.append(row_km)
+        if found:
+            now = time.time_ns()
+            db.executemany('UPDATE distance_points SET used = ? WHERE point = ?', [(now, point) for point in found])
+            db.commit()
+        lengths = [len(row) // 8 for row in dests]
+        dests = np.frombuffer(b''.join(dests), dtype=np.int64)
+        return {'origins': np.repeat(np.searchsorted(keys, np.array(found, dtype=np.int64)), lengths),
+                'destinations': self._locate(keys, dests), 'dests': dests,
+                'km': np.frombuffer(b''.join(km), dtype=np.float64),
+                'rows': dict(zip(found, zip(np.cumsum([0] + lengths[:-1]), np.cumsum(lengths))))}
+
+    # Stores the rows of the points given as (point, dests, km), each with what it held
+    # before for points outside this lookup, unless that would outgrow row_limit. Then
+    # evicts the least recently used rows while the file is over its limit.
+    def _write_rows(self, db, old, new_rows):
+        rows = []
+        for point, dests, km in new_rows:
+            start, end = old['rows'].get(point, (0, 0))
+            keep = old['destinations'][start:end] < 0
+            if len(dests) + np.count_nonzero(keep) > self.row_limit:
+                keep[:] = False
+            dests = np.concatenate([dests, old['dests'][start:end][keep]])[:self.row_limit]
+            km = np.concatenate([km, old['km'][start:end][keep]])[:self.row_limit]
+            rows.append((point, dests.tobytes(), km.tobytes()))
+        now = time.time_ns()
+        db.executemany('INSERT OR REPLACE INTO distance_rows VALUES (?, ?, ?)', rows)
+        db.executemany('INSERT OR REPLACE INTO distance_points VALUES (?, ?, ?)',
+                       [(point, len(dests) + len(km), now) for point, dests, km in rows])
+        total = db.execute('SELECT SUM(bytes) FROM distance_points').fetchone()[0]
+        if total > self.disk_limit:
+            for point, size in db.execute('SELECT point, bytes FROM distance_points ORDER BY used').fetchall():
+                if total <= self.disk_limit:
+                    break
+                db.execute('DELETE FROM distance_points WHERE point = ?', (point,))
+                db.execute('DELETE FROM distance_rows WHERE point = ?', (point,))
+                total -= size
+                self.stats['disk_evictions'] += 1
+            db.commit()
+            db.execute('PRAGMA incremental_vacuum').fetchall()
+        db.commit()
+
+    # Cached array under digest, found by lookup() on a miss. Arrays handed out are
+    # read-only, as they are shared with later lookups.
+    def _get(self, digest, lookup):
+        km = self._memory.get(digest)
+        if km is not None:
+            self._memory.move_to_end(digest)
+            self.stats['memory_hits'] += km.size
+            return km
+        km = lookup()
+        km.flags.writeable = False
+        self._remember(digest, km)
+        return km
+
+    # Legs are only kept in memory: computing them takes about 50 ns each, less than
+    # finding them in the rows of their points on disk
+    def _compute_pairs(self, lat1, lon1, lat2, lon2):
+        self.stats['misses'] += len(lat1)
+        return pairwise_distances(lat1, lon1, lat2, lon2)
+
+    def _lookup_matrix(self, lat, lon):
+        db = self._connection()
+        if db is None:
+            self.stats['misses'] += len(lat) * (len(lat) - 1)
+            return distance_matrix(RadianPoints(lat, lon))
+        keys, latitudes, longitudes, inverse = self._points(lat, lon)
+        size = len(keys)
+        known = np.full((size, size), np.nan)
+        np.fill_diagonal(known, 0.0)
+        old = self._read_rows(db, keys)
+        stored = old['destinations'] >= 0
+        known[old['origins'][stored], old['destinations'][stored]] = old['km'][stored]
+        rows, columns = np.nonzero(np.triu(np.isnan(known)))
+        self.stats['disk_hits'] += size * (size - 1) - 2 * len(rows)
+        if len(rows):
+            known[rows, columns] = pairwise_distances(latitudes[rows], longitudes[rows],
+                                                      latitudes[columns], longitudes[columns])
+            self.stats['misses'] += 2 * len(rows)
+            # Rows with a new distance are rewritten with all their distances in the matrix,
+            # and keep the rest of what they held
+            self._write_rows(db, old, [(int(keys[row]), keys[row + 1:], known[row, row + 1:])
+                                       for row in np.unique(rows)])
+        known = np.where(np.isnan(known), known.T, known)
+        return known[np.ix_(inverse, inverse)]
+
+    # Distances in km between (lat1[i], lon1[i]) and (lat2[i], lon2[i]), in degrees
+    def distances(self, lat1, lon1, lat2, lon2):
+        lat1, lon1, lat2, lon2 = (np.atleast_1d(np.asarray(values, dtype=np.float64))
+                                  for values in (lat1, lon1, lat2, lon2))
+        return self._get(self.digest('pairs', lat1, lon1, lat2, lon2), lambda: self._compute_pairs(lat1, lon1, lat2, lon2))
+
+    def distance(self, lat1, lon1, lat2, lon2):
+        return float(self.distances(lat1, lon1, lat2, lon2)[0])
+
+    # Symmetric matrix of the distances between every pair of points, in degrees
+    def matrix(self, latitudes, longitudes):
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        longitudes = np.asarray(longitudes, dtype=np.float64)
+        return self._get(self.digest('matrix', latitudes, longitudes), lambda: self._lookup_matrix(latitudes, longitudes))
+
+    def cache_info(self):
+        lookups = self.stats['memory_hits'] + self.stats['disk_hits'] + self.stats['misses']
+        hits = lookups - self.stats['misses']
+        return {'size': len(self._memory), 'memory_bytes': self._memory_bytes, 'memory_limit': self.memory_limit,
+                'disk_limit': self.disk_limit, 'row_limit': self.row_limit, 'path': self.path, **self.stats,
+                'hit_rate': hits / lookups if lookups else None}
+
+    def clear_memory(self):
+        self._memory.clear()
+        self._memory_bytes = 0
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+_default_cache = None
+
+
+# The cache the optimizer uses, opened on first use
+def get_distance_cache():
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = DistanceCache()
+    return _default_cache
+
+
+def close_distance_cache():
+    global _default_cache
+    if _default_cache is not None:
+        info = _default_cache.cache_info()
+        logging.info(f"Distance cache: {info['memory_hits']} memory hits, {info['disk_hits']} disk hits, "
+                     f"{info['misses']} misses")
+        _default_cache.close()
+        _default_cache = None
+
+
+atexit.register(close_distance_cache)
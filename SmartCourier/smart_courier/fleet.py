@@ -0,0 +1,207 @@
+from .optimizer import START_DEPOT, read_deliveries, plan_route, write_route
+from .distance_cache import DEFAULT_PATH, DistanceCache, get_distance_cache
+from .improve import TIME_BUDGET_S
+from .logging_setup import detach_logging
+from .utils import timed
+from multiprocessing import Pool
+import csv
+import json
+import logging
+import math
+import os
+import time
+
+VEHICLES_FILE = 'SmartCourier/data/vehicles.json'
+TRANSPORT_MODES_FILE = 'SmartCourier/data/transport_modes.json'
+# cache_path of plan_fleet when none is given: the shared cache of single-route mode
+SHARED_CACHE = object()
+ROUTES_DIR = 'SmartCourier/output/routes'
+FLEET_SUMMARY_FILE = 'SmartCourier/output/fleet_summary.csv'
+UNASSIGNED_FILE = 'SmartCourier/output/unassigned.csv'
+SUMMARY_FIELDS = ['vehicle', 'mode', 'capacity_kg', 'load_kg', 'deliveries', 'distance_km', 'time_hrs', 'cost',
+                  'emissions_kgCO2']
+
+
+# Vehicles in the order they are loaded: name, transport mode and capacity in kg
+def load_vehicles(vehicles_file=VEHICLES_FILE):
+    with open(vehicles_file, 'r') as f:
+        vehicles = json.load(f)
+    names = set()
+    for vehicle in vehicles:
+        if vehicle['vehicle'] in names:
+            raise ValueError(f"Duplicate vehicle name: {vehicle['vehicle']}")
+        if vehicle['capacity_kg'] <= 0:
+            raise ValueError(f"Vehicle {vehicle['vehicle']} needs a positive capacity_kg")
+        names.add(vehicle['vehicle'])
+    return vehicles
+
+
+# Compass bearing in radians from the depot to a delivery, on a flat map scaled by the
+# cosine of the depot latitude; good enough to order stops around the depot
+def bearing(delivery, depot=START_DEPOT):
+    north = delivery['latitude'] - depot[0]
+    east = (delivery['longitude'] - depot[1]) * math.cos(math.radians(depot[0]))
+    return math.atan2(east, north) % (2 * math.pi)
+
+
+# Sweep split: deliveries sorted by bearing around the depot, starting after the widest
+# empty angle so no route straddles a natural border between clusters, then loaded in
+# that order into the current vehicle until the next one doesn't fit. A delivery that
+# doesn't fit opens the first unused vehicle that can carry it, so a small vehicle
+# is not wasted on a heavy delivery. Returns {vehicle name: deliveries} for the vehicles
+# used, in vehicle order, and the deliveries no vehicle could take.
+def sweep_split(deliveries, vehicles, depot=START_DEPOT):
+    if not deliveries:
+        return {}, []
+    angles = [bearing(delivery, depot) for delivery in deliveries]
+    order = sorted(range(len(deliveries)), key=lambda index: (angles[index], index))
+    gaps = [(angles[order[(i + 1) % len(order)]] - angles[order[i]]) % (2 * math.pi) for i in range(len(order))]
+    widest = max(range(len(gaps)), key=lambda i: (gaps[i], -i))
+    order = order[widest + 1:] + order[:widest + 1]
+
+    unused = list(vehicles)
+    loads = {}
+    routes = {}
+    unassigned = []
+    current = None
+    for index in order:
+        delivery = deliveries[index]
+        weight = delivery['weight_kg']
+        if current is None or loads[current['vehicle']] + weight > current['capacity_kg']:
+            fitting = next((vehicle for vehicle in unused if vehicle['capacity_kg'] >= weight), None)
+            if fitting is None:
+                unassigned.append(delivery)
+                continue
+            unused.remove(fitting)
+            current = fitting
+            loads[current['vehicle']] = 0.0
+            routes[current['vehicle']] = []
+        loads[current['vehicle']] += weight
+        routes[current['vehicle']].append(delivery)
+
+    names = [vehicle['vehicle'] for vehicle in vehicles]
+    return {name: routes[name] for name in names if name in routes}, unassigned
+
+
+# One vehicle's route. Unless the shared cache is used (serially only), the job opens its
+# own cache on cache_path, None for memory only: a SQLite connection must not be shared
+# across a fork.
+def _plan_vehicle(job):
+    vehicle, deliveries, improve, time_budget, cache_path = job
+    start_time = time.perf_counter()
+    cache = get_distance_cache() if cache_path is SHARED_CACHE else DistanceCache(cache_path)
+    report = {}
+    try:
+        stops, legs = plan_route(deliveries, cache=cache, improve=improve, time_budget=time_budget, report=report)
+    finally:
+        if cache_path is not SHARED_CACHE:
+            cache.close()
+    return {
+        'vehicle': vehicle['vehicle'],
+        'stops': stops,
+        'legs': legs,
+        'improvement': report.get('improvement'),
+        'elapsed_s': time.perf_counter() - start_time,
+    }
+
+
+def _plan_routes(jobs, workers):
+    if workers == 1:
+        return [_plan_vehicle(job) for job in jobs]
+    with Pool(workers, initializer=detach_logging) as pool:
+        return pool.map(_plan_vehicle, jobs, chunksize=1)
+
+
+# Time, cost and emissions of distance_km in one transport mode, as in calculate_transport_modes
+def mode_totals(distance_km, mode):
+    return {
+        'time_hrs': distance_km / mode['speed_kmh'],
+        'cost': distance_km * mode['cost_per_km'],
+        'emissions_kgCO2': distance_km * mode['co2_per_km'],
+    }
+
+
+def write_unassigned(unassigned, output_file=UNASSIGNED_FILE):
+    with open(output_file, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['customer', 'latitude', 'longitude', 'priority', 'weight_kg'])
+        for delivery in unassigned:
+            writer.writerow([delivery['customer'], delivery['latitude'], delivery['longitude'],
+                             delivery['priority'], delivery['weight_kg']])
+
+
+# Multi-vehicle mode: split the valid deliveries over the vehicles by capacity, route
+# every vehicle from the depot in parallel, one process per vehicle, and write a route
+# per vehicle to routes/<vehicle>.csv (same columns as optimized_route.csv) plus
+# fleet_summary.csv with a row per vehicle and the combined totals. Distances come from
+# the shared distance cache unless cache_path is given (None keeps them in memory only).
+@timed
+def plan_fleet(deliveries, vehicles_file=VEHICLES_FILE, workers=None, improve=True, time_budget=TIME_BUDGET_S,
+               routes_dir=ROUTES_DIR, summary_file=FLEET_SUMMARY_FILE, unassigned_file=UNASSIGNED_FILE,
+               cache_path=SHARED_CACHE):
+    start_time = time.perf_counter()
+    vehicles = load_vehicles(vehicles_file)
+    with open(TRANSPORT_MODES_FILE, 'r') as f:
+        transport_data = {m['mode']: m for m in json.load(f)}
+    for vehicle in vehicles:
+        if vehicle['mode'] not in transport_data:
+            raise ValueError(f"Vehicle {vehicle['vehicle']} has unknown transport mode {vehicle['mode']}")
+
+    unvisited = read_deliveries(deliveries)
+    routes, unassigned = sweep_split(unvisited, vehicles)
+    split_time = time.perf_counter()
+    workers = max(1, min(workers or os.cpu_count() or 1, len(routes) or 1))
+    # Workers can't share the cache object, so they each open the default file instead
+    if workers > 1 and cache_path is SHARED_CACHE:
+        cache_path = DEFAULT_PATH
+    jobs = [(vehicle, routes[vehicle['vehicle']], improve, time_budget, cache_path)
+            for vehicle in vehicles if vehicle['vehicle'] in routes]
+    if workers > 1 and cache_path is not None:
+        # Create the cache file and switch it to WAL before the workers all try at once
+        DistanceCache(cache_path).open().close()
+    planned = {result['vehicle']: result for result in _plan_routes(jobs, workers)}
+
+    os.makedirs(routes_dir, exist_ok=True)
+    summary = []
+    for vehicle in vehicles:
+        if vehicle['vehicle'] not in planned:
+            continue
+        result = planned[vehicle['vehicle']]
+        route_file = os.path.join(routes_dir, f"{vehicle['vehicle']}.csv")
+        distance = write_route(route_file, result['stops'], result['legs'])
+        summary.append({
+            'vehicle': vehicle['vehicle'],
+            'mode': vehicle['mode'],
+            'capacity_kg': vehicle['capacity_kg'],
+            'load_kg': sum(delivery['weight_kg'] for delivery in routes[vehicle['vehicle']]),
+            'deliveries': len(routes[vehicle['vehicle']]),
+            'distance_km': distance,
+            **mode_totals(distance, transport_data[vehicle['mode']]),
+            'route_file': route_file,
+            'improvement': result['improvement'],
+            'elapsed_s': result['elapsed_s'],
+        })
+
+    totals = {field: sum(row[field] for row in summary) for field in SUMMARY_FIELDS[2:]}
+    totals.update(vehicle='total', mode='')
+    with open(summary_file, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(summary)
+        writer.writerow(totals)
+    write_unassigned(unassigned, unassigned_file)
+
+    elapsed = time.perf_counter() - start_time
+    logging.info(f"Fleet run: {len(summary)} vehicles, {totals['deliveries']} deliveries, "
+                 f"{len(unassigned)} unassigned, {totals['distance_km']:.2f} km in {elapsed:.2f} seconds")
+    if unassigned:
+        logging.warning(f"{len(unassigned)} deliveries fit no vehicle, see {unassigned_file}")
+    return {
+        'vehicles': summary,
+        'unassigned': [delivery['customer'] for delivery in unassigned],
+        'totals': {field: totals[field] for field in SUMMARY_FIELDS[2:]},
+        'summary_file': summary_file,
+        'workers': workers,
+        'split_s': split_time - start_time,
+        'elapsed_s': elapsed,
+    }
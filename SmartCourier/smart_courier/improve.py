@@ -0,0 +1,161 @@
+from .utils import timed
+import logging
+import numpy as np
+import time
+
+TIME_BUDGET_S = 1.0      # Wall-clock budget of each stage
+MAX_TIER_STOPS = 2000    # Bigger tiers are left as built: their matrix would need 4M+ distances
+MAX_SEGMENT = 3          # Longest chain of stops Or-opt moves
+EPSILON = 1e-9           # km; smaller gains are rounding noise and could make moves cycle
+
+
+def path_length(path, matrix):
+    return float(matrix[path[:-1], path[1:]].sum())
+
+
+# 2-opt on a path with fixed ends: reverse path[i+1..j] when replacing edges (a, b) and
+# (c, d) with (a, c) and (b, d) is shorter. For each i, all j are evaluated in one
+# vectorized delta from the matrix; the best one is applied. Repeats until no move
+# helps or the deadline passes. Returns the path, moves made and whether it converged.
+def two_opt(path, matrix, deadline):
+    n = len(path)
+    moves = 0
+    improved = True
+    while improved:
+        improved = False
+        for i in range(n - 3):
+            if time.perf_counter() > deadline:
+                return path, moves, False
+            a, b = path[i], path[i + 1]
+            c, d = path[i + 2:n - 1], path[i + 3:n]
+            delta = matrix[a, c] + matrix[b, d] - matrix[a, b] - matrix[c, d]
+            k = int(np.argmin(delta))
+            if delta[k] < -EPSILON:
+                j = i + 2 + k
+                path[i + 1:j + 1] = path[i + 1:j + 1][::-1].copy()
+                moves += 1
+                improved = True
+    return path, moves, True
+
+
+# Or-opt on a path with fixed ends: move a chain of 1 to max_segment stops, possibly
+# reversed, to the edge where inserting it costs least, when that beats where it is.
+# All insertion edges are evaluated in one vectorized delta per chain.
+def or_opt(path, matrix, deadline, max_segment=MAX_SEGMENT):
+    n = len(path)
+    moves = 0
+    improved = True
+    while improved:
+        improved = False
+        for length in range(1, max_segment + 1):
+            p = 1
+            while p + length <= n - 1:
+                if time.perf_counter() > deadline:
+                    return path, moves, False
+                first, last = path[p], path[p + length - 1]
+                before, after = path[p - 1], path[p + length]
+                removed = matrix[before, first] + matrix[last, after] - matrix[before, after]
+                # Insertion edges (path[q], path[q + 1]) not touching the chain
+                q = np.concatenate((np.arange(0, p - 1), np.arange(p + length, n - 1)))
+                if not len(q):
+                    break
+                u, v = path[q], path[q + 1]
+                forward = matrix[u, first] + matrix[last, v] - matrix[u, v]
+                backward = matrix[u, last] + matrix[first, v] - matrix[u, v]
+                best_forward, best_backward = int(np.argmin(forward)), int(np.argmin(backward))
+                reverse = backward[best_backward] < forward[best_forward]
+                k = best_backward if reverse else best_forward
+                added = backward[k] if reverse else forward[k]
+                if added - removed < -EPSILON:
+                    chain = path[p:p + length][::-1] if reverse else path[p:p + length]
+                    rest = np.delete(path, np.arange(p, p + length))
+                    insert_at = q[k] + 1 if q[k] < p else q[k] + 1 - length
+                    path = np.insert(rest, insert_at, chain)
+                    moves += 1
+                    improved = True
+                p += 1
+    return path, moves, True
+
+
+STAGES = (('2-opt', two_opt), ('or-opt', or_opt))
+
+
+# Improve a greedy route stage by stage. Moves stay inside a priority tier, so high
+# priority stops still all come before medium and low ones: each tier is improved as a
+# path between the stop before it and the stop after it, which stay fixed meanwhile.
+# order lists delivery indices tier after tier (tier_sizes long each); the depot is
+# index len(latitudes) - 1. Distances come from the cache: one matrix per tier plus
+# the rows to the stops around it. Returns the new order and a report of the distance
+# saved per stage.
+@timed
+def improve_route(order, tier_sizes, latitudes, longitudes, cache, time_budget=TIME_BUDGET_S, stages=STAGES):
+    latitudes = np.asarray(latitudes, dtype=np.float64)
+    longitudes = np.asarray(longitudes, dtype=np.float64)
+    depot = len(latitudes) - 1
+    bounds = np.cumsum([0] + list(tier_sizes)).tolist()
+    # Stops of each tier in a fixed numbering, and the current path through them
+    stops = [np.asarray(order[start:end], dtype=np.intp) for start, end in zip(bounds, bounds[1:])]
+    paths = [np.arange(len(tier_stops)) for tier_stops in stops]
+
+    # Building the matrices counts against the first stage's budget; tiers still without
+    # one when it runs out are left as built
+    start_time = time.perf_counter()
+    blocks = {}
+    skipped = []
+    for number, tier_stops in enumerate(stops):
+        if len(tier_stops) > MAX_TIER_STOPS or time.perf_counter() > start_time + time_budget:
+            skipped.append(number)
+        elif len(tier_stops) > 1:
+            blocks[number] = cache.matrix(latitudes[tier_stops], longitudes[tier_stops])
+    report = {'matrix_s': time.perf_counter() - start_time, 'skipped_tiers': skipped, 'stages': {}}
+
+    def end_stop(number, step):
+        number += step
+        while 0 <= number < len(stops):
+            if len(stops[number]):
+                path = stops[number][paths[number]]
+                return path[-1] if step < 0 else path[0]
+            number += step
+        return depot
+
+    for index, (name, stage) in enumerate(stages):
+        stage_start = start_time if index == 0 else time.perf_counter()
+        deadline = stage_start + time_budget
+        saved = 0.0
+        moves = 0
+        converged = True
+        for number, block in blocks.items():
+            tier_stops = stops[number]
+            size = len(tier_stops)
+            # Local numbering: 0 is the stop before the tier, 1..size its stops and
+            # size + 1 the stop after it
+            ends = [end_stop(number, -1), end_stop(number, 1)]
+            end_lat, end_lon = latitudes[ends], longitudes[ends]
+            matrix = np.empty((size + 2, size + 2))
+            matrix[1:size + 1, 1:size + 1] = block
+            # Both ends to every stop of the tier, then one end to the other, in one lookup
+            to_ends = cache.distances(np.append(end_lat.repeat(size), end_lat[0]),
+                                      np.append(end_lon.repeat(size), end_lon[0]),
+                                      np.append(np.tile(latitudes[tier_stops], 2), end_lat[1]),
+                                      np.append(np.tile(longitudes[tier_stops], 2), end_lon[1]))
+            matrix[0, 1:size + 1] = matrix[1:size + 1, 0] = to_ends[:size]
+            matrix[size + 1, 1:size + 1] = matrix[1:size + 1, size + 1] = to_ends[size:2 * size]
+            matrix[0, 0] = matrix[size + 1, size + 1] = 0.0
+            matrix[0, size + 1] = matrix[size + 1, 0] = to_ends[-1]
+
+            path = np.concatenate(([0], paths[number] + 1, [size + 1]))
+            before = path_length(path, matrix)
+            path, tier_moves, finished = stage(path, matrix, deadline)
+            saved += before - path_length(path, matrix)
+            moves += tier_moves
+            paths[number] = path[1:-1] - 1
+            if not finished:
+                converged = False
+                break
+        report['stages'][name] = {'saved_km': saved, 'moves': moves, 'converged': converged,
+                                  'elapsed_s': time.perf_counter() - stage_start}
+        logging.info(f"Route improvement {name}: {saved:.3f} km saved with {moves} moves")
+
+    report['saved_km'] = sum(stage['saved_km'] for stage in report['stages'].values())
+    improved = [int(stop) for tier_stops, path in zip(stops, paths) for stop in tier_stops[path]]
+    return improved, report
@@ -1,36 +1,62 @@
 from .validation import (validate_customer_name, validate_priority, validate_latitude, validate_longitude, validate_weight)
 from .optimizer import (calculate_distance, calculate_transport_modes, save_final_route, save_route_summary, print_route_summary)
 from .utils import view_csv_file, timed, clear_screen
+from .logging_setup import configure_logging
 import csv
 import logging 
 import time
 
-# Logging configuration
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', filename='SmartCourier/output/run.log', filemode='a')
+LOG_FILE = 'SmartCourier/output/run.log'
+VALID_FILE = 'SmartCourier/output/valid.csv'
+REJECTED_FILE = 'SmartCourier/output/rejected.csv'
+WRITE_BUFFER = 1 << 20    # Bytes buffered per output file before a write
 stats = {'start_time': None, 'end_time': None}
 
-@timed
-def validate_inputs(deliveries_file):
-    with open(deliveries_file, 'r') as f:
-        lines = f.read().splitlines()[1:] 
-    
-    for line in lines:
-        customer, latitude, longitude, priority, weight_kg = line.split(',')
-        
-        if (validate_customer_name(customer) and
-            validate_latitude(float(latitude)) and
-            validate_longitude(float(longitude)) and
+# Rows of a deliveries file, header skipped, read one at a time so memory doesn't grow
+# with the file. The csv module handles quoted fields with commas in them.
+def read_rows(deliveries_file):
+    with open(deliveries_file, 'r', newline='') as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        for row in reader:
+            if row:
+                yield row
+
+def is_valid_delivery(row):
+    if len(row) != 5:
+        return False
+    customer, latitude, longitude, priority, weight_kg = row
+    return (validate_customer_name(customer) and
+            validate_latitude(latitude) and
+            validate_longitude(longitude) and
             validate_priority(priority) and
-            validate_weight(float(weight_kg))):
-                with open('SmartCourier/output/valid.csv', 'a', newline='') as validfile:
-                    writer = csv.writer(validfile)
-                    writer.writerow([customer, latitude, longitude, priority, weight_kg])
-                print(f"valid: {line}")
-        else:
-            with open('SmartCourier/output/rejected.csv', 'a', newline='') as rejectedfile:
-                writer = csv.writer(rejectedfile)
-                writer.writerow([customer, latitude, longitude, priority, weight_kg])
-            print(f"Invalid: {line}")
+            validate_weight(weight_kg))
+
+def classify_rows(rows):
+    for row in rows:
+        yield is_valid_delivery(row), row
+
+# Streams deliveries_file through validation into valid_file and rejected_file, which
+# stay open (and buffered) for the whole run. They are appended to, as "Reset Output
+# Files" writes their headers. verbose prints every row as it is classified.
+# Returns the number of valid and rejected rows.
+@timed
+def validate_inputs(deliveries_file, verbose=True, valid_file=VALID_FILE, rejected_file=REJECTED_FILE):
+    counts = {'valid': 0, 'rejected': 0}
+    with open(valid_file, 'a', newline='', buffering=WRITE_BUFFER) as validfile, \
+         open(rejected_file, 'a', newline='', buffering=WRITE_BUFFER) as rejectedfile:
+        write_valid = csv.writer(validfile).writerow
+        write_rejected = csv.writer(rejectedfile).writerow
+        for valid, row in classify_rows(read_rows(deliveries_file)):
+            if valid:
+                write_valid(row)
+                counts['valid'] += 1
+            else:
+                write_rejected(row)
+                counts['rejected'] += 1
+            if verbose:
+                print(f"{'valid' if valid else 'Invalid'}: {','.join(row)}")
+    return counts
             
             
 def print_stats():
@@ -45,6 +71,7 @@ def print_stats():
 
 def main():
     import time as timemodule
+    configure_logging(LOG_FILE)
     while True: 
         print("\n==============================")
         print(" Smart Courier Main Menu ")
@@ -129,9 +156,12 @@ def main():
                 break
             try:
                 clear_screen()
-                calculate_distance(deliveries='SmartCourier/output/valid.csv')
-                total_distance = calculate_distance(deliveries='SmartCourier/output/valid.csv')
-                print(f"\nOptimization complete. Total distance for the route: {total_distance:.2f} km")
+                route_report = {}
+                total_distance = calculate_distance(deliveries='SmartCourier/output/valid.csv', improve=True,
+                                                    report=route_report)
+                saved = route_report['improvement']['saved_km'] if 'improvement' in route_report else 0.0
+                print(f"\nOptimization complete. Total distance for the route: {total_distance:.2f} km "
+                      f"({saved:.2f} km saved by 2-opt and Or-opt)")
                 print("These are the optimized routes: SmartCourier/output/optimized_route.csv")
                 print("=" * 80)
                 view_csv_file('SmartCourier/output/optimized_route.csv')
@@ -0,0 +1,171 @@
+# The same file is in GameOfLife/game_of_life and SmartCourier/smart_courier: the two packages are
+# installed separately and neither depends on the other. tests/metrics_test.py in each checks
+# that the copies match, so change both.
+from . import logging_setup   # Imported first so its exit hook runs after the summary below is logged
+from functools import wraps
+from time import perf_counter_ns
+import atexit
+import json
+import logging
+import os
+
+# Latency histograms use power-of-two buckets: bucket i counts durations of
+# 2^(i-1) up to 2^i nanoseconds, so recording one is a bit_length() and an add.
+BUCKETS = 64
+
+
+def _env_flag(name, default):
+    value = os.environ.get(name)
+    return default if value is None else value.strip().lower() not in ("0", "false", "no", "off", "")
+
+
+# Call count and sampled latencies of one instrumented function
+class Metric:
+    __slots__ = ('name', 'calls', 'sample_every', 'sampled', 'total_ns', 'min_ns', 'max_ns', 'buckets')
+
+    def __init__(self, name, sample_every=1):
+        self.name = name
+        self.sample_every = max(1, int(sample_every))
+        self.reset()
+
+    def reset(self):
+        self.calls = 0
+        self.sampled = 0
+        self.total_ns = 0
+        self.min_ns = None
+        self.max_ns = 0
+        self.buckets = [0] * BUCKETS
+
+    def record(self, elapsed_ns):
+        self.sampled += 1
+        self.total_ns += elapsed_ns
+        if self.min_ns is None or elapsed_ns < self.min_ns:
+            self.min_ns = elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        self.buckets[min(elapsed_ns.bit_length(), BUCKETS - 1)] += 1
+
+    # Upper bound of the bucket holding the given fraction of the samples
+    def percentile_ns(self, fraction):
+        if not self.sampled:
+            return None
+        rank = fraction * self.sampled
+        seen = 0
+        for bucket, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank:
+                return min(1 << bucket, self.max_ns)
+        return self.max_ns
+
+    def snapshot(self):
+        mean_ns = self.total_ns / self.sampled if self.sampled else None
+        to_us = lambda ns: None if ns is None else round(ns / 1000, 3)
+        return {
+            'calls': self.calls,
+            'sampled': self.sampled,
+            # Sampled calls stand in for the ones that were not timed
+            'total_s': round(mean_ns * self.calls / 1e9, 6) if mean_ns is not None else None,
+            'mean_us': to_us(mean_ns),
+            'min_us': to_us(self.min_ns),
+            'p50_us': to_us(self.percentile_ns(0.5)),
+            'p90_us': to_us(self.percentile_ns(0.9)),
+            'p99_us': to_us(self.percentile_ns(0.99)),
+            'max_us': to_us(self.max_ns if self.sampled else None),
+        }
+
+
+# In-memory aggregates instead of one log line per call. Disabled, an instrumented call
+# costs one attribute check; enabled, every call is counted and every sample_every-th
+# call is timed with perf_counter_ns.
+#   METRICS=0             disable
+#   METRICS_SAMPLE_EVERY  default sampling interval
+#   METRICS_DUMP=path     write the aggregates as JSON at exit (they are always logged)
+class MetricsRegistry:
+    def __init__(self, enabled=None, sample_every=None):
+        self.enabled = _env_flag("METRICS", True) if enabled is None else enabled
+        self.sample_every = int(os.environ.get("METRICS_SAMPLE_EVERY", 1)) if sample_every is None else sample_every
+        self.metrics = {}
+        self.counters = {}
+        self._exit_path = os.environ.get("METRICS_DUMP")
+        self._exit_registered = False
+
+    def metric(self, name, sample_every=None):
+        metric = self.metrics.get(name)
+        if metric is None:
+            metric = self.metrics[name] = Metric(name, sample_every or self.sample_every)
+        return metric
+
+    # Decorator, bare (@timed) or with options (@timed(sample_every=64))
+    def timed(self, func=None, name=None, sample_every=None):
+        if func is None:
+            return lambda func: self.timed(func, name=name, sample_every=sample_every)
+        metric = self.metric(name or f"{func.__module__}.{func.__qualname__}", sample_every)
+        registry = self
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not registry.enabled:
+                return func(*args, **kwargs)
+            metric.calls += 1
+            if metric.calls % metric.sample_every:
+                return func(*args, **kwargs)
+            start = perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                metric.record(perf_counter_ns() - start)
+        return wrapper
+
+    def count(self, name, n=1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def snapshot(self):
+        return {
+            'timers': {name: metric.snapshot() for name, metric in sorted(self.metrics.items()) if metric.calls},
+            'counters': dict(sorted(self.counters.items())),
+        }
+
+    def reset(self):
+        for metric in self.metrics.values():
+            metric.reset()
+        self.counters = {}
+
+    # JSON of the aggregates, also written to path when given
+    def dump(self, path=None):
+        text = json.dumps(self.snapshot(), indent=2)
+        if path:
+            with open(path, "w") as f:
+                f.write(text + "\n")
+        return text
+
+    # One log line per instrumented function, instead of one per call
+    def log_summary(self, level=logging.INFO):
+        snapshot = self.snapshot()
+        for name, timer in snapshot['timers'].items():
+            if not timer['sampled']:
+                logging.log(level, f"Function {name}: {timer['calls']} calls, none timed yet")
+                continue
+            logging.log(level, f"Function {name}: {timer['calls']} calls, {timer['total_s']:.4f} seconds total, "
+                               f"mean {timer['mean_us']} us, p99 {timer['p99_us']} us")
+        for name, value in snapshot['counters'].items():
+            logging.log(level, f"Counter {name}: {value}")
+
+    def dump_at_exit(self, path=None):
+        self._exit_path = path or self._exit_path
+        if not self._exit_registered:
+            atexit.register(self._at_exit)
+            self._exit_registered = True
+
+    def _at_exit(self):
+        if not self.enabled:
+            return
+        self.log_summary()
+        if self._exit_path:
+            self.dump(self._exit_path)
+
+
+registry = MetricsRegistry()
+registry.dump_at_exit()
+timed = registry.timed
+count = registry.count
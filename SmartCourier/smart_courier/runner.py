@@ -0,0 +1,135 @@
+from .main import validate_inputs
+from .optimizer import calculate_distance, calculate_transport_modes, save_route_summary, save_final_route
+from .distance_cache import get_distance_cache
+from .fleet import VEHICLES_FILE, plan_fleet
+from .improve import TIME_BUDGET_S
+from .logging_setup import configure_logging
+import argparse
+import json
+import logging
+import time
+
+DELIVERIES_FILE = 'SmartCourier/data/deliveries.csv'
+VALID_FILE = 'SmartCourier/output/valid.csv'
+REJECTED_FILE = 'SmartCourier/output/rejected.csv'
+ROUTE_FILE = 'SmartCourier/output/optimized_route.csv'
+ROUTE_MODE_FILE = 'SmartCourier/output/optimized_route_mode.csv'
+FINAL_ROUTE_FILE = 'SmartCourier/output/final_route.csv'
+DELIVERY_HEADER = 'customer,latitude,longitude,priority,weight_kg\n'
+TRANSPORT_MODES = ['Car', 'Bicycle', 'Walking']
+
+
+def reset_validation_output():
+    for path in (VALID_FILE, REJECTED_FILE):
+        with open(path, 'w') as f:
+            f.write(DELIVERY_HEADER)
+
+
+# The whole menu workflow in one call: validation appends, so valid.csv and rejected.csv
+# start from just the header, as after "Reset Output Files"
+def run_pipeline(deliveries_file=DELIVERIES_FILE, transport_mode='Car', save_summary=True, improve=True,
+                 time_budget=TIME_BUDGET_S):
+    start_time = time.perf_counter()
+    reset_validation_output()
+    # Rows aren't echoed: stdout carries the JSON report
+    counts = validate_inputs(deliveries_file, verbose=False)
+    validated_time = time.perf_counter()
+    route_report = {}
+    total_distance = calculate_distance(deliveries=VALID_FILE, improve=improve, time_budget=time_budget,
+                                        report=route_report)
+    route_options = calculate_transport_modes(optimized_route_file=ROUTE_FILE, verbose=False)
+    if save_summary:
+        save_route_summary(route_options=route_options, output_file=ROUTE_MODE_FILE)
+    save_final_route(route_options=route_options, transport_mode=transport_mode, output_file=FINAL_ROUTE_FILE)
+    elapsed = time.perf_counter() - start_time
+
+    mode = transport_mode.lower()
+    report = {
+        'deliveries': deliveries_file,
+        'valid': counts['valid'],
+        'rejected': counts['rejected'],
+        # The final leg of the route is the running total back at the depot
+        'total_distance_km': total_distance,
+        'transport_mode': transport_mode.capitalize(),
+        'time_hrs': route_options[-1][mode]['time_hrs'] if route_options else 0.0,
+        'cost': route_options[-1][mode]['cost'] if route_options else 0.0,
+        'emissions_kgCO2': route_options[-1][mode]['emissions_kgCO2'] if route_options else 0.0,
+        'validation_s': validated_time - start_time,
+        'elapsed_s': elapsed,
+        'final_route': FINAL_ROUTE_FILE,
+        'improvement': route_report.get('improvement'),
+        'distance_cache': get_distance_cache().cache_info(),
+    }
+    logging.info(f"Pipeline run: {report['valid']} valid, {report['rejected']} rejected deliveries, "
+                 f"{total_distance:.2f} km in {elapsed:.2f} seconds")
+    return report
+
+
+# Multi-vehicle variant: the valid deliveries are split over the vehicles in vehicles_file
+# and routed per vehicle, each in its vehicle's own transport mode
+def run_fleet_pipeline(deliveries_file=DELIVERIES_FILE, vehicles_file=VEHICLES_FILE, workers=None, improve=True,
+                       time_budget=TIME_BUDGET_S):
+    start_time = time.perf_counter()
+    reset_validation_output()
+    counts = validate_inputs(deliveries_file, verbose=False)
+    validated_time = time.perf_counter()
+    fleet = plan_fleet(VALID_FILE, vehicles_file=vehicles_file, workers=workers, improve=improve,
+                       time_budget=time_budget)
+    elapsed = time.perf_counter() - start_time
+
+    report = {
+        'deliveries': deliveries_file,
+        'valid': counts['valid'],
+        'rejected': counts['rejected'],
+        'vehicles_file': vehicles_file,
+        **fleet,
+        'validation_s': validated_time - start_time,
+        'elapsed_s': elapsed,
+        'distance_cache': get_distance_cache().cache_info(),
+    }
+    logging.info(f"Fleet pipeline run: {report['valid']} valid, {report['rejected']} rejected deliveries, "
+                 f"{fleet['totals']['distance_km']:.2f} km over {len(fleet['vehicles'])} vehicles "
+                 f"in {elapsed:.2f} seconds")
+    return report
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Validate and route a deliveries file without the menu and report the result as JSON.")
+    parser.add_argument("deliveries", nargs="?", default=DELIVERIES_FILE, help=f"Deliveries CSV (default: {DELIVERIES_FILE})")
+    parser.add_argument("--mode", type=str.capitalize, choices=TRANSPORT_MODES, default="Car",
+                        help="Transport mode of the final route")
+    parser.add_argument("--no-summary", action="store_true", help="Don't write optimized_route_mode.csv")
+    parser.add_argument("--no-improve", action="store_true", help="Keep the greedy route, skip 2-opt and Or-opt")
+    parser.add_argument("--time-budget", type=float, default=TIME_BUDGET_S,
+                        help="Seconds each improvement stage may run")
+    parser.add_argument("--fleet", action="store_true",
+                        help="Split the deliveries over several vehicles by capacity (ignores --mode and --no-summary)")
+    parser.add_argument("--vehicles", default=VEHICLES_FILE, help=f"Vehicles of the fleet (default: {VEHICLES_FILE})")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Processes routing the vehicles in parallel (default: all cores)")
+    parser.add_argument("--output", default=None, help="Write the JSON report to this file instead of stdout")
+    parser.add_argument("--log-file", default=None, help="Log to this file (rotated at 5 MB)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.log_file:
+        configure_logging(args.log_file)
+    if args.fleet:
+        report = run_fleet_pipeline(args.deliveries, vehicles_file=args.vehicles, workers=args.workers,
+                                    improve=not args.no_improve, time_budget=args.time_budget)
+    else:
+        report = run_pipeline(args.deliveries, transport_mode=args.mode, save_summary=not args.no_summary,
+                              improve=not args.no_improve, time_budget=args.time_budget)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+from .distance import EARTH_RADIUS_KM
+from math import asin, cos, sin, sqrt
+import numpy as np
+
+LEAF_SIZE = 8
+# Slack on the pruning bound, in chord units of the unit sphere (about 6 micrometres on
+# the ground), so rounding in the unit vectors never prunes a point that ties the best
+CHORD_SLACK = 1e-12
+
+
+# KD-tree over points on the unit sphere, built once for a fixed set of points.
+# Straight-line (chord) distance between unit vectors grows with great-circle distance,
+# so boxes around the 3D vectors bound the haversine distance of everything inside
+# them. Queries return the exact haversine nearest point, ties going to the lowest
+# index as min() over a list in index order would. Removing a point marks it and
+# decrements the live counts on the path to the root, O(log n); empty subtrees are skipped.
+class SphereKDTree:
+    def __init__(self, points, indices=None):
+        indices = np.arange(len(points)) if indices is None else np.asarray(indices, dtype=np.intp)
+        # Per point, as Python floats: indexing lists is much faster than numpy scalars
+        self.lat = points.lat.tolist()
+        self.lon = points.lon.tolist()
+        self.cos_lat = points.cos_lat.tolist()
+        vectors = np.column_stack((points.cos_lat * np.cos(points.lon),
+                                   points.cos_lat * np.sin(points.lon),
+                                   np.sin(points.lat)))
+
+        self.alive = [False] * len(points)
+        self.leaf_of = [-1] * len(points)
+        self.lower = []
+        self.upper = []
+        self.children = []
+        self.parent = []
+        self.count = []
+        self.leaf_points = []
+        if len(indices):
+            self._build(vectors, np.sort(indices), -1)
+        self.size = len(indices)
+
+    def _build(self, vectors, indices, parent):
+        node = len(self.count)
+        box = vectors[indices]
+        self.lower.append(tuple(box.min(axis=0).tolist()))
+        self.upper.append(tuple(box.max(axis=0).tolist()))
+        self.parent.append(parent)
+        self.count.append(len(indices))
+        if len(indices) <= LEAF_SIZE:
+            self.children.append(None)
+            self.leaf_points.append(indices.tolist())
+            for index in self.leaf_points[node]:
+                self.alive[index] = True
+                self.leaf_of[index] = node
+            return node
+
+        self.children.append(None)
+        self.leaf_points.append(None)
+        axis = int(np.argmax(box.max(axis=0) - box.min(axis=0)))
+        half = len(indices) // 2
+        order = np.argpartition(box[:, axis], half)
+        # Children keep their points in index order, so leaves are scanned lowest index first
+        left = self._build(vectors, np.sort(indices[order[:half]]), node)
+        right = self._build(vectors, np.sort(indices[order[half:]]), node)
+        self.children[node] = (left, right)
+        return node
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, index):
+        return self.alive[index]
+
+    def remove(self, index):
+        if not self.alive[index]:
+            raise KeyError(index)
+        self.alive[index] = False
+        self.size -= 1
+        node = self.leaf_of[index]
+        while node != -1:
+            self.count[node] -= 1
+            node = self.parent[node]
+
+    # Index of and haversine distance in km to the nearest remaining point from a point
+    # given in radians with the cosine of its latitude, or None when the tree is empty
+    def nearest(self, lat, lon, cos_lat):
+        if not self.size:
+            return None
+        lat, lon, cos_lat = float(lat), float(lon), float(cos_lat)
+        query = (cos_lat * cos(lon), cos_lat * sin(lon), sin(lat))
+        best_distance = float("inf")
+        best_index = -1
+        bound = float("inf")
+        # (squared chord gap from the query to the node's box, node)
+        stack = [(0.0, 0)]
+        while stack:
+            gap, node = stack.pop()
+            if gap > bound or not self.count[node]:
+                continue
+
+            children = self.children[node]
+            if children is not None:
+                left, right = children
+                left_gap, right_gap = self._box_gap(query, left), self._box_gap(query, right)
+                # Visit the closer child first, so the bound tightens early
+                if left_gap <= right_gap:
+                    stack.append((right_gap, right))
+                    stack.append((left_gap, left))
+                else:
+                    stack.append((left_gap, left))
+                    stack.append((right_gap, right))
+                continue
+
+            points_lat, points_lon, points_cos_lat, alive = self.lat, self.lon, self.cos_lat, self.alive
+            for index in self.leaf_points[node]:
+                if not alive[index]:
+                    continue
+                # Same formula and operand order as optimizer.haversine
+                a = (sin((points_lat[index] - lat) / 2) ** 2
+                     + cos_lat * points_cos_lat[index] * sin((points_lon[index] - lon) / 2) ** 2)
+                distance = 2 * asin(sqrt(min(a, 1.0))) * EARTH_RADIUS_KM
+                if distance < best_distance or (distance == best_distance and index < best_index):
+                    best_distance, best_index = distance, index
+                    chord = 2 * sin(best_distance / (2 * EARTH_RADIUS_KM)) + CHORD_SLACK
+                    bound = chord * chord
+        return best_index, best_distance
+
+    # Squared chord distance from a unit vector to the nearest point of a node's box
+    def _box_gap(self, query, node):
+        gap = 0.0
+        for q, low, high in zip(query, self.lower[node], self.upper[node]):
+            if q < low:
+                gap += (low - q) * (low - q)
+            elif q > high:
+                gap += (q - high) * (q - high)
+        return gap
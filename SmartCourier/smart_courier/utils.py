@@ -1,8 +1,6 @@
 import csv
-import time
-import logging
-from functools import wraps
 import os
+from .metrics import timed   # Re-exported: modules decorate with utils.timed
 
 def view_csv_file(file_path):
     with open(file_path, 'r') as f:
@@ -17,15 +15,5 @@ def view_csv_file(file_path):
             print(", ".join(row))
             count += 1
             
-def timed(func):
-    @wraps(func)
-    def wrapper(*args, **kwargs):
-        start_time = time.time()
-        result = func(*args, **kwargs)
-        end_time = time.time()
-        logging.info(f"Function {func.__name__} took {end_time - start_time:.4f} seconds")
-        return result
-    return wrapper
-
 def clear_screen():
     os.system('cls' if os.name == 'nt' else 'clear')    
\ No newline at end of file
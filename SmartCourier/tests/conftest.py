@@ -0,0 +1,13 @@
+import os
+import shutil
+import pytest
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+
+# The pipeline uses paths relative to the repository root, so it runs in a copy of that layout
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    os.makedirs(tmp_path / "SmartCourier" / "output")
+    shutil.copytree(DATA_DIR, tmp_path / "SmartCourier" / "data")
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
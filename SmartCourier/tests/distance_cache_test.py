@@ -0,0 +1,165 @@
+import csv
+import os
+import random
+import sqlite3
+from multiprocessing import Pool
+import numpy as np
+import pytest
+from smart_courier.distance import RadianPoints, distance_matrix
+from smart_courier.distance_cache import DistanceCache
+from smart_courier.optimizer import haversine, calculate_distance
+
+OSLO = (59.9111, 10.7522)
+TERMINAL = (59.9417, 10.9441)
+
+LEGS = ([OSLO[0], 60.0], [OSLO[1], 11.0], [TERMINAL[0], 61.0], [TERMINAL[1], 12.0])
+STOPS = ([OSLO[0], TERMINAL[0]], [OSLO[1], TERMINAL[1]])
+
+def test_hits_and_misses(tmp_path):
+    cache = DistanceCache(str(tmp_path / "distances.sqlite"))
+    first = cache.distance(*OSLO, *TERMINAL)
+    assert first == pytest.approx(haversine(OSLO[1], OSLO[0], TERMINAL[1], TERMINAL[0]), abs=1e-9)
+    assert cache.distance(*OSLO, *TERMINAL) == first
+    info = cache.cache_info()
+    assert info['misses'] == 1 and info['memory_hits'] == 1 and info['hit_rate'] == 0.5
+
+def test_persists_between_runs(tmp_path):
+    path = str(tmp_path / "distances.sqlite")
+    first = DistanceCache(path)
+    expected = first.matrix(*STOPS)
+    first.close()
+    
+    second = DistanceCache(path)
+    assert np.array_equal(second.matrix(*STOPS), expected)
+    assert second.cache_info()['disk_hits'] == 2 and second.cache_info()['misses'] == 0
+
+def test_legs_stay_in_memory(tmp_path):
+    path = tmp_path / "distances.sqlite"
+    DistanceCache(str(path)).distances(*LEGS)
+    assert not path.exists()
+
+def test_quantized_keys():
+    cache = DistanceCache(path=None)
+    cache.distance(*OSLO, *TERMINAL)
+    # Within 1e-6 degrees the same key, further away a new one
+    cache.distance(OSLO[0] + 1e-8, OSLO[1], *TERMINAL)
+    cache.distance(OSLO[0] + 1e-4, OSLO[1], *TERMINAL)
+    assert cache.cache_info()['memory_hits'] == 1 and cache.cache_info()['misses'] == 2
+
+def test_stops_are_found_in_any_order(tmp_path):
+    path = str(tmp_path / "distances.sqlite")
+    latitudes, longitudes = [59.9, 60.4, 63.4], [10.7, 5.3, 10.4]
+    DistanceCache(path).matrix(latitudes, longitudes)
+    cache = DistanceCache(path)
+    cache.matrix(latitudes[::-1], longitudes[::-1])
+    cache.matrix(latitudes[1:] + latitudes[:1], longitudes[1:] + longitudes[:1])
+    assert cache.cache_info()['misses'] == 0 and cache.cache_info()['disk_hits'] == 12
+
+def test_overlapping_stops_hit_across_runs(tmp_path):
+    path = str(tmp_path / "distances.sqlite")
+    rng = random.Random(3)
+    latitudes = [rng.uniform(58, 71) for _ in range(35)]
+    longitudes = [rng.uniform(4, 31) for _ in range(35)]
+    DistanceCache(path).matrix(latitudes[:30], longitudes[:30])
+    # The next day five stops are gone, five are new and the rest come in another order
+    stops = list(range(5, 35))
+    random.Random(4).shuffle(stops)
+    cache = DistanceCache(path)
+    matrix = cache.matrix([latitudes[i] for i in stops], [longitudes[i] for i in stops])
+    expected = distance_matrix(RadianPoints([latitudes[i] for i in stops], [longitudes[i] for i in stops]))
+    assert np.max(np.abs(matrix - expected)) < 1e-9
+    # Only pairs with a new stop are computed, in both directions
+    assert cache.cache_info()['misses'] == 2 * (5 * 25 + 5 * 4 // 2)
+    assert cache.cache_info()['disk_hits'] == 25 * 24
+
+def test_arrays_are_read_only():
+    cache = DistanceCache(path=None)
+    legs = cache.distances(*LEGS)
+    with pytest.raises(ValueError):
+        legs[0] = 0.0
+
+def test_least_recently_used_is_evicted():
+    # Room for two arrays of one distance each
+    cache = DistanceCache(path=None, memory_limit=16)
+    cache.distance(0, 0, 1, 1)
+    cache.distance(0, 0, 2, 2)
+    cache.distance(0, 0, 1, 1)
+    cache.distance(0, 0, 3, 3)
+    assert cache.cache_info()['evictions'] == 1
+    cache.distance(0, 0, 1, 1)
+    cache.distance(0, 0, 2, 2)
+    assert cache.cache_info()['misses'] == 4
+
+def test_disk_is_bounded(tmp_path):
+    path = str(tmp_path / "distances.sqlite")
+    rng = random.Random(2)
+    # A 20 stop matrix is stored as 190 pairs of 16 bytes in 19 rows; the file keeps one
+    cache = DistanceCache(path, memory_limit=0, disk_limit=190 * 16)
+    sets = [([rng.uniform(58, 71) for _ in range(20)], [rng.uniform(4, 31) for _ in range(20)]) for _ in range(4)]
+    for latitudes, longitudes in sets:
+        cache.matrix(latitudes, longitudes)
+    assert cache.cache_info()['disk_evictions'] == 3 * 19
+    with sqlite3.connect(path) as db:
+        assert db.execute("SELECT COUNT(*), SUM(bytes) FROM distance_points").fetchone() == (19, 190 * 16)
+    # The oldest sets are gone, the newest is still on disk
+    cache = DistanceCache(path, memory_limit=0, disk_limit=190 * 16)
+    cache.matrix(*sets[3])
+    cache.matrix(*sets[0])
+    assert cache.cache_info()['disk_hits'] == 380 and cache.cache_info()['misses'] == 380
+
+def test_rows_are_bounded(tmp_path):
+    path = str(tmp_path / "distances.sqlite")
+    cache = DistanceCache(path, row_limit=10)
+    latitudes, longitudes = list(range(15)), list(range(15))
+    cache.matrix(latitudes[:8], longitudes[:8])
+    # The first point is in both and has the smallest key, so it holds all its pairs; its
+    # row keeps the seven other points of the last lookup
+    cache.matrix(latitudes[:1] + latitudes[8:], longitudes[:1] + longitudes[8:])
+    key = int(DistanceCache.point_keys([0], [0])[0])
+    with sqlite3.connect(path) as db:
+        dests = db.execute("SELECT dests FROM distance_rows WHERE point = ?", (key,)).fetchone()[0]
+    assert sorted(np.frombuffer(dests, dtype=np.int64)) == sorted(DistanceCache.point_keys(latitudes[8:], longitudes[8:]))
+
+def test_matrix_matches_batch_kernel(tmp_path):
+    rng = random.Random(1)
+    latitudes = [rng.uniform(58, 71) for _ in range(40)]
+    longitudes = [rng.uniform(4, 31) for _ in range(40)]
+    path = str(tmp_path / "distances.sqlite")
+    cache = DistanceCache(path)
+    matrix = cache.matrix(latitudes, longitudes)
+    assert np.max(np.abs(matrix - distance_matrix(RadianPoints(latitudes, longitudes)))) < 1e-9
+    assert np.array_equal(DistanceCache(path).matrix(latitudes, longitudes), matrix)
+
+def test_repeated_route_is_served_from_cache(tmp_path, monkeypatch):
+    os.makedirs(tmp_path / "SmartCourier" / "output")
+    monkeypatch.chdir(tmp_path)
+    with open("valid.csv", "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["customer", "latitude", "longitude", "priority", "weight_kg"])
+        writer.writerows([["a", 59.9, 10.7, "high", 1], ["b", 60.4, 5.3, "low", 2], ["c", 63.4, 10.4, "medium", 3]])
+    cache = DistanceCache("distances.sqlite")
+    first = calculate_distance("valid.csv", cache=cache)
+    second = calculate_distance("valid.csv", cache=cache)
+    assert first == second
+    # The legs of the route are kept whole in memory
+    assert cache.cache_info()['misses'] == 4 and cache.cache_info()['memory_hits'] == 4
+
+# A worker opening the cache file and storing one matrix, as fleet workers do
+def store_matrix(path):
+    cache = DistanceCache(path)
+    try:
+        cache.matrix(*STOPS)
+    finally:
+        cache.close()
+    return True
+
+def test_processes_can_open_a_new_file_at_once(tmp_path):
+    with Pool(4) as pool:
+        for attempt in range(20):
+            path = str(tmp_path / f"distances{attempt}.sqlite")
+            assert all(pool.map(store_matrix, [path] * 4, chunksize=1))
+            assert DistanceCache(path).open()._db.execute(
+                'PRAGMA journal_mode').fetchone()[0] == 'wal'
+
+if __name__ == "__main__":
+    pytest.main()
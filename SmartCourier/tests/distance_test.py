@@ -0,0 +1,76 @@
+import csv
+import os
+import random
+import numpy as np
+import pytest
+from smart_courier.distance import RadianPoints, distances_from, distance_matrix
+from smart_courier.optimizer import haversine, calculate_distance
+
+DEPOT = (59.94169250714698, 10.944143711757192)
+
+def random_points(n, seed):
+    rng = random.Random(seed)
+    return [(rng.uniform(-90, 90), rng.uniform(-180, 180)) for _ in range(n)]
+
+def test_one_to_many_matches_scalar():
+    coordinates = random_points(500, seed=1) + [(0.0, 0.0), (0.0, 180.0), (90.0, 0.0), (-90.0, 0.0)]
+    points = RadianPoints(*zip(*coordinates))
+    for origin in (0, 3, len(points) - 1):
+        lat, lon = coordinates[origin]
+        distances = distances_from(*points.point(origin), points)
+        expected = [haversine(lon, lat, lon2, lat2) for lat2, lon2 in coordinates]
+        assert np.max(np.abs(distances - expected)) < 1e-9
+
+def test_indices_select_points():
+    coordinates = random_points(20, seed=2)
+    points = RadianPoints(*zip(*coordinates))
+    subset = [4, 0, 17]
+    assert list(distances_from(*points.point(1), points, subset)) == list(distances_from(*points.point(1), points)[subset])
+
+def test_matrix_matches_one_to_many():
+    origins = RadianPoints(*zip(*random_points(30, seed=3)))
+    destinations = RadianPoints(*zip(*random_points(40, seed=4)))
+    matrix = distance_matrix(origins, destinations)
+    assert matrix.shape == (30, 40)
+    for row in (0, 29):
+        assert np.max(np.abs(matrix[row] - distances_from(*origins.point(row), destinations))) < 1e-9
+    square = distance_matrix(destinations)
+    assert np.allclose(square, square.T) and not np.diagonal(square).any()
+
+# The greedy route as calculate_distance built it with the scalar haversine
+def reference_route(deliveries):
+    unvisited = list(deliveries)
+    current = (DEPOT[0], DEPOT[1], "postensterminal")
+    legs = []
+    while unvisited:
+        high = [d for d in unvisited if d[3].lower() == 'high']
+        medium = [d for d in unvisited if d[3].lower() == 'medium']
+        candidates = high or medium or unvisited
+        nearest = min(candidates, key=lambda d: haversine(current[1], current[0], d[2], d[1]))
+        legs.append((current[2], nearest[0], haversine(current[1], current[0], nearest[2], nearest[1])))
+        current = (nearest[1], nearest[2], nearest[0])
+        unvisited.remove(nearest)
+    legs.append((current[2], "postensterminal", haversine(current[1], current[0], DEPOT[1], DEPOT[0])))
+    return legs
+
+def test_route_matches_scalar_greedy(tmp_path, monkeypatch):
+    rng = random.Random(5)
+    deliveries = [(f"customer{i}", rng.gauss(60, 1.5), rng.gauss(10, 3), rng.choice(["high", "Medium", "low"]), 1.0)
+                  for i in range(300)]
+    os.makedirs(tmp_path / "SmartCourier" / "output")
+    monkeypatch.chdir(tmp_path)
+    with open("valid.csv", "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["customer", "latitude", "longitude", "priority", "weight_kg"])
+        writer.writerows(deliveries)
+    
+    total = calculate_distance("valid.csv")
+    with open("SmartCourier/output/optimized_route.csv") as f:
+        rows = list(csv.reader(f))[1:]
+    
+    expected = reference_route(deliveries)
+    assert [(row[0], row[1]) for row in rows] == [(leg[0], leg[1]) for leg in expected]
+    assert total == pytest.approx(sum(leg[2] for leg in expected), abs=1e-9)
+
+if __name__ == "__main__":
+    pytest.main()
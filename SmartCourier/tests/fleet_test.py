@@ -0,0 +1,129 @@
+import csv
+import json
+import math
+import os
+import pytest
+from smart_courier.fleet import load_vehicles, sweep_split, plan_fleet, bearing
+from smart_courier.optimizer import START_DEPOT
+from smart_courier.distance_cache import get_distance_cache
+
+def delivery(customer, latitude, longitude, weight_kg, priority="low"):
+    return {'customer': customer, 'latitude': latitude, 'longitude': longitude,
+            'priority': priority, 'weight_kg': weight_kg}
+
+# Deliveries on a circle around the depot, every 30 degrees clockwise from north
+def ring(count, weight_kg=10):
+    scale = math.cos(math.radians(START_DEPOT[0]))
+    return [delivery(f"c{i}", START_DEPOT[0] + 0.5 * math.cos(math.radians(i * 30)),
+                     START_DEPOT[1] + 0.5 * math.sin(math.radians(i * 30)) / scale, weight_kg)
+            for i in range(count)]
+
+def vehicles(*capacities):
+    return [{'vehicle': f"v{i}", 'mode': "Car", 'capacity_kg': capacity} for i, capacity in enumerate(capacities)]
+
+def write_valid(path, deliveries):
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['customer', 'latitude', 'longitude', 'priority', 'weight_kg'])
+        for d in deliveries:
+            writer.writerow([d['customer'], d['latitude'], d['longitude'], d['priority'], d['weight_kg']])
+
+def test_bearing_is_clockwise_from_north():
+    north = delivery("n", START_DEPOT[0] + 1, START_DEPOT[1], 1)
+    east = delivery("e", START_DEPOT[0], START_DEPOT[1] + 1, 1)
+    assert bearing(north) == pytest.approx(0)
+    assert bearing(east) == pytest.approx(math.pi / 2)
+
+def test_sweep_respects_capacity():
+    deliveries = [delivery(f"c{i}", 59 + i * 0.1, 10 + (i % 3) * 0.2, 10 + i) for i in range(20)]
+    routes, unassigned = sweep_split(deliveries, vehicles(100, 100, 100, 100))
+    fleet = {v['vehicle']: v for v in vehicles(100, 100, 100, 100)}
+    for name, route in routes.items():
+        assert sum(d['weight_kg'] for d in route) <= fleet[name]['capacity_kg']
+    assigned = [d['customer'] for route in routes.values() for d in route]
+    assert sorted(assigned + [d['customer'] for d in unassigned]) == sorted(d['customer'] for d in deliveries)
+    assert len(set(assigned)) == len(assigned)
+
+def test_sweep_keeps_neighbours_together():
+    # Two clusters on opposite sides of the depot, each filling one vehicle
+    west = [delivery(f"w{i}", START_DEPOT[0] + 0.01 * i, START_DEPOT[1] - 2, 10) for i in range(3)]
+    east = [delivery(f"e{i}", START_DEPOT[0] + 0.01 * i, START_DEPOT[1] + 2, 10) for i in range(3)]
+    routes, unassigned = sweep_split(west + east, vehicles(30, 30))
+    assert not unassigned
+    groups = sorted(sorted(d['customer'][0] for d in route) for route in routes.values())
+    assert groups == [["e"] * 3, ["w"] * 3]
+
+def test_sweep_starts_after_widest_gap():
+    # A ring with one gap: the first vehicle starts right after it, not at north
+    deliveries = [d for i, d in enumerate(ring(12)) if i not in (5, 6, 7)]
+    routes, _ = sweep_split(deliveries, vehicles(90))
+    assert routes["v0"][0]['customer'] == "c8"
+    assert routes["v0"][-1]['customer'] == "c4"
+
+def test_heavy_delivery_skips_small_vehicle():
+    deliveries = [delivery("heavy", 60, 11, 80), delivery("too_heavy", 61, 11, 500)]
+    routes, unassigned = sweep_split(deliveries, vehicles(20, 100))
+    assert [d['customer'] for d in routes["v1"]] == ["heavy"]
+    assert "v0" not in routes
+    assert [d['customer'] for d in unassigned] == ["too_heavy"]
+
+def test_load_vehicles_rejects_duplicates(tmp_path):
+    path = tmp_path / "vehicles.json"
+    path.write_text(json.dumps(vehicles(10) + vehicles(20)))
+    with pytest.raises(ValueError):
+        load_vehicles(str(path))
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_plan_fleet_outputs(workdir, workers):
+    write_valid("valid.csv", ring(12, weight_kg=25))
+    (workdir / "vehicles.json").write_text(json.dumps(
+        [{'vehicle': "van", 'mode': "Car", 'capacity_kg': 150},
+         {'vehicle': "bike", 'mode': "Bicycle", 'capacity_kg': 150}]))
+    report = plan_fleet("valid.csv", vehicles_file="vehicles.json", workers=workers, time_budget=0.1)
+
+    assert [v['vehicle'] for v in report['vehicles']] == ["van", "bike"]
+    assert [v['deliveries'] for v in report['vehicles']] == [6, 6]
+    assert report['unassigned'] == []
+    van, bike = report['vehicles']
+    assert van['cost'] == pytest.approx(van['distance_km'] * 4)
+    assert bike['time_hrs'] == pytest.approx(bike['distance_km'] / 15)
+    assert report['totals']['distance_km'] == pytest.approx(van['distance_km'] + bike['distance_km'])
+
+    with open("SmartCourier/output/routes/van.csv") as f:
+        rows = list(csv.reader(f))[1:]
+    assert len(rows) == 7
+    assert rows[0][0] == rows[-1][1] == "postensterminal"
+    assert float(rows[-1][2]) == pytest.approx(van['distance_km'])
+    with open("SmartCourier/output/fleet_summary.csv") as f:
+        summary = list(csv.DictReader(f))
+    assert [row['vehicle'] for row in summary] == ["van", "bike", "total"]
+    assert float(summary[-1]['distance_km']) == pytest.approx(report['totals']['distance_km'])
+
+def test_parallel_matches_serial(workdir):
+    write_valid("valid.csv", ring(12, weight_kg=25))
+    serial = plan_fleet("valid.csv", workers=1, improve=False)
+    parallel = plan_fleet("valid.csv", workers=3, improve=False)
+    assert [v['distance_km'] for v in serial['vehicles']] == [v['distance_km'] for v in parallel['vehicles']]
+
+def test_parallel_workers_share_a_new_cache_file(workdir):
+    write_valid("valid.csv", ring(12, weight_kg=25))
+    for attempt in range(5):
+        report = plan_fleet("valid.csv", workers=3, improve=False, cache_path=f"distances{attempt}.sqlite")
+        assert report['workers'] > 1
+        assert os.path.exists(f"distances{attempt}.sqlite")
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_cache_path_is_honoured(workdir, workers):
+    write_valid("valid.csv", ring(12, weight_kg=25))
+    shared = get_distance_cache().cache_info()
+    for cache_path in ("own.sqlite", None):
+        plan_fleet("valid.csv", workers=workers, improve=False, cache_path=cache_path)
+    
+    # Neither run touched the shared cache or its file
+    info = get_distance_cache().cache_info()
+    assert (info['memory_hits'], info['disk_hits'], info['misses']) == \
+        (shared['memory_hits'], shared['disk_hits'], shared['misses'])
+    assert not os.path.exists("SmartCourier/output/distances.sqlite")
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,100 @@
+import csv
+import os
+import random
+import time
+import numpy as np
+import pytest
+from smart_courier.distance import RadianPoints, distance_matrix
+from smart_courier.distance_cache import DistanceCache
+from smart_courier.improve import two_opt, or_opt, improve_route, path_length
+from smart_courier.optimizer import calculate_distance
+
+def line_matrix(positions):
+    positions = np.asarray(positions, dtype=float)
+    return np.abs(positions[:, None] - positions[None, :])
+
+def test_two_opt_untangles_a_path():
+    # Stops on a line visited out of order; the best path goes left to right
+    matrix = line_matrix(range(8))
+    path = np.array([0, 4, 3, 2, 1, 5, 6, 7])
+    path, moves, converged = two_opt(path, matrix, deadline=float("inf"))
+    assert converged and moves == 1
+    assert list(path) == list(range(8))
+
+def test_or_opt_moves_a_stop():
+    matrix = line_matrix(range(6))
+    path = np.array([0, 3, 1, 2, 4, 5])
+    path, moves, converged = or_opt(path, matrix, deadline=float("inf"))
+    assert converged and moves >= 1
+    assert path_length(path, matrix) == 5
+    assert path[0] == 0 and path[-1] == 5
+
+def test_deadline_stops_a_stage():
+    matrix = line_matrix(range(8))
+    path = np.array([0, 4, 3, 2, 1, 5, 6, 7])
+    _, moves, converged = two_opt(path.copy(), matrix, deadline=0.0)
+    assert not converged and moves == 0
+
+def random_route(n, seed):
+    rng = random.Random(seed)
+    latitudes = [rng.uniform(59, 61) for _ in range(n)] + [59.94]
+    longitudes = [rng.uniform(9, 12) for _ in range(n)] + [10.94]
+    return latitudes, longitudes
+
+def route_length(order, latitudes, longitudes):
+    matrix = distance_matrix(RadianPoints(latitudes, longitudes))
+    stops = [len(latitudes) - 1] + list(order) + [len(latitudes) - 1]
+    return float(matrix[stops[:-1], stops[1:]].sum())
+
+def test_improvement_keeps_tiers_and_reports_savings():
+    latitudes, longitudes = random_route(60, seed=1)
+    order = list(range(60))
+    tier_sizes = [15, 20, 25]
+    improved, report = improve_route(order, tier_sizes, latitudes, longitudes, DistanceCache(path=None))
+    
+    # Every tier still holds the same stops, in the same place on the route
+    assert sorted(improved[:15]) == list(range(15))
+    assert sorted(improved[15:35]) == list(range(15, 35))
+    assert sorted(improved[35:]) == list(range(35, 60))
+    before, after = route_length(order, latitudes, longitudes), route_length(improved, latitudes, longitudes)
+    assert report['saved_km'] == pytest.approx(before - after, abs=1e-6)
+    assert report['stages']['2-opt']['saved_km'] > 0
+    assert all(stage['converged'] for stage in report['stages'].values())
+
+def test_matrices_count_against_the_budget():
+    latitudes, longitudes = random_route(4500, seed=3)
+    start = time.perf_counter()
+    improved, report = improve_route(list(range(4500)), [1500, 1500, 1500], latitudes, longitudes,
+                                     DistanceCache(path=None), time_budget=0.01)
+    
+    # The first tier's matrix uses up the budget, so the other tiers are left as built
+    assert report['skipped_tiers'] == [1, 2]
+    assert improved[1500:] == list(range(1500, 4500))
+    assert not report['stages']['2-opt']['converged']
+    assert time.perf_counter() - start < 1.0
+
+def test_calculate_distance_improves_route(tmp_path, monkeypatch):
+    rng = random.Random(2)
+    os.makedirs(tmp_path / "SmartCourier" / "output")
+    monkeypatch.chdir(tmp_path)
+    with open("valid.csv", "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["customer", "latitude", "longitude", "priority", "weight_kg"])
+        for i in range(80):
+            writer.writerow([f"customer{i}", rng.uniform(59, 61), rng.uniform(9, 12), rng.choice(["high", "medium", "low"]), 1])
+    cache = DistanceCache(path=None)
+    greedy = calculate_distance("valid.csv", cache=cache)
+    report = {}
+    improved = calculate_distance("valid.csv", cache=cache, improve=True, report=report)
+    
+    assert improved <= greedy
+    assert improved == pytest.approx(greedy - report['improvement']['saved_km'], abs=1e-6)
+    with open("valid.csv") as f:
+        priorities = {row['customer']: row['priority'] for row in csv.DictReader(f)}
+    with open("SmartCourier/output/optimized_route.csv") as f:
+        visited = [row['to_customer'] for row in csv.DictReader(f)][:-1]
+    ranks = [["high", "medium", "low"].index(priorities[customer]) for customer in visited]
+    assert ranks == sorted(ranks)
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,14 @@
+import os
+import pytest
+
+# logging_setup.py is copied into both packages rather than shared, see the top of the file
+def test_copies_match():
+    here = os.path.join(os.path.dirname(__file__), "..", "smart_courier", "logging_setup.py")
+    other = os.path.join(os.path.dirname(__file__), "..", "..", "GameOfLife", "game_of_life", "logging_setup.py")
+    if not os.path.exists(other):
+        pytest.skip("the other package is not next to this one")
+    with open(here, "rb") as f, open(other, "rb") as g:
+        assert f.read() == g.read()
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,86 @@
+import csv
+import tracemalloc
+import pytest
+from smart_courier.main import validate_inputs, read_rows, is_valid_delivery
+
+HEADER = "customer,latitude,longitude,priority,weight_kg\n"
+
+@pytest.fixture
+def files(tmp_path):
+    valid, rejected = tmp_path / "valid.csv", tmp_path / "rejected.csv"
+    valid.write_text(HEADER)
+    rejected.write_text(HEADER)
+    return tmp_path / "deliveries.csv", valid, rejected
+
+def rows_of(path):
+    with open(path, newline="") as f:
+        return list(csv.reader(f))[1:]
+
+def run(deliveries, valid, rejected, **options):
+    return validate_inputs(str(deliveries), valid_file=str(valid), rejected_file=str(rejected), **options)
+
+def test_is_valid_delivery():
+    assert is_valid_delivery(["oslomet", "59.9", "10.7", "high", "20"])
+    assert not is_valid_delivery(["oslomet", "59.9", "10.7", "fast", "20"])
+    assert not is_valid_delivery(["oslomet", "north", "10.7", "high", "20"])
+    assert not is_valid_delivery(["oslomet", "59.9", "10.7", "high"])
+
+def test_splits_valid_and_rejected(files):
+    deliveries, valid, rejected = files
+    deliveries.write_text(HEADER + "oslomet,59.9,10.7,high,20\n"
+                                   "notaplace,92.1,-120.9,medium,2\n"
+                                   "oilers,58.9,5.7,low,12.4\n")
+    counts = run(deliveries, valid, rejected, verbose=False)
+    assert counts == {'valid': 2, 'rejected': 1}
+    assert [row[0] for row in rows_of(valid)] == ["oslomet", "oilers"]
+    assert rows_of(rejected) == [["notaplace", "92.1", "-120.9", "medium", "2"]]
+
+def test_quoted_fields(files):
+    deliveries, valid, rejected = files
+    deliveries.write_text(HEADER + '"Hansen, Kari",59.9,10.7,high,20\n')
+    run(deliveries, valid, rejected, verbose=False)
+    assert rows_of(valid) == [["Hansen, Kari", "59.9", "10.7", "high", "20"]]
+
+def test_malformed_rows_are_rejected(files):
+    deliveries, valid, rejected = files
+    deliveries.write_text(HEADER + "short,59.9,10.7\n"
+                                   "\n"
+                                   "words,north,east,high,20\n")
+    counts = run(deliveries, valid, rejected, verbose=False)
+    assert counts == {'valid': 0, 'rejected': 2}
+
+def test_verbose_prints_rows(files, capsys):
+    deliveries, valid, rejected = files
+    deliveries.write_text(HEADER + "oslomet,59.9,10.7,high,20\nbad,59.9,10.7,fast,20\n")
+    run(deliveries, valid, rejected)
+    assert capsys.readouterr().out.splitlines() == ["valid: oslomet,59.9,10.7,high,20",
+                                                    "Invalid: bad,59.9,10.7,fast,20"]
+    run(deliveries, valid, rejected, verbose=False)
+    assert capsys.readouterr().out == ""
+
+def test_appends_to_existing_output(files):
+    deliveries, valid, rejected = files
+    deliveries.write_text(HEADER + "oslomet,59.9,10.7,high,20\n")
+    run(deliveries, valid, rejected, verbose=False)
+    run(deliveries, valid, rejected, verbose=False)
+    assert len(rows_of(valid)) == 2
+
+def test_memory_does_not_grow_with_input(files):
+    deliveries, valid, rejected = files
+    def peak(rows):
+        deliveries.write_text(HEADER + "oslomet,59.9,10.7,high,20\n" * rows)
+        tracemalloc.start()
+        run(deliveries, valid, rejected, verbose=False)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return peak
+    assert peak(50000) < 2 * peak(5000) + 100000
+
+def test_read_rows_is_lazy(files):
+    deliveries, _, _ = files
+    deliveries.write_text(HEADER + "a,1,1,high,1\nb,2,2,low,2\n")
+    rows = read_rows(str(deliveries))
+    assert next(rows) == ["a", "1", "1", "high", "1"]
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,30 @@
+import os
+import pytest
+from smart_courier.metrics import registry
+from smart_courier.optimizer import haversine
+
+def test_haversine_is_counted_not_logged():
+    registry.reset()
+    for _ in range(128):
+        haversine(10.75, 59.91, 10.94, 59.94)
+    
+    timer = registry.snapshot()['timers']['smart_courier.optimizer.haversine']
+    assert timer['calls'] == 128
+    # Only every 64th call is timed
+    assert timer['sampled'] == 2
+
+def test_haversine_distance():
+    # Oslo S to Postens Terminal, about 12 km
+    assert haversine(10.7522, 59.9111, 10.9441, 59.9417) == pytest.approx(11.6, abs=0.5)
+
+# metrics.py is copied into both packages rather than shared, see the top of the file
+def test_copies_match():
+    here = os.path.join(os.path.dirname(__file__), "..", "smart_courier", "metrics.py")
+    other = os.path.join(os.path.dirname(__file__), "..", "..", "GameOfLife", "game_of_life", "metrics.py")
+    if not os.path.exists(other):
+        pytest.skip("the other package is not next to this one")
+    with open(here, "rb") as f, open(other, "rb") as g:
+        assert f.read() == g.read()
+
+if __name__ == "__main__":
+    pytest.main()
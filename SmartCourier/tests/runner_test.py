@@ -0,0 +1,44 @@
+import csv
+import json
+import os
+import pytest
+from smart_courier.runner import run_pipeline, main
+
+def test_run_pipeline(workdir):
+    report = run_pipeline(transport_mode="bicycle")
+    
+    assert report['valid'] == 4 and report['rejected'] == 3
+    assert report['transport_mode'] == "Bicycle"
+    assert report['time_hrs'] == pytest.approx(report['total_distance_km'] / 15)
+    with open("SmartCourier/output/final_route.csv") as f:
+        rows = list(csv.reader(f))[1:]
+    # Depot, four stops and back
+    assert len(rows) == 5
+    assert rows[-1][1] == "postensterminal"
+
+def test_runs_do_not_accumulate(workdir):
+    first = run_pipeline(save_summary=False)
+    second = run_pipeline(save_summary=False)
+    assert second['valid'] == first['valid']
+    assert second['total_distance_km'] == first['total_distance_km']
+
+def test_cli_stdout_is_json(workdir, capsys):
+    main(["SmartCourier/data/deliveries.csv"])
+    report = json.loads(capsys.readouterr().out)
+    assert report['valid'] == 4
+
+def test_cli_writes_json(workdir):
+    main(["SmartCourier/data/deliveries.csv", "--mode", "walking", "--output", "report.json"])
+    report = json.loads((workdir / "report.json").read_text())
+    assert report['transport_mode'] == "Walking"
+    assert report['emissions_kgCO2'] == 0
+
+def test_cli_fleet(workdir):
+    report = main(["--fleet", "--workers", "1", "--output", "report.json"])
+    assert report['valid'] == 4
+    assert report['totals']['deliveries'] + len(report['unassigned']) == 4
+    assert all(v['load_kg'] <= v['capacity_kg'] for v in report['vehicles'])
+    assert os.path.exists("SmartCourier/output/fleet_summary.csv")
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,63 @@
+import random
+import numpy as np
+import pytest
+from smart_courier.distance import RadianPoints, distances_from
+from smart_courier.spatial import SphereKDTree
+
+def make_points(n, seed, duplicates=0):
+    rng = random.Random(seed)
+    coordinates = [(rng.uniform(-90, 90), rng.uniform(-180, 180)) for _ in range(n)]
+    # Repeated addresses give exact ties
+    coordinates += [coordinates[rng.randrange(n)] for _ in range(duplicates)]
+    rng.shuffle(coordinates)
+    return RadianPoints(*zip(*coordinates))
+
+# Nearest remaining point by brute force, first index winning ties
+def brute_force(points, query, remaining):
+    distances = distances_from(*points.point(query), points, remaining)
+    nearest = int(np.argmin(distances))
+    return remaining[nearest], distances[nearest]
+
+def test_nearest_matches_brute_force_while_removing():
+    points = make_points(400, seed=1, duplicates=100)
+    remaining = list(range(0, 500, 2))
+    tree = SphereKDTree(points, remaining)
+    current = 1
+    while remaining:
+        index, distance = tree.nearest(*points.point(current))
+        expected_index, expected_distance = brute_force(points, current, remaining)
+        assert index == expected_index
+        assert distance == pytest.approx(expected_distance, abs=1e-9)
+        tree.remove(index)
+        remaining.remove(index)
+        current = index
+    assert len(tree) == 0
+    assert tree.nearest(*points.point(0)) is None
+
+def test_clustered_points():
+    rng = random.Random(2)
+    coordinates = [(rng.gauss(59.9, 0.05), rng.gauss(10.75, 0.1)) for _ in range(300)]
+    points = RadianPoints(*zip(*coordinates))
+    tree = SphereKDTree(points)
+    for query in range(0, 300, 7):
+        index, _ = tree.nearest(*points.point(query))
+        # Every point is its own nearest at distance zero
+        assert index == query
+
+def test_membership_and_removal():
+    points = make_points(20, seed=3)
+    tree = SphereKDTree(points, [1, 5, 9])
+    assert len(tree) == 3
+    assert 5 in tree and 2 not in tree
+    tree.remove(5)
+    assert 5 not in tree and len(tree) == 2
+    with pytest.raises(KeyError):
+        tree.remove(5)
+
+def test_empty_tree():
+    tree = SphereKDTree(make_points(5, seed=4), [])
+    assert len(tree) == 0
+    assert tree.nearest(0.0, 0.0, 1.0) is None
+
+if __name__ == "__main__":
+    pytest.main()
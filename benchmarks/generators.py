@@ -0,0 +1,121 @@
+# Synthetic workloads for the benchmark suite. Files are written one row at a time, so
+# memory stays flat even for a million deliveries.
+import csv
+import random
+
+DELIVERY_HEADER = ['customer', 'latitude', 'longitude', 'priority', 'weight_kg']
+ROUTE_HEADER = ['from_customer', 'to_customer', 'distance_km']
+
+# (latitude, longitude, spread in degrees, share of deliveries): most stops cluster
+# around Norwegian cities, the rest are scattered over the whole country
+CITIES = [
+    (59.91, 10.75, 0.15, 0.40),   # Oslo
+    (60.39, 5.32, 0.10, 0.15),    # Bergen
+    (63.43, 10.39, 0.10, 0.12),   # Trondheim
+    (58.97, 5.73, 0.08, 0.10),    # Stavanger
+    (69.65, 18.96, 0.05, 0.05),   # Tromsø
+]
+NORWAY_BOUNDS = (57.9, 71.2, 4.5, 31.1)
+PRIORITIES = (('high', 0.2), ('medium', 0.3), ('low', 0.5))
+
+# Every kind of row validate_inputs rejects for a bad value
+INVALID_KINDS = ('latitude', 'longitude', 'priority', 'weight', 'name')
+
+
+def _location(rng):
+    pick = rng.random()
+    for lat, lon, spread, share in CITIES:
+        if pick < share:
+            return rng.gauss(lat, spread), rng.gauss(lon, spread * 2)
+        pick -= share
+    south, north, west, east = NORWAY_BOUNDS
+    return rng.uniform(south, north), rng.uniform(west, east)
+
+
+def _priority(rng):
+    pick = rng.random()
+    for priority, share in PRIORITIES:
+        if pick < share:
+            break
+        pick -= share
+    # The input files mix capitalisations; validation accepts any of them
+    return priority if rng.random() < 0.7 else priority.capitalize()
+
+
+def delivery_row(rng, index, invalid=False):
+    latitude, longitude = _location(rng)
+    row = [f"customer{index}", latitude, longitude, _priority(rng), round(rng.uniform(0.5, 120), 1)]
+    if invalid:
+        kind = rng.choice(INVALID_KINDS)
+        if kind == 'latitude':
+            row[1] = rng.choice((-1, 1)) * rng.uniform(90.5, 180)
+        elif kind == 'longitude':
+            row[2] = rng.choice((-1, 1)) * rng.uniform(180.5, 360)
+        elif kind == 'priority':
+            row[3] = rng.choice(('urgent', 'asap', 'none'))
+        elif kind == 'weight':
+            row[4] = -round(rng.uniform(0, 50), 1)
+        else:
+            row[0] = f"kunde{index}æøå"
+    return row
+
+
+def iter_deliveries(rows, invalid_fraction=0.1, seed=0):
+    rng = random.Random(seed)
+    for index in range(rows):
+        yield delivery_row(rng, index, invalid=rng.random() < invalid_fraction)
+
+
+# Deliveries CSV in the layout of SmartCourier/data/deliveries.csv
+def write_deliveries(path, rows, invalid_fraction=0.1, seed=0):
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(DELIVERY_HEADER)
+        writer.writerows(iter_deliveries(rows, invalid_fraction, seed))
+    return path
+
+
+# Optimized route CSV, as written by calculate_distance, with the running total per leg
+def write_route(path, legs, seed=0):
+    rng = random.Random(seed)
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(ROUTE_HEADER)
+        total = 0.0
+        previous = "postensterminal"
+        for index in range(legs):
+            total += rng.expovariate(1 / 8)
+            writer.writerow([previous, f"customer{index}", total])
+            previous = f"customer{index}"
+    return path
+
+
+def random_soup(rows, cols, density=0.35, seed=0):
+    rng = random.Random(seed)
+    return [[1 if rng.random() < density else 0 for _ in range(cols)] for _ in range(rows)]
+
+
+GOSPER_GLIDER_GUN = [
+    "........................O...........",
+    "......................O.O...........",
+    "............OO......OO............OO",
+    "...........O...O....OO............OO",
+    "OO........O.....O...OO..............",
+    "OO........O...O.OO....O.O...........",
+    "..........O.....O.......O...........",
+    "...........O...O....................",
+    "............OO......................",
+]
+
+
+# Copies of a pattern laid out on a lattice across a rows x cols grid
+def tiled_pattern(rows, cols, pattern=GOSPER_GLIDER_GUN, spacing=8):
+    height, width = len(pattern), len(pattern[0])
+    grid = [[0] * cols for _ in range(rows)]
+    for top in range(0, rows - height + 1, height + spacing):
+        for left in range(0, cols - width + 1, width + spacing):
+            for r, line in enumerate(pattern):
+                for c, cell in enumerate(line):
+                    if cell == 'O':
+                        grid[top + r][left + c] = 1
+    return grid
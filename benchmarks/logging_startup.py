@@ -0,0 +1,94 @@
+# Startup and per-record cost of logging: synchronous basicConfig file logging (what the
+# modules used to set up at import time) against the queued logging the entry points
+# now configure. Run from the repository root:
+#   python benchmarks/logging_startup.py [--records 20000] [--imports 10]
+import argparse
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PATHS = os.pathsep.join([os.path.join(ROOT, "GameOfLife"), os.path.join(ROOT, "SmartCourier")])
+IMPORTS = "import game_of_life.main, game_of_life.runner, smart_courier.main"
+
+# The old import-time side effect, run before the imports it used to be part of
+OLD_SETUP = ("import logging, os; os.makedirs('logs', exist_ok=True); "
+             "logging.basicConfig(level=logging.INFO, filename='logs/simulation.log', filemode='a'); ")
+
+
+def import_seconds(code, repeats):
+    env = dict(os.environ, PYTHONPATH=PATHS)
+    timings = []
+    with tempfile.TemporaryDirectory() as cwd:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, "-c", code], cwd=cwd, env=env, check=True)
+            timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def record_costs(records, configure, teardown):
+    root = logging.getLogger()
+    saved = list(root.handlers), root.level
+    configure()
+    start = time.perf_counter()
+    for i in range(records):
+        logging.info("Generation %d evolved", i)
+    logged = time.perf_counter() - start
+    teardown()
+    written = time.perf_counter() - start
+    root.handlers, root.level = saved
+    # Hot path: time spent in the calling thread; total: until the file is complete
+    return {'caller_us_per_record': logged / records * 1e6, 'total_us_per_record': written / records * 1e6}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Logging startup and per-record benchmark")
+    parser.add_argument("--records", type=int, default=20000)
+    parser.add_argument("--imports", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    sys.path[:0] = PATHS.split(os.pathsep)
+    from game_of_life.logging_setup import configure_logging, shutdown_logging, FastQueueHandler
+    import queue
+
+    with tempfile.TemporaryDirectory() as tmp:
+        old_file = os.path.join(tmp, "old.log")
+        old_handler = logging.FileHandler(old_file)
+        old_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+
+        def configure_old():
+            logging.getLogger().addHandler(old_handler)
+            logging.getLogger().setLevel(logging.INFO)
+
+        old = record_costs(args.records, configure_old, old_handler.close)
+        new = record_costs(args.records, lambda: configure_logging(os.path.join(tmp, "new.log")), shutdown_logging)
+        # What the calling thread pays when the listener runs on another core
+        enqueue_handler = FastQueueHandler(queue.SimpleQueue())
+        enqueue = record_costs(args.records, lambda: logging.getLogger().addHandler(enqueue_handler), lambda: None)
+
+    report = {
+        'python': sys.version.split()[0],
+        'import_s': {
+            'with_import_time_basicConfig': import_seconds(OLD_SETUP + IMPORTS, args.imports),
+            'side_effect_free': import_seconds(IMPORTS, args.imports),
+        },
+        'records': args.records,
+        'cpus': os.cpu_count(),
+        'per_record': {
+            'synchronous_file_handler': old,
+            'queue_handler_listener': new,
+            'enqueue_only': enqueue,
+        },
+    }
+    print(json.dumps(report, indent=2))
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+# Timings of the hot paths of both packages on synthetic inputs, written as JSON so runs
+# can be compared, and checked against a stored baseline. Run from the repository root:
+#   python benchmarks/suite.py                       compare against benchmarks/baseline.json
+#   python benchmarks/suite.py --save-baseline       record a new baseline
+#   python benchmarks/suite.py --full --output run.json
+# Exits with status 1 when a case is slower than the baseline by more than --tolerance.
+import argparse
+import contextlib
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import generators
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+
+ROW_SIZES = [10 ** power for power in range(2, 7)]
+QUICK_MAX_ROWS = 10 ** 5
+# The greedy route is quadratic in the number of stops
+QUICK_ROUTE_MAX_ROWS = 10 ** 3
+FULL_ROUTE_MAX_ROWS = 10 ** 4
+LEG_SIZES = [10 ** 3, 10 ** 4, 10 ** 5]
+MATRIX_SIZES = [200, 500, 2000]
+QUICK_GRID_SIZES = [64, 128, 256]
+FULL_GRID_SIZES = QUICK_GRID_SIZES + [512, 1024]
+GENERATIONS = 5
+SEED = 4420
+# Cases at least this big run once however many repeats were asked for
+SINGLE_RUN_ITEMS = 10 ** 6
+
+
+@contextlib.contextmanager
+def quiet():
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+# The SmartCourier functions read and write paths relative to the repository root, so
+# they run in a scratch copy of the layout they expect
+def make_workdir():
+    workdir = tempfile.mkdtemp(prefix="benchmarks-")
+    os.makedirs(os.path.join(workdir, "SmartCourier", "output"))
+    os.makedirs(os.path.join(workdir, "SmartCourier", "data"))
+    shutil.copy(os.path.join(ROOT, "SmartCourier", "data", "transport_modes.json"),
+                os.path.join(workdir, "SmartCourier", "data"))
+    return workdir
+
+
+def reset_validation_output():
+    for name in ("valid.csv", "rejected.csv"):
+        with open(os.path.join("SmartCourier", "output", name), "w") as f:
+            f.write(",".join(generators.DELIVERY_HEADER) + "\n")
+
+
+# Each case is (name, size, items, setup, run): setup runs untimed before every repeat
+def smart_courier_cases(max_rows, route_max_rows):
+    from smart_courier.main import validate_inputs
+    from smart_courier.optimizer import calculate_distance, calculate_transport_modes
+    from smart_courier.distance_cache import DistanceCache
+
+    for rows in ROW_SIZES:
+        if rows > max_rows:
+            break
+        path = generators.write_deliveries(f"deliveries_{rows}.csv", rows, invalid_fraction=0.1, seed=SEED)
+        yield ("smart_courier.validate_inputs", rows, rows, reset_validation_output,
+               lambda path=path: validate_inputs(path, verbose=False))
+
+    for rows in ROW_SIZES:
+        if rows > route_max_rows:
+            break
+        path = generators.write_deliveries(f"valid_{rows}.csv", rows, invalid_fraction=0, seed=SEED)
+        # A cold, memory-only cache per repeat, so no repeat is served by an earlier one
+        cache = {}
+        yield ("smart_courier.calculate_distance", rows, rows, lambda cache=cache: cache.update(cache=DistanceCache(None)),
+               lambda path=path, cache=cache: calculate_distance(path, cache=cache['cache']))
+
+    for rows in ROW_SIZES:
+        if rows > max_rows:
+            break
+        path = generators.write_route(f"route_{rows}.csv", rows, seed=SEED)
+        yield ("smart_courier.calculate_transport_modes", rows, rows, None,
+               lambda path=path: calculate_transport_modes(path))
+
+
+# The distance cache against recomputing: route legs and a priority tier's matrix, looked
+# up cold (computed), from the SQLite file and from memory
+def distance_cache_cases(leg_sizes, matrix_sizes):
+    from smart_courier.distance import RadianPoints, distance_matrix, pairwise_distances
+    from smart_courier.distance_cache import DistanceCache
+    import numpy as np
+
+    def points(count):
+        path = generators.write_deliveries(f"points_{count}.csv", count, invalid_fraction=0, seed=SEED)
+        with open(path) as f:
+            rows = [line.split(",") for line in f.read().splitlines()[1:]]
+        return np.array([float(row[1]) for row in rows]), np.array([float(row[2]) for row in rows])
+
+    def cases(name, size, items, compute, lookup):
+        state = {}
+        yield (f"smart_courier.{name}.recompute", size, items, None, compute)
+        yield (f"smart_courier.DistanceCache.{name}.cold", size, items,
+               lambda: state.update(cache=DistanceCache(None)), lambda: lookup(state['cache']))
+        memory = DistanceCache(None)
+        lookup(memory)
+        yield (f"smart_courier.DistanceCache.{name}.memory", size, items, None, lambda: lookup(memory))
+
+    # Matrices are also kept on disk: written to a new file, read back for the same stops,
+    # and read back the next day, when a tenth of the stops are new
+    def disk_cases(size, latitudes, longitudes):
+        state = {}
+        today, next_day = slice(0, size), slice(size // 10, size + size // 10)
+        disk = os.path.abspath(f"cache_matrix_{size}.sqlite")
+        DistanceCache(disk).matrix(latitudes[today], longitudes[today])
+
+        def open_copy(source=None):
+            if os.path.exists("cache_copy.sqlite"):
+                os.remove("cache_copy.sqlite")
+            if source:
+                shutil.copy(source, "cache_copy.sqlite")
+            state.update(cache=DistanceCache("cache_copy.sqlite"))
+        yield ("smart_courier.DistanceCache.matrix.disk_write", size, size * size, open_copy,
+               lambda: state['cache'].matrix(latitudes[today], longitudes[today]))
+        yield ("smart_courier.DistanceCache.matrix.disk", size, size * size,
+               lambda: state.update(cache=DistanceCache(disk)),
+               lambda: state['cache'].matrix(latitudes[today], longitudes[today]))
+        yield ("smart_courier.DistanceCache.matrix.disk_next_day", size, size * size, lambda: open_copy(disk),
+               lambda: state['cache'].matrix(latitudes[next_day], longitudes[next_day]))
+
+    for size in leg_sizes:
+        latitudes, longitudes = points(size + 1)
+        lat1, lon1, lat2, lon2 = latitudes[:-1], longitudes[:-1], latitudes[1:], longitudes[1:]
+        yield from cases("legs", size, size, lambda lat1=lat1, lon1=lon1, lat2=lat2, lon2=lon2:
+                         pairwise_distances(lat1, lon1, lat2, lon2),
+                         lambda cache, lat1=lat1, lon1=lon1, lat2=lat2, lon2=lon2: cache.distances(lat1, lon1, lat2, lon2))
+    for size in matrix_sizes:
+        latitudes, longitudes = points(size + size // 10)
+        yield from cases("matrix", size, size * size,
+                         lambda latitudes=latitudes[:size], longitudes=longitudes[:size]:
+                         distance_matrix(RadianPoints(latitudes, longitudes)),
+                         lambda cache, latitudes=latitudes[:size], longitudes=longitudes[:size]:
+                         cache.matrix(latitudes, longitudes))
+        yield from disk_cases(size, latitudes, longitudes)
+
+
+def game_of_life_cases(grid_sizes):
+    from game_of_life.rules import Rules
+
+    for size in grid_sizes:
+        for name, cells in (("soup", generators.random_soup(size, size, seed=SEED)),
+                            ("glider_guns", generators.tiled_pattern(size, size))):
+            def run(cells=cells):
+                for _ in range(GENERATIONS):
+                    cells = Rules.evolve_grid(cells)
+            yield (f"game_of_life.Rules.evolve_grid.{name}", size, size * size * GENERATIONS, None, run)
+
+
+def time_case(setup, run, repeat):
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        with quiet():
+            start = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - start)
+    median = statistics.median(timings)
+    return {
+        'repeat': repeat,
+        'min_s': min(timings),
+        'median_s': median,
+        'max_s': max(timings),
+    }
+
+
+def run_suite(cases, repeat=3, only=None):
+    results = {}
+    for name, size, items, setup, run in cases:
+        if only and not any(part in name for part in only):
+            continue
+        result = time_case(setup, run, repeat if items < SINGLE_RUN_ITEMS else 1)
+        result.update(name=name, size=size, items_per_s=items / result['median_s'] if result['median_s'] else None)
+        results[f"{name}[{size}]"] = result
+        print(f"{name}[{size}]: {result['median_s']:.4f} s", file=sys.stderr)
+    return results
+
+
+# Cases whose median got slower than the baseline's by more than tolerance (a fraction).
+# Differences under min_seconds are noise, whatever the ratio.
+def find_regressions(results, baseline, tolerance=0.25, min_seconds=0.005):
+    regressions = []
+    for key, result in results.items():
+        before = baseline.get('results', {}).get(key)
+        if not before:
+            continue
+        ratio = result['median_s'] / before['median_s'] if before['median_s'] else float("inf")
+        if ratio > 1 + tolerance and result['median_s'] - before['median_s'] > min_seconds:
+            regressions.append({'case': key, 'baseline_s': before['median_s'],
+                                'current_s': result['median_s'], 'ratio': round(ratio, 3)})
+    return regressions
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Benchmark SmartCourier and GameOfLife on synthetic inputs")
+    parser.add_argument("--full", action="store_true",
+                        help=f"Up to {ROW_SIZES[-1]} rows, {FULL_ROUTE_MAX_ROWS} route stops and "
+                             f"{FULL_GRID_SIZES[-1]}x{FULL_GRID_SIZES[-1]} grids")
+    parser.add_argument("--max-rows", type=int, default=None, help="Largest delivery and route file")
+    parser.add_argument("--route-max-rows", type=int, default=None, help="Largest input to calculate_distance")
+    parser.add_argument("--grid-sizes", type=lambda text: [int(size) for size in text.split(",")], default=None,
+                        help="Comma separated side lengths of the grids")
+    parser.add_argument("--only", default=None, help="Comma separated substrings of the case names to run")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default=None, help="Write the results to this JSON file")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Store the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown, as a fraction")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    max_rows = args.max_rows or (ROW_SIZES[-1] if args.full else QUICK_MAX_ROWS)
+    route_max_rows = args.route_max_rows or (FULL_ROUTE_MAX_ROWS if args.full else QUICK_ROUTE_MAX_ROWS)
+    grid_sizes = args.grid_sizes or (FULL_GRID_SIZES if args.full else QUICK_GRID_SIZES)
+    only = args.only.split(",") if args.only else None
+
+    sys.path[:0] = [os.path.join(ROOT, "GameOfLife"), os.path.join(ROOT, "SmartCourier")]
+    output = os.path.abspath(args.output) if args.output else None
+    baseline_path = os.path.abspath(args.baseline)
+
+    workdir = make_workdir()
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        cases = (list(smart_courier_cases(max_rows, route_max_rows)) + list(distance_cache_cases(LEG_SIZES, MATRIX_SIZES))
+                 + list(game_of_life_cases(grid_sizes)))
+        results = run_suite(cases, repeat=args.repeat, only=only)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    import numpy
+    report = {
+        'commit': git_commit(),
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'python': sys.version.split()[0],
+        'numpy': numpy.__version__,
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'results': results,
+    }
+
+    regressions = []
+    if args.save_baseline:
+        with open(baseline_path, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+    elif os.path.exists(baseline_path):
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+        regressions = find_regressions(results, baseline, args.tolerance)
+        report['baseline'] = {'commit': baseline.get('commit'), 'tolerance': args.tolerance,
+                              'regressions': regressions}
+
+    text = json.dumps(report, indent=2)
+    if output:
+        with open(output, "w") as f:
+            f.write(text + "\n")
+    print(text)
+    for regression in regressions:
+        print(f"REGRESSION {regression['case']}: {regression['baseline_s']:.4f} s -> "
+              f"{regression['current_s']:.4f} s ({regression['ratio']}x)", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
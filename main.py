@@ -1,5 +1,14 @@
 import sys
 import os
+import time
+
+# Non-interactive tools, by name: module imported only when that tool runs, so starting
+# one never pays for loading the other package
+TOOLS = {
+    'courier': ('SmartCourier.smart_courier.runner', "Validate and route a deliveries file"),
+    'life': ('GameOfLife.game_of_life.runner', "Run a Game of Life pattern headless"),
+    'ensemble': ('GameOfLife.game_of_life.ensemble', "Run an ensemble of random soups"),
+}
 
 def clear_screen():
     os.system('cls' if os.name == 'nt' else 'clear')
@@ -52,7 +61,87 @@ def run_game_of_life():
     
     input("\nPress Enter to return to main menu...")
 
+def build_parser():
+    import argparse
+    parser = argparse.ArgumentParser(
+        description="Run one of the tools without the menu. Options after the tool name go to the tool "
+                    "(e.g. python main.py life GameOfLife/patterns/glider.txt --help).",
+        epilog="Without arguments the interactive menu starts.")
+    parser.add_argument("--profile", action="store_true", help="Profile the run with cProfile and print the top functions")
+    parser.add_argument("--profile-output", default=None, metavar="FILE",
+                        help="Save the cProfile stats to FILE instead of printing them (implies --profile)")
+    parser.add_argument("--profile-sort", default="cumulative", help="Sort order of the printed profile")
+    parser.add_argument("--profile-limit", type=int, default=30, help="Functions in the printed profile")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Trace allocations with tracemalloc and print the largest by line")
+    parser.add_argument("--trace-limit", type=int, default=10, help="Lines in the printed allocations")
+    parser.add_argument("--timings", action="store_true",
+                        help="Print import, wall and CPU time and the per-function metrics of the run")
+    parser.add_argument("tool", choices=list(TOOLS), help=", ".join(f"{name}: {description}" for name, (_, description) in TOOLS.items()))
+    parser.add_argument("tool_args", nargs=argparse.REMAINDER, help="Arguments of the tool")
+    return parser
+
+# Run a tool's main(argv) wrapped in the requested profilers. Reports go to stderr so
+# the tool's own JSON on stdout stays parseable.
+def run_tool(args):
+    import importlib
+    module_name = TOOLS[args.tool][0]
+    profiler = None
+
+    import_start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    import_time = time.perf_counter() - import_start
+
+    # Started after the import, so only the run's own allocations are traced
+    if args.trace_memory:
+        import tracemalloc
+        tracemalloc.start()
+
+    if args.profile or args.profile_output:
+        import cProfile
+        profiler = cProfile.Profile()
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    if profiler:
+        profiler.enable()
+    try:
+        module.main(args.tool_args)
+    finally:
+        if profiler:
+            profiler.disable()
+        wall_time, cpu_time = time.perf_counter() - wall_start, time.process_time() - cpu_start
+
+        if profiler:
+            if args.profile_output:
+                profiler.dump_stats(args.profile_output)
+                print(f"Profile written to {args.profile_output} (view with: python -m pstats {args.profile_output})",
+                      file=sys.stderr)
+            else:
+                import pstats
+                pstats.Stats(profiler, stream=sys.stderr).sort_stats(args.profile_sort).print_stats(args.profile_limit)
+
+        if args.trace_memory:
+            import tracemalloc
+            current, peak = tracemalloc.get_traced_memory()
+            statistics = tracemalloc.take_snapshot().statistics("lineno")
+            tracemalloc.stop()
+            print(f"\nTraced memory: {current / 1024:.1f} KiB current, {peak / 1024:.1f} KiB peak", file=sys.stderr)
+            for stat in statistics[:args.trace_limit]:
+                print(f"  {stat}", file=sys.stderr)
+
+        if args.timings:
+            print(f"\nImport:  {import_time:.4f} s", file=sys.stderr)
+            print(f"Wall:    {wall_time:.4f} s", file=sys.stderr)
+            print(f"CPU:     {cpu_time:.4f} s", file=sys.stderr)
+            metrics = importlib.import_module(module_name.rsplit(".", 1)[0] + ".metrics")
+            for name, timer in metrics.registry.snapshot()['timers'].items():
+                total = f"{timer['total_s']:.4f} s" if timer['total_s'] is not None else "not timed"
+                print(f"  {name}: {timer['calls']} calls, {total}", file=sys.stderr)
+
 def main():
+    if len(sys.argv) > 1:
+        run_tool(build_parser().parse_args())
+        return
+
     while True:
         clear_screen()
         print_banner()